@@ -11,3 +11,15 @@ RSI_HISTORY_DAYS = 5
 
 # Columns for the dashboard results table
 DASHBOARD_COLUMNS = ['Ticker', 'LTP', 'RSI', 'RSI_Signal', 'Signal_Date', 'Volume_Spike', '50_Day_MA']
+
+# Screen DSL column -> analysis result field, for evaluating v2 screens on dashboard results
+SCREEN_COLUMN_MAP = {
+    'close': 'LTP',
+    'rsi': 'RSI',
+    'rsi_prev': 'RSI_Prev',
+    'sma50': '50_Day_MA',
+    'vol_spike': 'Volume_Spike',
+    'high_52w': '52_Week_High',
+    'low_52w': '52_Week_Low',
+    'pe_ratio': 'PE_Ratio',
+}
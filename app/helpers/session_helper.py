@@ -0,0 +1,62 @@
+from typing import Any, Callable, Dict, Iterable, Optional, Tuple
+
+import streamlit as st
+
+from v2.data.trading_calendar import last_trading_day
+
+# st.session_state slot holding analysis results, keyed by analysis_key()
+RESULTS_STATE_KEY = "analysis_results"
+
+# Older result sets are evicted so a long session doesn't keep every scan alive
+MAX_STORED_RESULTS = 4
+
+
+def analysis_key(tickers: Iterable[str], fetch_fundamentals: bool) -> Tuple:
+    """
+    Key identifying one analysis run: the ticker list, whether fundamentals
+    were fetched, and the trading day the data belongs to. A new trading day
+    gives a new key, so stale results are never shown.
+    """
+    return tuple(t.strip().upper() for t in tickers if t.strip()), bool(fetch_fundamentals), str(last_trading_day())
+
+
+def get_results(key: Tuple) -> Optional[Dict[str, Any]]:
+    """
+    Returns the stored results for a key, or None if that analysis has not
+    been run in this session.
+    """
+    return st.session_state.get(RESULTS_STATE_KEY, {}).get(key)
+
+
+def store_results(key: Tuple, results: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Stores analysis results for a key in the session and returns them.
+    A "charts" dict is added for per-ticker chart data built on demand.
+    """
+    store = st.session_state.setdefault(RESULTS_STATE_KEY, {})
+    store.pop(key, None)
+    results.setdefault("charts", {})
+    store[key] = results
+    while len(store) > MAX_STORED_RESULTS:
+        store.pop(next(iter(store)))
+    return results
+
+
+def cached_chart(results: Dict[str, Any], name: str, build: Callable[[], Any]) -> Any:
+    """
+    Returns chart data stored with the results, building it on first use only.
+    """
+    charts = results.setdefault("charts", {})
+    if name not in charts:
+        charts[name] = build()
+    return charts[name]
+
+
+def fragment(func: Callable) -> Callable:
+    """
+    Runs func as a Streamlit fragment so widget interactions inside it
+    rerun only that function. Falls back to experimental_fragment on older
+    Streamlit, and to a plain call where fragments are not supported.
+    """
+    decorator = getattr(st, "fragment", None) or getattr(st, "experimental_fragment", None)
+    return decorator(func) if decorator else func
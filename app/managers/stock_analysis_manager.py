@@ -35,7 +35,7 @@ class StockAnalysisManager:
         vol_spike = current_vol / avg_vol_20 if avg_vol_20 > 0 else 0
 
         info = stock_data.get("info", {})
-        pe_ratio = info.get('trailingPE')
+        pe_ratio = info.get('trailing_pe')
 
         calendar = stock_data.get("calendar")
         earnings_date = None
@@ -48,6 +48,7 @@ class StockAnalysisManager:
             "52_Week_Low": round(low_52, 2),
             "50_Day_MA": round(sma_50, 2),
             "RSI": round(rsi_now, 2),
+            "RSI_Prev": round(rsi_prev, 2),
             "RSI_Signal": rsi_signal,
             "Signal_Date": signal_date,
             "Volume_Spike": round(vol_spike, 2),
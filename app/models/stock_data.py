@@ -0,0 +1,30 @@
+from collections.abc import Mapping
+from typing import Any, Callable, Dict, Iterator
+
+
+class StockData(Mapping):
+    """
+    Read-only dict of stock data components ("history", "info", "calendar").
+    Each component is fetched on first access and cached, so callers only
+    pay for the remote calls they actually use.
+    """
+    def __init__(self, loaders: Dict[str, Callable[[], Any]], values: Dict[str, Any] = None):
+        self._loaders = loaders
+        self._values = dict(values or {})
+
+    def __getitem__(self, key: str) -> Any:
+        if key not in self._values:
+            if key not in self._loaders:
+                raise KeyError(key)
+            self._values[key] = self._loaders[key]()
+        return self._values[key]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._loaders.keys() | self._values.keys())
+
+    def __len__(self) -> int:
+        return len(self._loaders.keys() | self._values.keys())
+
+    def is_loaded(self, key: str) -> bool:
+        """True if the component has already been fetched."""
+        return key in self._values
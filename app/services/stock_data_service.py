@@ -1,19 +1,43 @@
+from typing import Iterable
+
 import yfinance as yf
 
+from app.models.stock_data import StockData
+from v2.data.fundamentals_service import get_fundamentals
+from v2.data.quality import validate_bars
+
 class StockDataService:
     """Service to fetch stock data using yfinance."""
 
-    def fetch_history(self, ticker: str, period: str = "1y") -> dict:
+    ALL_FIELDS = ("history", "info", "calendar")
+
+    def fetch_history(self, ticker: str, period: str = "1y", fields: Iterable[str] = ALL_FIELDS) -> StockData:
         """
         Fetches historical data for a given ticker.
+
+        Only the requested fields are available, e.g. fields=("history",) for a
+        price-only scan. The price history is fetched up front (it decides whether
+        the ticker has any data); "info" and "calendar" are fetched on first access.
+        "info" comes from the shared daily fundamentals snapshot, not Ticker.info.
+        The history passes the v2 data-quality checks (see v2/data/quality.py).
         """
+        fields = set(fields)
         yf_object = yf.Ticker(ticker)
-        data = yf_object.history(period=period, auto_adjust=True)
-        if data.empty:
-            return {}
-        
-        return {
-            "history": data,
-            "info": yf_object.info,
-            "calendar": yf_object.calendar
-        }
+
+        values = {}
+        if "history" in fields:
+            data = yf_object.history(period=period, auto_adjust=True)
+            if data.empty:
+                return StockData({})
+            # Drop duplicated and broken bars before any metric sees them. The report is
+            # not saved: CACHE_DIR/quality/{ticker}.json belongs to v2's raw full history
+            data, _ = validate_bars(data.reset_index(), ticker, save=False)
+            values["history"] = data.set_index("Date")
+
+        loaders = {}
+        if "info" in fields:
+            loaders["info"] = lambda: get_fundamentals(ticker)
+        if "calendar" in fields:
+            loaders["calendar"] = lambda: yf_object.calendar
+
+        return StockData(loaders, values=values)
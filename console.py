@@ -1,6 +1,7 @@
 from app.services.stock_data_service import StockDataService
 from app.managers.stock_analysis_manager import StockAnalysisManager
 from app.common.constants import CONSOLE_TICKERS
+from v2.profiling import RunProfiler, profiling_enabled
 
 
 def main():
@@ -12,17 +13,21 @@ def main():
 
     stock_data_service = StockDataService()
     stock_analysis_manager = StockAnalysisManager()
+    # Set TRADINGTOOL_PROFILE=1 to print a stage/hotspot report and save a .prof file
+    profiler = RunProfiler(enabled=profiling_enabled(), name="console")
 
     processed_stocks = []
 
     for ticker in tickers:
-        stock_data = stock_data_service.fetch_history(ticker)
+        with profiler.stage("fetch", ticker):
+            stock_data = stock_data_service.fetch_history(ticker)
         
         if not stock_data:
             print(f"Warning: No data found for {ticker}")
             continue
 
-        stock = stock_analysis_manager.calculate_metrics(ticker, stock_data)
+        with profiler.stage("indicators", ticker):
+            stock = stock_analysis_manager.calculate_metrics(ticker, stock_data)
         processed_stocks.append(stock)
 
         stats = stock.analysis
@@ -51,6 +56,13 @@ def main():
                 print(f"  {date.strftime('%Y-%m-%d')}: {rsi_val:.2f}")
     print("\n" + "=" * 40 + "\n")
 
+    if profiler.enabled:
+        profiler.stop()
+        print(profiler.report())
+        path = profiler.dump()
+        if path:
+            print(f"\nProfile saved to {path} (open with: python -m pstats {path})")
+
 
 if __name__ == "__main__":
     main()
@@ -3,8 +3,14 @@ import pandas as pd
 from app.services.stock_data_service import StockDataService
 from app.managers.stock_analysis_manager import StockAnalysisManager
 from app.models.stock import Stock
-from app.common.constants import DEFAULT_TICKERS, DASHBOARD_COLUMNS, RSI_HISTORY_DAYS
+from app.common.constants import DEFAULT_TICKERS, DASHBOARD_COLUMNS, RSI_HISTORY_DAYS, SCREEN_COLUMN_MAP
 from app.helpers.rsi_helper import get_smart_rsi_daily_signal
+from app.helpers.session_helper import analysis_key, cached_chart, fragment, get_results, store_results
+from v2.config import SCREENS
+from v2.profiling import RunProfiler, profiling_enabled
+from v2.signals.screen_dsl import compile_screen
+from v2.ui.charts import frame_payload, render_chart
+from v2.ui.profile_report import profile_sidebar_toggle, render_profile_report
 
 
 # 1. Page Configuration
@@ -16,35 +22,50 @@ st.sidebar.header("Configuration")
 # In the Sidebar section
 fetch_fundamentals = st.sidebar.checkbox("Fetch Fundamental Data (PE Ratio)", value=False)
 ticker_input = st.sidebar.text_area("Enter Stock Tickers (comma separated)", DEFAULT_TICKERS)
+custom_screen = st.sidebar.text_input("Custom Screen (optional)", "",
+                                      help="e.g. vol_spike > 1.5 and rsi < 70 and close > sma50")
+profile_run = profile_sidebar_toggle(profiling_enabled())
+
+# Stage hooks are no-ops unless profiling is on
+profiler = RunProfiler(enabled=profile_run, name="dashboard")
 
 # Convert string input to a clean list
 ticker_list = [x.strip() for x in ticker_input.split(',')]
 
-# 3. The "Run" Button
-if st.sidebar.button("Analyze Stocks"):
-    st.write(f"Analyzing {len(ticker_list)} stocks...")
+# 3. Analysis
+# Results are kept in the session keyed by (tickers, fundamentals, trading day), so
+# widget interactions below rerun the script without refetching or recomputing.
+def analyze_stocks(tickers, fetch_fundamentals, profiler=None):
+    st.write(f"Analyzing {len(tickers)} stocks...")
 
     # Create a placeholder for the results list
     results = []
     processed_stocks = []
+    errors = []
 
     # Create a progress bar
     progress_bar = st.progress(0)
 
     stock_data_service = StockDataService()
     stock_analysis_manager = StockAnalysisManager()
+    profiler = profiler or RunProfiler()
+
+    # Only fetch fundamentals when asked for; a price-only scan needs one remote call per ticker
+    fields = ("history", "info") if fetch_fundamentals else ("history",)
 
-    for i, ticker in enumerate(ticker_list):
+    for i, ticker in enumerate(tickers):
         # Update progress
-        progress_bar.progress((i + 1) / len(ticker_list))
+        progress_bar.progress((i + 1) / len(tickers))
 
         try:
-            stock_data = stock_data_service.fetch_history(ticker)
+            with profiler.stage("fetch", ticker):
+                stock_data = stock_data_service.fetch_history(ticker, fields=fields)
             if not stock_data:
-                st.error(f"Error analyzing {ticker}: No data found")
+                errors.append(f"Error analyzing {ticker}: No data found")
                 continue
 
-            stock = stock_analysis_manager.calculate_metrics(ticker, stock_data)
+            with profiler.stage("indicators", ticker):
+                stock = stock_analysis_manager.calculate_metrics(ticker, stock_data)
 
             if stock.analysis:
                 # Add the ticker name to the analysis dict for the table
@@ -53,54 +74,153 @@ if st.sidebar.button("Analyze Stocks"):
                 results.append(row)
                 processed_stocks.append(stock)
         except Exception as e:
-            st.error(f"Error analyzing {ticker}: {e}")
+            errors.append(f"Error analyzing {ticker}: {e}")
+
+    progress_bar.empty()
+    return {"results": results, "processed_stocks": processed_stocks, "errors": errors}
+
+
+def build_rsi_trend(stock):
+    """RSI trend table for the last RSI_HISTORY_DAYS days, newest first (None if not enough data)."""
+    if stock.rsi_series is None or stock.rsi_series.empty or len(stock.rsi_series) <= RSI_HISTORY_DAYS:
+        return None
+
+    # Get last 6 days to have a "previous" for the first day of the 5-day trend
+    rsi_history = stock.rsi_series.tail(RSI_HISTORY_DAYS + 1)
+
+    # Prepare data for the DataFrame with smart signals
+    rsi_data_for_df = []
+    # Iterate from the 2nd element (index 1) of the 6-day history
+    for i in range(1, len(rsi_history)):
+        current_rsi = rsi_history.iloc[i]
+        previous_rsi = rsi_history.iloc[i-1]
+        date = rsi_history.index[i]
+
+        description = get_smart_rsi_daily_signal(current_rsi, previous_rsi)
+
+        rsi_data_for_df.append({
+            'Date': date.strftime('%Y-%m-%d'),
+            'RSI': current_rsi.round(2),
+            'Description': description
+        })
+
+    rsi_df = pd.DataFrame(rsi_data_for_df)
+    # Sort by date descending to show newest first
+    return rsi_df.sort_values(by='Date', ascending=False)
+
+
+def build_price_chart(stock):
+    """Downsampled price/DMA, RSI and volume chart payload and the 10-day footprint table for one stock."""
+    return frame_payload(stock.history), stock.get_last_10_days_stats()
+
+
+@fragment
+def render_price_chart(stored):
+    """Chart section; changing the selected stock reruns only this fragment."""
+    processed_stocks = stored["processed_stocks"]
+
+    # Create a dropdown to select which stock to visualize
+    selected_ticker = st.selectbox("Select a Stock to View Chart:", [s.ticker for s in processed_stocks],
+                                   key="chart_ticker")
+
+    if selected_ticker:
+        selected_stock = next((s for s in processed_stocks if s.ticker == selected_ticker), None)
+
+        if selected_stock and selected_stock.history is not None:
+            chart_payload, footprint_df = cached_chart(stored, f"price:{selected_ticker}",
+                                                    lambda: build_price_chart(selected_stock))
+
+            render_chart(chart_payload)
+
+            # --- NEW: INSTITUTIONAL FOOTPRINT SECTION ---
+            st.markdown("### 👣 Institutional Footprint (Last 10 Days)")
+            st.info(
+                "🔍 **Pro Tip:** Look for rows with **Green Price** and **High Volume Spike (> 1.5)**. This often indicates 'Smart Money' accumulation.")
+
+            if footprint_df is not None:
+                # Streamlit allows us to "Highlight" columns to spot spikes easily
+                st.dataframe(
+                    footprint_df.style.background_gradient(subset=['Vol_Spike (x)'], cmap='Greens', vmin=1.0,
+                                                          vmax=3.0)
+                    .format("{:.2f}", subset=['Min', 'Max', 'LTP', 'Vol_Spike (x)', 'Change %']),
+                    use_container_width=True
+                )
+
+            # Engineering Note:
+            # If 'Close' line crosses above '50_DMA' line from below,
+            # that is often considered a Bullish (Buy) Signal.
+
+
+current_key = analysis_key(ticker_list, fetch_fundamentals)
+
+# The "Run" Button
+if st.sidebar.button("Analyze Stocks"):
+    store_results(current_key, analyze_stocks(ticker_list, fetch_fundamentals, profiler))
+
+stored = get_results(current_key)
+
+if stored is not None:
+    results = stored["results"]
+    processed_stocks = stored["processed_stocks"]
+
+    for error in stored["errors"]:
+        st.error(error)
 
     # 4. Display Results
     if results:
-        # Convert list of dicts to a DataFrame for a beautiful interactive table
-        df_results = pd.DataFrame(results)
+        with profiler.stage("transform"):
+            # Convert list of dicts to a DataFrame for a beautiful interactive table
+            df_results = pd.DataFrame(results)
+
+            # Reorder columns to put Ticker first
+            final_cols = [c for c in DASHBOARD_COLUMNS if c in df_results.columns]
+            if fetch_fundamentals and 'PE_Ratio' in df_results.columns:
+                final_cols.append('PE_Ratio')
 
-        # Reorder columns to put Ticker first
-        final_cols = [c for c in DASHBOARD_COLUMNS if c in df_results.columns]
+            # Screen columns for every analysed ticker (one array per indicator)
+            screen_columns = {
+                column: pd.to_numeric(df_results[field], errors='coerce').to_numpy(dtype='float64')
+                for column, field in SCREEN_COLUMN_MAP.items() if field in df_results.columns
+            }
 
         st.subheader("Analysis Results")
 
         # Display the data as an interactive table
-        st.dataframe(df_results[final_cols], use_container_width=True)
+        with profiler.stage("render"):
+            st.dataframe(df_results[final_cols], use_container_width=True)
 
         st.subheader("🚀 Potential Breakouts (Volume Spikes)")
-        for res in results:
-            # If Volume is > 1.5x average AND RSI is not overbought yet
-            if 'Volume_Spike' in res and 'RSI' in res and res['Volume_Spike'] > 1.5 and res['RSI'] < 70:
-                st.write(f"**{res['Ticker']}** is seeing high volume! (Spike: {res['Volume_Spike']}x)")
+        # If Volume is > 1.5x average AND RSI is not overbought yet
+        volume_spike = compile_screen(SCREENS['volume_spike'])
+        # RSI or Volume_Spike can be missing from every row; the screen needs both
+        if volume_spike.columns <= screen_columns.keys():
+            with profiler.stage("signals"):
+                breakouts = volume_spike(screen_columns)
+            for res, is_breakout in zip(results, breakouts):
+                if is_breakout:
+                    st.write(f"**{res['Ticker']}** is seeing high volume! (Spike: {res['Volume_Spike']}x)")
+
+        screens = {name: expression for name, expression in SCREENS.items()
+                   if compile_screen(expression).columns <= screen_columns.keys()}
+        if custom_screen.strip():
+            screens['custom'] = custom_screen.strip()
+
+        with st.expander("🔎 Screen Matches"):
+            for name, expression in screens.items():
+                try:
+                    with profiler.stage("signals"):
+                        matches = compile_screen(expression)(screen_columns)
+                except (ValueError, KeyError) as e:
+                    st.error(f"Invalid screen '{expression}': {e}")
+                    continue
+                tickers = [res['Ticker'] for res, match in zip(results, matches) if match]
+                st.write(f"**{name}** (`{expression}`): {', '.join(tickers) if tickers else 'no matches'}")
 
         st.subheader(f"RSI {RSI_HISTORY_DAYS}-Day Trend Analysis")
         for stock in processed_stocks:
-            with st.expander(f"View RSI Trend for {stock.ticker}"):
-                if stock.rsi_series is not None and not stock.rsi_series.empty and len(stock.rsi_series) > RSI_HISTORY_DAYS:
-                    # Get last 6 days to have a "previous" for the first day of the 5-day trend
-                    rsi_history = stock.rsi_series.tail(RSI_HISTORY_DAYS + 1)
-                    
-                    # Prepare data for the DataFrame with smart signals
-                    rsi_data_for_df = []
-                    # Iterate from the 2nd element (index 1) of the 6-day history
-                    for i in range(1, len(rsi_history)):
-                        current_rsi = rsi_history.iloc[i]
-                        previous_rsi = rsi_history.iloc[i-1]
-                        date = rsi_history.index[i]
-                        
-                        description = get_smart_rsi_daily_signal(current_rsi, previous_rsi)
-
-                        rsi_data_for_df.append({
-                            'Date': date.strftime('%Y-%m-%d'),
-                            'RSI': current_rsi.round(2),
-                            'Description': description
-                        })
-                    
-                    rsi_df = pd.DataFrame(rsi_data_for_df)
-                    # Sort by date descending to show newest first
-                    rsi_df = rsi_df.sort_values(by='Date', ascending=False)
-
+            with st.expander(f"View RSI Trend for {stock.ticker}"), profiler.stage("render", stock.ticker):
+                rsi_df = cached_chart(stored, f"rsi:{stock.ticker}", lambda: build_rsi_trend(stock))
+                if rsi_df is not None:
                     col1, col2 = st.columns(2)
                     with col1:
                         st.write("Raw RSI Data")
@@ -115,41 +235,11 @@ if st.sidebar.button("Analyze Stocks"):
 
         st.markdown("---")
         st.subheader("📉 Price vs Moving Average (Visual Analysis)")
-
-        # Create a dropdown to select which stock to visualize
-        selected_ticker = st.selectbox("Select a Stock to View Chart:", [s.ticker for s in processed_stocks])
-
-        if selected_ticker:
-            selected_stock = next((s for s in processed_stocks if s.ticker == selected_ticker), None)
-
-            if selected_stock and selected_stock.history is not None:
-                with st.spinner(f"Generating chart for {selected_ticker}..."):
-                    chart_data = selected_stock.history[['Close']].copy()
-                    chart_data['50_DMA'] = chart_data['Close'].rolling(window=50).mean()
-
-                    # Streamlit Line Chart
-                    st.line_chart(chart_data[['Close', '50_DMA']])
-
-                    # --- NEW: INSTITUTIONAL FOOTPRINT SECTION ---
-                    st.markdown("### 👣 Institutional Footprint (Last 10 Days)")
-                    st.info(
-                        "🔍 **Pro Tip:** Look for rows with **Green Price** and **High Volume Spike (> 1.5)**. This often indicates 'Smart Money' accumulation.")
-
-                    footprint_df = selected_stock.get_last_10_days_stats()
-
-                    if footprint_df is not None:
-                        # Streamlit allows us to "Highlight" columns to spot spikes easily
-                        st.dataframe(
-                            footprint_df.style.background_gradient(subset=['Vol_Spike (x)'], cmap='Greens', vmin=1.0,
-                                                                  vmax=3.0)
-                            .format("{:.2f}", subset=['Min', 'Max', 'LTP', 'Vol_Spike (x)', 'Change %']),
-                            use_container_width=True
-                        )
-
-                    # Engineering Note:
-                    # If 'Close' line crosses above '50_DMA' line from below,
-                    # that is often considered a Bullish (Buy) Signal.
+        render_price_chart(stored)
     else:
         st.warning("No data found. Please check ticker symbols.")
 else:
-    st.info("👈 Enter tickers in the sidebar and click 'Analyze Stocks'")
\ No newline at end of file
+    st.info("👈 Enter tickers in the sidebar and click 'Analyze Stocks'")
+
+# Profile of this run (when enabled from the sidebar or TRADINGTOOL_PROFILE=1)
+render_profile_report(profiler)
@@ -0,0 +1,103 @@
+"""
+Analysis API Client - Thin client for v2/api_server.py
+
+When TRADINGTOOL_API_URL is set (e.g. http://127.0.0.1:8765) and the server
+answers, the UIs fetch through it instead of calling yfinance themselves, so
+every session shares the server's cache. Otherwise they keep calling the
+data layer directly.
+
+    client = get_api_client()
+    fetch = client.fetch_price_data if client else fetch_price_data
+"""
+import io
+import os
+from typing import Any, Dict, List, Optional
+
+import pandas as pd
+import requests
+
+from v2.constants.constants import fetch_price_data_days
+
+# Try importing pyarrow (optional; frames are requested as Arrow when available)
+try:
+    import pyarrow as pa
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+
+API_URL_ENV = "TRADINGTOOL_API_URL"
+
+# Must match api_server.ARROW_CONTENT_TYPE
+ARROW_CONTENT_TYPE = "application/vnd.apache.arrow.stream"
+
+
+class ApiClient:
+    """Same call shapes as the v2 data functions, served by the local API server."""
+
+    def __init__(self, base_url: str, timeout: float = 60):
+        self.base_url = base_url.rstrip("/")
+        self.timeout = timeout
+        self.session = requests.Session()
+
+    def _get(self, path: str, **params) -> requests.Response:
+        response = self.session.get(f"{self.base_url}{path}", params=params, timeout=self.timeout)
+        response.raise_for_status()
+        return response
+
+    def _get_frame(self, path: str, **params) -> pd.DataFrame:
+        if PYARROW_AVAILABLE:
+            params["format"] = "arrow"
+        response = self._get(path, **params)
+        if response.headers.get("Content-Type") == ARROW_CONTENT_TYPE:
+            return pa.ipc.open_stream(io.BytesIO(response.content)).read_pandas()
+        return pd.DataFrame(response.json())
+
+    def is_available(self) -> bool:
+        """True if the server answers its health check."""
+        try:
+            return self.session.get(f"{self.base_url}/health", timeout=2).ok
+        except requests.RequestException:
+            return False
+
+    def fetch_price_data(self, symbol: str, days: int = fetch_price_data_days) -> pd.DataFrame:
+        """Like price_service.fetch_price_data (Date as datetime.date)."""
+        df = self._get_frame("/prices", symbol=symbol, days=days)
+        if not df.empty:
+            df["Date"] = pd.to_datetime(df["Date"]).dt.date
+        return df
+
+    def fetch_metrics(self, symbols: List[str]) -> pd.DataFrame:
+        """Latest indicator and footprint columns, indexed by Symbol."""
+        return self._get_frame("/metrics", symbols=",".join(symbols)).set_index("Symbol")
+
+    def fetch_signals(self, symbols: List[str], screens: Optional[List[str]] = None) -> pd.DataFrame:
+        """Boolean screen matches [symbols x screens] (default: all config.SCREENS)."""
+        params = {"symbols": ",".join(symbols)}
+        if screens:
+            params["screens"] = ",".join(screens)
+        return self._get_frame("/signals", **params).set_index("Symbol")
+
+    def fetch_earnings_with_performance(self, symbol: str, num_quarters: int = 3) -> Dict[str, Any]:
+        """Like earnings_service.fetch_earnings_with_performance."""
+        return self._get("/earnings", symbol=symbol, quarters=num_quarters).json()
+
+    def get_fundamentals(self, symbol: str) -> Dict[str, Any]:
+        """Like fundamentals_service.get_fundamentals."""
+        return self._get("/fundamentals", symbol=symbol).json()
+
+    def load_relative_strength(self, k: int = 20, by: str = "RS_Score") -> pd.DataFrame:
+        """Top-k relative strength rows, indexed by Symbol."""
+        table = self._get_frame("/relative_strength", k=k, by=by)
+        return table.set_index("Symbol") if "Symbol" in table else table
+
+
+def get_api_client() -> Optional[ApiClient]:
+    """Client for TRADINGTOOL_API_URL, or None if it is unset or the server is not answering."""
+    base_url = os.environ.get(API_URL_ENV)
+    if not base_url:
+        return None
+    client = ApiClient(base_url)
+    if not client.is_available():
+        print(f"Analysis API at {base_url} is not reachable; fetching data directly")
+        return None
+    return client
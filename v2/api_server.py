@@ -0,0 +1,225 @@
+"""
+Analysis API Server - Local HTTP service over the v2 data and analysis functions
+Entry point: python -m v2.api_server --port 8765
+
+Several Streamlit sessions and scripts on one machine can share a single
+process that talks to yfinance/NSE. Results are kept in the shared,
+memory-bounded in-process cache (see v2/data/memory_cache.py: per trading
+day, with a time-to-live), and concurrent requests for the same resource are
+collapsed into one upstream fetch (SingleFlight), so upstream traffic grows
+with the number of distinct symbols, not with the number of users. Clients use v2/api_client.py.
+
+Endpoints (GET, JSON unless format=arrow is given and pyarrow is installed):
+    /health                                    cache hit/miss/eviction counters and bytes
+    /prices?symbol=TCS&days=60[&format=arrow]
+    /metrics?symbols=TCS,INFY                  latest indicator, footprint + baseline columns
+    /signals?symbols=TCS,INFY[&screens=volume_spike,rsi < 30]
+    /earnings?symbol=TCS&quarters=3
+    /fundamentals?symbol=TCS
+    /relative_strength?k=20&by=RS_Score[&format=arrow]
+
+Examples:
+    python -m v2.api_server
+    python -m v2.api_server --host 0.0.0.0 --port 9000 --ttl 120 --cache-mb 1024
+"""
+import argparse
+import json
+import math
+from datetime import date, datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, Hashable, List, Optional
+from urllib.parse import parse_qs, urlparse
+
+import numpy as np
+import pandas as pd
+
+from v2.config import SCREENS
+from v2.data.earnings_service import fetch_earnings_with_performance
+from v2.data.fundamentals_service import get_fundamentals
+from v2.data.memory_cache import configure_memory_cache, get_memory_cache
+from v2.data.price_service import fetch_price_data
+from v2.data.trading_calendar import last_trading_day
+from v2.engine.footprint import footprint_columns
+from v2.engine.indicators import indicator_columns
+from v2.engine.relative_strength import load_relative_strength, top_relative_strength
+from v2.engine.rolling_stats import baseline_columns
+from v2.signals.screen_dsl import ScreenSyntaxError, evaluate_screens
+
+# Try importing pyarrow (optional, for Arrow IPC responses)
+try:
+    import pyarrow as pa
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+
+ARROW_CONTENT_TYPE = "application/vnd.apache.arrow.stream"
+
+# Trading days of history used for /metrics and /signals (covers the 52-week columns)
+METRICS_HISTORY_DAYS = 260
+
+DEFAULT_PORT = 8765
+
+
+class AnalysisService:
+    """
+    The v2 functions behind each endpoint, served through the shared MemoryCache.
+
+    Prices come from the memoized fetch_price_data; the other results are kept
+    per trading day for `ttl` seconds.
+    """
+
+    def __init__(self, ttl: float = 300):
+        self.ttl = ttl
+        self.cache = get_memory_cache()
+
+    def _cached(self, key: Hashable, fetch: Callable[[], Any]) -> Any:
+        return self.cache.get_or_compute(("api", str(last_trading_day())) + key, fetch, self.ttl)
+
+    def prices(self, symbol: str, days: int) -> pd.DataFrame:
+        return fetch_price_data(symbol, days=days)
+
+    def metrics(self, symbols: List[str]) -> pd.DataFrame:
+        """Latest indicator, footprint and volume baseline columns per symbol (one row per symbol)."""
+        frames = [self.prices(symbol, METRICS_HISTORY_DAYS) for symbol in symbols]
+        long = pd.concat([df.assign(Symbol=s) for s, df in zip(symbols, frames) if not df.empty], ignore_index=True) \
+            if any(not df.empty for df in frames) else pd.DataFrame(columns=["Date", "Symbol"])
+
+        panels = {field: long.pivot(index="Date", columns="Symbol", values=field).reindex(columns=symbols)
+                  .to_numpy(dtype="float64") if not long.empty else np.full((0, len(symbols)), np.nan)
+                  for field in ("High", "Low", "Close", "Volume")}
+        columns = indicator_columns(panels["High"], panels["Low"], panels["Close"], panels["Volume"])
+        columns.update(footprint_columns(panels["High"], panels["Low"], panels["Close"], panels["Volume"]))
+        columns.update(baseline_columns(panels["Volume"]))
+        return pd.DataFrame(columns, index=pd.Index(symbols, name="Symbol"))
+
+    def signals(self, symbols: List[str], screens: Dict[str, str]) -> pd.DataFrame:
+        metrics = self.metrics(symbols)
+        return evaluate_screens({c: metrics[c].to_numpy() for c in metrics.columns}, screens, index=symbols)
+
+    def earnings(self, symbol: str, quarters: int) -> Dict[str, Any]:
+        return self._cached(("earnings", symbol, quarters), lambda: fetch_earnings_with_performance(symbol, quarters))
+
+    def fundamentals(self, symbol: str) -> Dict[str, Any]:
+        return self._cached(("fundamentals", symbol), lambda: get_fundamentals(symbol))
+
+    def relative_strength(self, k: int, by: str) -> pd.DataFrame:
+        table = self._cached(("relative_strength",), load_relative_strength)
+        return top_relative_strength(table, k=k, by=by) if not table.empty else table
+
+
+def _to_json_value(value: Any) -> Any:
+    """JSON-safe copy: NaN/NaT -> null, dates -> ISO strings, numpy scalars -> Python."""
+    if isinstance(value, dict):
+        return {str(k): _to_json_value(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_to_json_value(v) for v in value]
+    if isinstance(value, np.generic):
+        value = value.item()
+    if isinstance(value, float) and not math.isfinite(value):
+        return None
+    if value is pd.NaT or (value is not None and not isinstance(value, (str, bool, int, float)) and pd.isna(value)):
+        return None
+    if isinstance(value, (datetime, date, pd.Timestamp)):
+        return value.isoformat()
+    return value
+
+
+def frame_records(df: pd.DataFrame) -> List[Dict[str, Any]]:
+    """DataFrame (index included if named) as a list of JSON-safe records."""
+    if df.index.name is not None:
+        df = df.reset_index()
+    return _to_json_value(df.to_dict("records"))
+
+
+def _make_handler(service: AnalysisService):
+    class Handler(BaseHTTPRequestHandler):
+        def log_message(self, fmt, *args):
+            pass
+
+        def _send(self, status: int, body: bytes, content_type: str):
+            self.send_response(status)
+            self.send_header("Content-Type", content_type)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def _send_json(self, payload: Any, status: int = 200):
+            self._send(status, json.dumps(_to_json_value(payload)).encode("utf-8"), "application/json")
+
+        def _send_frame(self, df: pd.DataFrame, fmt: str):
+            if fmt == "arrow" and PYARROW_AVAILABLE:
+                table = pa.Table.from_pandas(df.reset_index() if df.index.name is not None else df,
+                                             preserve_index=False)
+                sink = pa.BufferOutputStream()
+                with pa.ipc.new_stream(sink, table.schema) as writer:
+                    writer.write_table(table)
+                self._send(200, sink.getvalue().to_pybytes(), ARROW_CONTENT_TYPE)
+            else:
+                self._send_json(frame_records(df))
+
+        def do_GET(self):
+            url = urlparse(self.path)
+            params = {k: v[-1] for k, v in parse_qs(url.query).items()}
+            fmt = params.get("format", "json")
+            symbols = [s.strip().upper() for s in params.get("symbols", params.get("symbol", "")).split(",")
+                       if s.strip()]
+            try:
+                if url.path == "/health":
+                    self._send_json({"status": "ok", **service.cache.stats()})
+                elif url.path == "/prices" and symbols:
+                    self._send_frame(service.prices(symbols[0], int(params.get("days", 60))), fmt)
+                elif url.path == "/metrics" and symbols:
+                    self._send_frame(service.metrics(symbols), fmt)
+                elif url.path == "/signals" and symbols:
+                    names = [s for s in params.get("screens", "").split(",") if s.strip()]
+                    screens = {name: SCREENS.get(name, name) for name in names} or SCREENS
+                    self._send_frame(service.signals(symbols, screens).rename_axis("Symbol"), fmt)
+                elif url.path == "/earnings" and symbols:
+                    self._send_json(service.earnings(symbols[0], int(params.get("quarters", 3))))
+                elif url.path == "/fundamentals" and symbols:
+                    self._send_json(service.fundamentals(symbols[0]))
+                elif url.path == "/relative_strength":
+                    self._send_frame(service.relative_strength(int(params.get("k", 20)),
+                                                               params.get("by", "RS_Score")), fmt)
+                else:
+                    self._send_json({"error": f"Unknown endpoint or missing symbol: {url.path}"}, status=404)
+            except (ValueError, KeyError, ScreenSyntaxError) as e:
+                self._send_json({"error": str(e)}, status=400)
+            except Exception as e:
+                print(f"Error serving {self.path}: {e}")
+                self._send_json({"error": str(e)}, status=500)
+
+    return Handler
+
+
+def make_server(host: str = "127.0.0.1", port: int = DEFAULT_PORT, ttl: float = 300) -> ThreadingHTTPServer:
+    """HTTP server with one shared AnalysisService (call serve_forever() to run it)."""
+    server = ThreadingHTTPServer((host, port), _make_handler(AnalysisService(ttl)))
+    server.daemon_threads = True
+    return server
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Serve v2 prices, metrics, signals and earnings over local HTTP")
+    parser.add_argument("--host", default="127.0.0.1", help="Interface to bind")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT, help="Port to listen on")
+    parser.add_argument("--ttl", type=float, default=300, help="Seconds a cached result is served before refetching")
+    parser.add_argument("--cache-mb", type=float, default=None,
+                        help="Memory budget of the in-process cache (default: config.MEMORY_CACHE_MB)")
+    args = parser.parse_args(argv)
+
+    configure_memory_cache(max_mb=args.cache_mb)
+
+    server = make_server(args.host, args.port, args.ttl)
+    cache_mb = get_memory_cache().max_bytes / 1024 / 1024
+    print(f"Analysis API listening on http://{args.host}:{args.port} (cache ttl {args.ttl:g}s, {cache_mb:g} MB)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("API server stopped")
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
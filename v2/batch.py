@@ -0,0 +1,494 @@
+"""
+Batch Analysis CLI - Headless v2 runner for large stock universes
+Entry point: python -m v2.batch --universe universe.txt
+
+Runs price analysis and/or earnings-with-performance for every symbol in a
+universe file without Streamlit. Results are streamed to disk as each symbol
+finishes, so memory stays flat regardless of universe size. Finished symbols
+are recorded in a per-mode checkpoint file; re-running the same command skips
+them and resumes where an interrupted run stopped.
+
+Examples:
+    python -m v2.batch --universe nifty500.txt --mode price --format parquet
+    python -m v2.batch --universe universe.csv --mode price earnings --output-dir out/
+    python -m v2.batch --universe nifty500.txt --build-archive --days 500
+    python -m v2.batch --universe nifty500.txt --refresh-fundamentals
+    python -m v2.batch --universe nifty500.txt --screen volume_spike trend_breakout
+    python -m v2.batch --universe nifty500.txt --correlations --min-correlation 0.7
+    python -m v2.batch --universe nifty500.txt --reporting-within 14
+"""
+import argparse
+import json
+import os
+import sys
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from typing import Callable, Dict, List, Optional, Set
+
+import pandas as pd
+
+from v2.constants.constants import fetch_price_data_days
+from v2.data.price_service import fetch_price_data
+from v2.data.earnings_service import fetch_earnings_with_performance
+from v2.data.price_archive import build_price_archive, open_price_archive
+from v2.data.board_meetings import get_board_meeting_calendar
+from v2.data.fundamentals_service import refresh_fundamentals_snapshot
+from v2.config import SCREENS
+from v2.engine.correlation import cluster_labels, correlation_clusters, load_correlation_matrix
+from v2.signals.screen_dsl import screen_archive
+
+MODES = ("price", "earnings")
+FORMATS = ("csv", "jsonl", "parquet")
+
+# Earnings rows are written in long format (one row per past quarter) so every
+# chunk has the same columns and can be appended safely.
+EARNINGS_COLUMNS = [
+    "Symbol", "Ticker", "Next_Earnings", "Relative_Performance",
+    "Sector_Index", "Sector_Relative_Performance",
+    "Earnings_Date", "Stock_Perf_1W", "Nifty_Perf_1W", "Sector_Perf_1W",
+    "EPS_Reported", "EPS_Estimate", "Surprise_Pct"
+]
+EARNINGS_NUMERIC_COLUMNS = [
+    "Relative_Performance", "Sector_Relative_Performance",
+    "Stock_Perf_1W", "Nifty_Perf_1W", "Sector_Perf_1W",
+    "EPS_Reported", "EPS_Estimate", "Surprise_Pct"
+]
+
+
+def load_universe(path: str) -> List[str]:
+    """
+    Read stock symbols from a universe file.
+
+    Args:
+        path: Text file with one symbol per line ('#' starts a comment),
+              or a CSV file with a "Symbol" column (first column otherwise)
+
+    Returns:
+        List of unique upper-case symbols in file order
+    """
+    if path.lower().endswith(".csv"):
+        df = pd.read_csv(path)
+        column = next((c for c in df.columns if str(c).lower() == "symbol"), df.columns[0])
+        raw_symbols = df[column].dropna().astype(str).tolist()
+    else:
+        with open(path, encoding="utf-8") as f:
+            raw_symbols = [line.split("#", 1)[0] for line in f]
+
+    symbols = []
+    seen = set()
+    for symbol in raw_symbols:
+        symbol = symbol.strip().upper()
+        if symbol and symbol not in seen:
+            seen.add(symbol)
+            symbols.append(symbol)
+    return symbols
+
+
+class Checkpoint:
+    """Append-only record of symbols that are fully written for one mode."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.done: Set[str] = set()
+        if os.path.exists(path):
+            with open(path, encoding="utf-8") as f:
+                for line in f:
+                    symbol = line.split("\t", 1)[0].strip()
+                    if symbol:
+                        self.done.add(symbol)
+
+    def mark(self, symbols: List[str], status: Dict[str, str]):
+        """Record symbols as finished. Each line is flushed to disk immediately."""
+        if not symbols:
+            return
+        with open(self.path, "a", encoding="utf-8") as f:
+            for symbol in symbols:
+                f.write(f"{symbol}\t{status.get(symbol, 'ok')}\n")
+                self.done.add(symbol)
+            f.flush()
+            os.fsync(f.fileno())
+
+
+class ResultWriter:
+    """
+    Base class for streaming result writers.
+
+    Symbols are only reported back from flush() once their rows are on disk,
+    so the checkpoint never gets ahead of the output file. The output can get
+    ahead of the checkpoint (a crash between writing and marking), so a
+    resumed run first calls discard_unfinished() to drop those rows.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.pending: List[str] = []
+
+    def discard_unfinished(self, done: Set[str]) -> int:
+        """Remove rows of symbols not in `done` from existing output; returns rows removed."""
+        return 0
+
+    def add(self, symbol: str, df: pd.DataFrame):
+        self.pending.append(symbol)
+
+    def flush(self, force: bool = False) -> List[str]:
+        flushed, self.pending = self.pending, []
+        return flushed
+
+    def close(self) -> List[str]:
+        return self.flush(force=True)
+
+
+class CsvResultWriter(ResultWriter):
+    """Appends each symbol's rows to a single CSV file."""
+
+    def discard_unfinished(self, done: Set[str]) -> int:
+        if not os.path.exists(self.path) or os.path.getsize(self.path) == 0:
+            return 0
+        # Values are read and written back as text, so kept rows are unchanged
+        tmp_path = f"{self.path}.tmp"
+        removed = 0
+        with open(tmp_path, "w", encoding="utf-8", newline="") as out:
+            chunks = pd.read_csv(self.path, dtype=str, keep_default_na=False, chunksize=100_000)
+            for i, chunk in enumerate(chunks):
+                keep = chunk["Symbol"].isin(done)
+                removed += int((~keep).sum())
+                chunk[keep].to_csv(out, header=i == 0, index=False)
+        if removed:
+            os.replace(tmp_path, self.path)
+        else:
+            os.remove(tmp_path)
+        return removed
+
+    def add(self, symbol: str, df: pd.DataFrame):
+        if not df.empty:
+            write_header = not os.path.exists(self.path) or os.path.getsize(self.path) == 0
+            with open(self.path, "a", encoding="utf-8", newline="") as f:
+                df.to_csv(f, header=write_header, index=False)
+        super().add(symbol, df)
+
+
+class JsonlResultWriter(ResultWriter):
+    """Appends each symbol's rows to a JSON Lines file."""
+
+    def discard_unfinished(self, done: Set[str]) -> int:
+        if not os.path.exists(self.path):
+            return 0
+        tmp_path = f"{self.path}.tmp"
+        removed = 0
+        with open(self.path, encoding="utf-8") as src, open(tmp_path, "w", encoding="utf-8") as out:
+            for line in src:
+                if line.strip() and json.loads(line).get("Symbol") in done:
+                    out.write(line)
+                elif line.strip():
+                    removed += 1
+        if removed:
+            os.replace(tmp_path, self.path)
+        else:
+            os.remove(tmp_path)
+        return removed
+
+    def add(self, symbol: str, df: pd.DataFrame):
+        if not df.empty:
+            lines = df.to_json(orient="records", lines=True, date_format="iso")
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(lines if lines.endswith("\n") else lines + "\n")
+        super().add(symbol, df)
+
+
+class ParquetResultWriter(ResultWriter):
+    """
+    Buffers rows and writes them as numbered part files in a directory.
+
+    Parquet files cannot be appended to, so a resumed run simply continues the
+    part numbering. Read the result back with pd.read_parquet(directory).
+    """
+
+    def __init__(self, path: str, flush_rows: int = 50_000):
+        super().__init__(path)
+        self.flush_rows = flush_rows
+        self.frames: List[pd.DataFrame] = []
+        self.buffered_rows = 0
+        os.makedirs(path, exist_ok=True)
+        self.part = len([f for f in os.listdir(path) if f.endswith(".parquet")])
+
+    def discard_unfinished(self, done: Set[str]) -> int:
+        removed = 0
+        for name in sorted(f for f in os.listdir(self.path) if f.endswith(".parquet")):
+            part_path = os.path.join(self.path, name)
+            df = pd.read_parquet(part_path)
+            keep = df["Symbol"].isin(done)
+            if keep.all():
+                continue
+            removed += int((~keep).sum())
+            # Emptied parts are kept (as empty files) so the part numbering stays intact
+            tmp_path = f"{part_path}.tmp"
+            df[keep].to_parquet(tmp_path, index=False)
+            os.replace(tmp_path, part_path)
+        return removed
+
+    def add(self, symbol: str, df: pd.DataFrame):
+        if not df.empty:
+            self.frames.append(df)
+            self.buffered_rows += len(df)
+        super().add(symbol, df)
+
+    def flush(self, force: bool = False) -> List[str]:
+        if not force and self.buffered_rows < self.flush_rows:
+            return []
+        if self.frames:
+            part_path = os.path.join(self.path, f"part-{self.part:05d}.parquet")
+            pd.concat(self.frames, ignore_index=True).to_parquet(part_path, index=False)
+            self.part += 1
+            self.frames = []
+            self.buffered_rows = 0
+        return super().flush(force)
+
+
+def _make_writer(output_dir: str, mode: str, fmt: str) -> ResultWriter:
+    if fmt == "csv":
+        return CsvResultWriter(os.path.join(output_dir, f"{mode}.csv"))
+    if fmt == "jsonl":
+        return JsonlResultWriter(os.path.join(output_dir, f"{mode}.jsonl"))
+    return ParquetResultWriter(os.path.join(output_dir, mode))
+
+
+def analyze_price(symbol: str, days: int) -> pd.DataFrame:
+    """Fetch price data for one symbol as rows ready to be written."""
+    df = fetch_price_data(symbol, days=days)
+    if df.empty:
+        return df
+    df.insert(0, "Symbol", symbol)
+    return df
+
+
+def analyze_earnings(symbol: str, num_quarters: int) -> pd.DataFrame:
+    """Fetch earnings with performance for one symbol, flattened to one row per quarter."""
+    data = fetch_earnings_with_performance(symbol, num_quarters=num_quarters)
+    base = {
+        "Symbol": data["symbol"],
+        "Ticker": data.get("ticker", symbol),
+        "Next_Earnings": data.get("next_earnings"),
+        "Relative_Performance": data.get("relative_performance"),
+        "Sector_Index": data.get("sector_index"),
+        "Sector_Relative_Performance": data.get("sector_relative_performance"),
+    }
+    rows = []
+    for entry in data.get("history", []):
+        rows.append({
+            **base,
+            "Earnings_Date": entry.get("date"),
+            "Stock_Perf_1W": entry.get("stock_performance"),
+            "Nifty_Perf_1W": entry.get("nifty_performance"),
+            "Sector_Perf_1W": entry.get("sector_performance"),
+            "EPS_Reported": entry.get("eps_reported"),
+            "EPS_Estimate": entry.get("eps_estimate"),
+            "Surprise_Pct": entry.get("surprise_pct"),
+        })
+    if not rows:
+        rows.append(base)
+
+    df = pd.DataFrame(rows, columns=EARNINGS_COLUMNS)
+    df["Next_Earnings"] = pd.to_datetime(df["Next_Earnings"], errors="coerce", utc=True)
+    for column in EARNINGS_NUMERIC_COLUMNS:
+        df[column] = pd.to_numeric(df[column], errors="coerce").astype("float64")
+    return df
+
+
+def run_batch(symbols: List[str], modes: List[str], output_dir: str, fmt: str = "csv",
+              days: int = fetch_price_data_days, num_quarters: int = 3,
+              workers: int = 4) -> Dict[str, int]:
+    """
+    Run the selected analyses over a universe, streaming results to disk.
+
+    Args:
+        symbols: Stock symbols to analyze
+        modes: Any of "price", "earnings"
+        output_dir: Directory for result files and checkpoints
+        fmt: Output format - "csv", "jsonl" or "parquet"
+        days: Trading days of price data per symbol
+        num_quarters: Past quarters of earnings per symbol
+        workers: Number of symbols fetched concurrently
+
+    Returns:
+        Dictionary with counts of "written", "empty", "failed" and "skipped" jobs
+    """
+    os.makedirs(output_dir, exist_ok=True)
+
+    analyzers: Dict[str, Callable[[str], pd.DataFrame]] = {
+        "price": lambda s: analyze_price(s, days),
+        "earnings": lambda s: analyze_earnings(s, num_quarters),
+    }
+    checkpoints = {m: Checkpoint(os.path.join(output_dir, f"{m}.checkpoint")) for m in modes}
+    writers = {m: _make_writer(output_dir, m, fmt) for m in modes}
+    status: Dict[str, Dict[str, str]] = {m: {} for m in modes}
+    counts = {"written": 0, "empty": 0, "failed": 0, "skipped": 0}
+
+    jobs = []
+    for symbol in symbols:
+        for mode in modes:
+            if symbol in checkpoints[mode].done:
+                counts["skipped"] += 1
+            else:
+                jobs.append((mode, symbol))
+
+    total = len(jobs)
+    if counts["skipped"]:
+        print(f"Resuming: {counts['skipped']} job(s) already done, {total} remaining")
+
+    # Rows written before an interruption but never checkpointed would be written again
+    for mode in modes:
+        removed = writers[mode].discard_unfinished(checkpoints[mode].done)
+        if removed:
+            print(f"Resuming: removed {removed} {mode} row(s) of unfinished symbols from {writers[mode].path}")
+
+    # Keep a bounded number of jobs in flight so finished results never pile up in memory
+    max_in_flight = max(1, workers) * 2
+    finished = 0
+    job_iter = iter(jobs)
+
+    try:
+        with ThreadPoolExecutor(max_workers=max(1, workers)) as executor:
+            in_flight = {}
+
+            def submit_next() -> bool:
+                job = next(job_iter, None)
+                if job is None:
+                    return False
+                mode, symbol = job
+                in_flight[executor.submit(analyzers[mode], symbol)] = job
+                return True
+
+            while len(in_flight) < max_in_flight and submit_next():
+                pass
+
+            while in_flight:
+                done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in done:
+                    mode, symbol = in_flight.pop(future)
+                    finished += 1
+                    try:
+                        df = future.result()
+                    except Exception as e:
+                        # Not checkpointed, so the symbol is retried on the next run
+                        counts["failed"] += 1
+                        print(f"[{finished}/{total}] {mode:<8} {symbol:<15} failed: {e}", file=sys.stderr)
+                        submit_next()
+                        continue
+
+                    if df.empty:
+                        counts["empty"] += 1
+                        status[mode][symbol] = "empty"
+                        print(f"[{finished}/{total}] {mode:<8} {symbol:<15} no data")
+                    else:
+                        counts["written"] += 1
+                        print(f"[{finished}/{total}] {mode:<8} {symbol:<15} {len(df)} row(s)")
+
+                    writers[mode].add(symbol, df)
+                    checkpoints[mode].mark(writers[mode].flush(), status[mode])
+                    submit_next()
+    finally:
+        for mode in modes:
+            checkpoints[mode].mark(writers[mode].close(), status[mode])
+
+    return counts
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Headless v2 batch analysis with resumable streaming output")
+    parser.add_argument("--universe", required=True, help="Universe file (.txt one symbol per line, or .csv)")
+    parser.add_argument("--mode", nargs="+", choices=MODES, default=["price"],
+                        help="Analyses to run (default: price)")
+    parser.add_argument("--output-dir", default="batch_output", help="Directory for results and checkpoints")
+    parser.add_argument("--format", choices=FORMATS, default="csv", dest="fmt", help="Output format")
+    parser.add_argument("--days", type=int, default=fetch_price_data_days, help="Trading days of price data")
+    parser.add_argument("--quarters", type=int, default=3, help="Past quarters of earnings history")
+    parser.add_argument("--workers", type=int, default=4, help="Symbols fetched concurrently")
+    parser.add_argument("--build-archive", action="store_true",
+                        help="Build the memory-mapped price archive for the universe instead")
+    parser.add_argument("--refresh-fundamentals", action="store_true",
+                        help="Refresh today's fundamentals snapshot for the universe instead")
+    parser.add_argument("--screen", nargs="+", metavar="SCREEN",
+                        help="Evaluate screens (config.SCREENS names or expressions) over the price archive instead")
+    parser.add_argument("--correlations", action="store_true",
+                        help="Refresh the return correlation matrix of the price archive and list clusters instead")
+    parser.add_argument("--min-correlation", type=float, default=0.7,
+                        help="Correlation that links two symbols into a cluster (with --correlations)")
+    parser.add_argument("--reporting-within", type=int, metavar="DAYS",
+                        help="List universe symbols with a results board meeting in the next DAYS days instead")
+    args = parser.parse_args(argv)
+
+    symbols = load_universe(args.universe)
+    if not symbols:
+        print(f"No symbols found in {args.universe}")
+        return
+
+    if args.build_archive:
+        build_price_archive(symbols, days=args.days, workers=args.workers)
+        return
+
+    if args.refresh_fundamentals:
+        refresh_fundamentals_snapshot(symbols, workers=args.workers)
+        return
+
+    if args.screen:
+        archive = open_price_archive()
+        if archive is None:
+            print("No price archive found. Build one first with --build-archive")
+            return
+        screens = {name: SCREENS.get(name, name) for name in args.screen}
+        archived = set(archive.symbols)
+        try:
+            matches = screen_archive(screens, symbols=[s for s in symbols if s in archived], archive=archive)
+        except (ValueError, KeyError) as e:
+            print(f"Invalid screen: {e}")
+            return
+        os.makedirs(args.output_dir, exist_ok=True)
+        path = os.path.join(args.output_dir, "screens.csv")
+        matches.to_csv(path)
+        for name in screens:
+            print(f"{name}: {int(matches[name].sum())} match(es)")
+        print(f"Screen results -> {path}")
+        return
+
+    if args.correlations:
+        corr = load_correlation_matrix(refresh=True)
+        if corr.empty:
+            print("No price archive found. Build one first with --build-archive")
+            return
+        universe = [s for s in symbols if s in corr.index]
+        corr = corr.loc[universe, universe]
+        os.makedirs(args.output_dir, exist_ok=True)
+        path = os.path.join(args.output_dir, "clusters.csv")
+        cluster_labels(corr, args.min_correlation).to_csv(path)
+        clusters = correlation_clusters(corr, args.min_correlation)
+        print(f"{len(clusters)} cluster(s) with correlation >= {args.min_correlation:g}")
+        for number, group in enumerate(clusters[:10]):
+            print(f"  {number}: {', '.join(group)}")
+        print(f"Cluster labels -> {path}")
+        return
+
+    if args.reporting_within is not None:
+        calendar = get_board_meeting_calendar()
+        if not len(calendar):
+            print("NSE board-meeting calendar unavailable")
+            return
+        meetings = calendar.reporting_within(args.reporting_within)
+        universe = {s.removesuffix(".NS") for s in symbols}
+        meetings = meetings[meetings["Symbol"].isin(universe)]
+        os.makedirs(args.output_dir, exist_ok=True)
+        path = os.path.join(args.output_dir, "reporting.csv")
+        meetings.to_csv(path, index=False)
+        print(f"{meetings['Symbol'].nunique()} symbol(s) report results in the next {args.reporting_within} day(s)")
+        for row in meetings.head(20).itertuples():
+            print(f"  {pd.Timestamp(row.Date):%Y-%m-%d}  {row.Symbol}")
+        print(f"Results meetings -> {path}")
+        return
+
+    print(f"Running {', '.join(args.mode)} for {len(symbols)} symbol(s) -> {args.output_dir} ({args.fmt})")
+    counts = run_batch(symbols, args.mode, args.output_dir, fmt=args.fmt, days=args.days,
+                       num_quarters=args.quarters, workers=args.workers)
+    print(f"Done: {counts['written']} written, {counts['empty']} empty, "
+          f"{counts['failed']} failed, {counts['skipped']} skipped")
+
+
+if __name__ == "__main__":
+    main()
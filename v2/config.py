@@ -12,3 +12,69 @@ ALPHAVANTAGE_API_KEY = os.environ.get("ALPHAVANTAGE_API_KEY", "6IID07YUQ344LUDG"
 
 # API Base URL
 ALPHAVANTAGE_BASE_URL = "https://www.alphavantage.co/query"
+
+# Local cache directory for downloaded market data
+# Shared by every v2 process (Streamlit, batch runs, scanners) on this machine
+CACHE_DIR = os.environ.get(
+    "TRADINGTOOL_CACHE_DIR",
+    os.path.join(os.path.expanduser("~"), ".cache", "tradingtool")
+)
+
+# In-process memory cache for fetched frames (see v2/data/memory_cache.py)
+# Budget in MB for all cached DataFrames/arrays per process, and seconds an entry is served
+MEMORY_CACHE_MB = int(os.environ.get("TRADINGTOOL_MEMORY_CACHE_MB", "512"))
+MEMORY_CACHE_TTL = 900
+
+# Named stock screens (see v2/signals/screen_dsl.py for the expression syntax)
+# Columns: close, volume, rsi, rsi_prev, sma20, sma50, sma200, avg_volume_20,
+#          vol_spike, change_pct, high_52w, low_52w
+# Footprint columns (price archive screens and the live monitor, see v2/engine/footprint.py):
+#          vwap_20, close_vs_vwap_pct, obv_trend_20, cmf_20, up_down_volume_20
+# Volume baseline columns (see v2/engine/rolling_stats.py): median_volume_20,
+#          volume_robust_z_20, volume_robust_z_50 (robust z-score vs the rolling median/MAD)
+SCREENS = {
+    # Volume > 1.5x the 20-day average while RSI is not yet overbought
+    "volume_spike": "vol_spike > 1.5 and rsi < 70",
+    # RSI crossovers from get_smart_rsi_daily_signal
+    "bullish_reversal": "rsi_prev <= 30 and rsi > 30 and rsi < 70",
+    "bearish_reversal": "rsi_prev >= 70 and rsi < 70 and rsi > 30",
+    "oversold_bounce": "rsi <= 30 and rsi > rsi_prev",
+    "trend_breakout": "vol_spike > 1.5 and rsi < 70 and close > sma50",
+    "near_52w_high": "close >= 0.95 * high_52w and close > sma50",
+    # Money flowing in: closes near the highs on rising volume, price above its 20-day VWAP
+    "accumulation": "cmf_20 > 0.1 and up_down_volume_20 > 1.2 and close_vs_vwap_pct > 0",
+    # Volume far outside its usual range, judged by median/MAD so past spikes do not mask it
+    "unusual_volume": "volume_robust_z_20 > 3.5 and volume_robust_z_50 > 3.5",
+}
+
+# Screens the live monitor (v2/monitor.py) alerts on by default
+ALERT_SCREENS = ["volume_spike", "bullish_reversal", "bearish_reversal"]
+
+# Benchmarks for relative performance (names from v2/data/benchmarks.py BENCHMARKS)
+# Broad market index, and the sector index for each yfinance sector name.
+# v2/data/symbol_master.csv overrides the sector mapping per symbol.
+BENCHMARK_INDEX = "NIFTY 50"
+SECTOR_BENCHMARKS = {
+    "Technology": "NIFTY IT",
+    "Financial Services": "NIFTY FIN SERVICE",
+    "Consumer Cyclical": "NIFTY AUTO",
+    "Consumer Defensive": "NIFTY FMCG",
+    "Healthcare": "NIFTY PHARMA",
+    "Basic Materials": "NIFTY METAL",
+    "Energy": "NIFTY ENERGY",
+    "Utilities": "NIFTY ENERGY",
+    "Industrials": "NIFTY INFRA",
+    "Real Estate": "NIFTY REALTY",
+    "Communication Services": "NIFTY MEDIA",
+}
+
+# Parameter grid for the signal threshold sweep (python -m v2.sweep)
+# Every combination is evaluated; values in use today are listed first.
+SWEEP_GRID = {
+    "rsi_period": [14, 7, 10, 21],
+    "oversold": [30, 20, 25, 35],
+    "overbought": [70, 65, 75, 80],
+    "vol_spike": [1.5, 1.2, 2.0, 2.5, 3.0],
+    "volume_window": [20, 10, 30],
+    "sma_window": [50, 20, 100],
+}
@@ -2,4 +2,12 @@
 
 popular_stocks = ["NETWEB", "UNOMINDA", "ETERNAL"]
 
-fetch_price_data_days = 10  # Need 60 days for 20-day rolling baseline calculations
\ No newline at end of file
+fetch_price_data_days = 10  # Need 60 days for 20-day rolling baseline calculations
+
+earnings_fetch_workers = 4  # Symbols fetched in parallel on the earnings tab
+
+earnings_store_max_age_days = 14  # Re-scrape stored earnings history at least this often
+
+fundamentals_max_age_days = 7  # Refetch a symbol's fundamentals if its snapshot row is older
+
+chart_max_points = 800  # Points per chart series sent to the browser (LTTB downsampled above this)
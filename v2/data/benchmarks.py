@@ -0,0 +1,214 @@
+"""
+Benchmarks - Registry of market indices and a shared per-process series cache
+
+Each stock is compared against the broad market (NIFTY 50) and its own
+sector index. The sector index comes from the symbol master
+(symbol_master.csv, shipped next to this file) or, for symbols not listed
+there, from the sector in the fundamentals snapshot via
+config.SECTOR_BENCHMARKS.
+
+Benchmark closes are loaded once per process and trading day, and shared
+by every caller (earnings cards, relative strength, batch runs). Returns for
+any number of windows and benchmarks are then computed with searchsorted
+over the cached arrays, so comparing a stock against every benchmark costs
+no extra downloads.
+"""
+import os
+import threading
+from functools import lru_cache
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from v2.config import BENCHMARK_INDEX, SECTOR_BENCHMARKS
+from v2.data.fundamentals_service import load_fundamentals_snapshot
+from v2.data.price_service import fetch_price_data
+from v2.data.symbols import to_ticker_symbol
+from v2.data.trading_calendar import add_trading_days, last_trading_day, to_days, trading_days_between
+
+# Benchmark name -> yfinance ticker
+BENCHMARKS = {
+    "NIFTY 50": "^NSEI",
+    "NIFTY BANK": "^NSEBANK",
+    "NIFTY IT": "^CNXIT",
+    "NIFTY FIN SERVICE": "NIFTY_FIN_SERVICE.NS",
+    "NIFTY AUTO": "^CNXAUTO",
+    "NIFTY FMCG": "^CNXFMCG",
+    "NIFTY PHARMA": "^CNXPHARMA",
+    "NIFTY METAL": "^CNXMETAL",
+    "NIFTY ENERGY": "^CNXENERGY",
+    "NIFTY INFRA": "^CNXINFRA",
+    "NIFTY REALTY": "^CNXREALTY",
+    "NIFTY MEDIA": "^CNXMEDIA",
+    "NIFTY PSU BANK": "^CNXPSUBANK",
+}
+
+SYMBOL_MASTER_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "symbol_master.csv")
+
+# Trading days of history kept for each benchmark (covers a year of windows)
+DEFAULT_HISTORY_DAYS = 300
+
+_cache_lock = threading.Lock()
+_fetch_locks: Dict[str, threading.Lock] = {}
+_series_cache: Dict[str, tuple] = {}
+
+
+@lru_cache(maxsize=1)
+def load_symbol_master() -> pd.DataFrame:
+    """Symbol master indexed by NSE symbol with Name and Benchmark columns."""
+    master = pd.read_csv(SYMBOL_MASTER_FILE)
+    master["Symbol"] = master["Symbol"].str.upper()
+    return master.set_index("Symbol")
+
+
+def _plain_symbol(symbol: str) -> str:
+    symbol = symbol.upper().strip()
+    return symbol[:-3] if symbol.endswith(".NS") else symbol
+
+
+def sector_benchmarks(symbols: Sequence[str]) -> pd.Series:
+    """
+    Sector benchmark name for each symbol (vectorized).
+
+    Args:
+        symbols: Stock symbols (with or without .NS)
+
+    Returns:
+        Series indexed like `symbols` with a BENCHMARKS name, or NaN if unknown
+    """
+    plain = pd.Series([_plain_symbol(s) for s in symbols], index=list(symbols), dtype="object")
+    benchmarks = plain.map(load_symbol_master()["Benchmark"])
+
+    missing = benchmarks.isna()
+    if missing.any():
+        snapshot = load_fundamentals_snapshot()
+        if not snapshot.empty:
+            sectors = plain[missing].map(lambda s: to_ticker_symbol(s)).map(snapshot["sector"].astype("object"))
+            benchmarks[missing] = sectors.map(SECTOR_BENCHMARKS)
+    return benchmarks
+
+
+def sector_benchmark(symbol: str) -> Optional[str]:
+    """Sector benchmark name for one symbol, or None."""
+    value = sector_benchmarks([symbol]).iloc[0]
+    return None if pd.isna(value) else value
+
+
+def close_series(ticker_symbol: str, days: int) -> pd.Series:
+    """
+    Close prices from the local price cache as a Series on datetime64[D] dates.
+
+    Args:
+        ticker_symbol: yfinance ticker (e.g., "TCS.NS", "^NSEI")
+        days: Trading days of history
+
+    Returns:
+        Series of closes (empty if unavailable)
+    """
+    df = fetch_price_data(ticker_symbol, days=days)
+    if df.empty:
+        return pd.Series(dtype="float64")
+    dates = pd.to_datetime(df["Date"]).values.astype("datetime64[D]")
+    return pd.Series(df["Close"].to_numpy(dtype="float64"), index=dates)
+
+
+def get_benchmark_series(name: str, days: int = DEFAULT_HISTORY_DAYS) -> pd.Series:
+    """
+    Benchmark closes, loaded at most once per process and trading day.
+
+    Concurrent callers asking for the same benchmark wait for a single fetch.
+
+    Args:
+        name: Benchmark name from BENCHMARKS (e.g., "NIFTY 50")
+        days: Minimum trading days of history needed
+
+    Returns:
+        Series of closes on datetime64[D] dates (empty if unavailable).
+        Treat it as read-only; it is shared.
+    """
+    ticker_symbol = BENCHMARKS[name]
+    day = last_trading_day()
+
+    with _cache_lock:
+        cached = _series_cache.get(name)
+        if cached is not None and cached[0] == day and cached[1] >= days:
+            return cached[2]
+        fetch_lock = _fetch_locks.setdefault(name, threading.Lock())
+
+    with fetch_lock:
+        with _cache_lock:
+            cached = _series_cache.get(name)
+            if cached is not None and cached[0] == day and cached[1] >= days:
+                return cached[2]
+        series = close_series(ticker_symbol, max(days, DEFAULT_HISTORY_DAYS))
+        if not series.empty:
+            with _cache_lock:
+                _series_cache[name] = (day, max(days, DEFAULT_HISTORY_DAYS), series)
+        return series
+
+
+def window_returns(close: pd.Series, start_dates, days: int) -> np.ndarray:
+    """
+    Percentage change over windows of `days` trading days (vectorized).
+
+    Each window runs from the first session on/after its start date to the
+    session `days` trading days later (capped at the last completed session),
+    using the last available bar on or before that end session.
+
+    Args:
+        close: Closes on ascending datetime64[D] dates
+        start_dates: Array of window start dates (tz-aware dates use market time)
+        days: Window length in trading days
+
+    Returns:
+        Array of returns in percent (NaN where a window has fewer than 2 bars)
+    """
+    starts = np.atleast_1d(to_days(start_dates))
+    if close.empty or len(starts) == 0:
+        return np.full(len(starts), np.nan)
+
+    start_sessions = add_trading_days(starts, 0)
+    end_sessions = np.minimum(add_trading_days(starts, days), last_trading_day())
+
+    dates = close.index.values.astype("datetime64[D]")
+    values = close.to_numpy(dtype="float64")
+    start_idx = np.searchsorted(dates, start_sessions, side="left")
+    end_idx = np.searchsorted(dates, end_sessions, side="right") - 1
+
+    valid = (end_sessions > start_sessions) & (start_idx < len(dates)) & (end_idx > start_idx)
+    start_idx = np.clip(start_idx, 0, len(dates) - 1)
+    end_idx = np.clip(end_idx, 0, len(dates) - 1)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        returns = (values[end_idx] / values[start_idx] - 1) * 100
+    return np.where(valid, returns, np.nan)
+
+
+def history_days_for(start_dates, days: int) -> int:
+    """Trading days of history needed to cover windows starting at start_dates."""
+    starts = np.atleast_1d(to_days(start_dates))
+    if len(starts) == 0:
+        return days
+    return int(trading_days_between(starts.min(), last_trading_day())) + days + 5
+
+
+def relative_returns(close: pd.Series, start_dates, days: int,
+                     benchmarks: Optional[List[str]] = None) -> pd.DataFrame:
+    """
+    Stock and benchmark returns over the same windows.
+
+    Args:
+        close: Stock closes from close_series()
+        start_dates: Window start dates
+        days: Window length in trading days
+        benchmarks: Benchmark names (default: the broad benchmark only)
+
+    Returns:
+        DataFrame with one row per window: Stock, then one column per benchmark
+    """
+    benchmarks = benchmarks or [BENCHMARK_INDEX]
+    needed = history_days_for(start_dates, days)
+    result = {"Stock": window_returns(close, start_dates, days)}
+    for name in benchmarks:
+        result[name] = window_returns(get_benchmark_series(name, needed), start_dates, days)
+    return pd.DataFrame(result)
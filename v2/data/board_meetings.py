@@ -0,0 +1,176 @@
+"""
+Board Meetings - Exchange-wide NSE board-meeting calendar, indexed by symbol
+
+NSE publishes one event calendar with the upcoming board meetings of every
+listed company. It is downloaded at most once per trading day and stored as
+
+    CACHE_DIR/board_meetings/YYYY-MM-DD.pkl
+
+so a single request answers "when does X report next?" for every NSE
+stock. Meetings whose purpose mentions financial results are flagged once
+with a vectorized regex match at ingest, and the table is indexed in memory:
+
+- next_results_date(symbol): dictionary lookup
+- reporting_between(start, end) / reporting_within(days): searchsorted range
+  over the date-sorted results meetings (python -m v2.batch --reporting-within N)
+"""
+import threading
+import time
+from datetime import datetime, timedelta
+from typing import Dict, Optional
+
+import numpy as np
+import pandas as pd
+
+from v2.data.local_store import read_frame, store_path, write_frame
+from v2.data.trading_calendar import last_trading_day, market_now, to_days
+
+# Try importing nsepython (source of the NSE event calendar)
+try:
+    from nsepython import nsefetch
+    NSEPYTHON_AVAILABLE = True
+except ImportError:
+    NSEPYTHON_AVAILABLE = False
+    print("nsepython not installed. Install with: pip install nsepython")
+
+EVENT_CALENDAR_URL = "https://www.nseindia.com/api/event-calendar"
+
+# Purposes that announce financial results ("Unaudited" is covered by "audited")
+RESULTS_PURPOSE_PATTERN = r"financial results|earnings|audited"
+
+MEETING_COLUMNS = ["Symbol", "Company", "Date", "Purpose", "Description", "Is_Results"]
+
+# After a failed download, callers get an empty calendar for this long instead of retrying
+FAILED_DOWNLOAD_RETRY_SECONDS = 300
+
+_calendar_lock = threading.Lock()
+_calendar_cache: Dict[str, "BoardMeetingCalendar"] = {}
+# (time.monotonic() of the failed download, the empty calendar served meanwhile)
+_failed_download: Optional[tuple] = None
+
+
+def _download_board_meetings() -> pd.DataFrame:
+    """
+    Download the NSE event calendar.
+
+    Returns:
+        DataFrame with MEETING_COLUMNS (empty if the download fails)
+    """
+    if not NSEPYTHON_AVAILABLE:
+        return pd.DataFrame(columns=MEETING_COLUMNS)
+    try:
+        events = pd.DataFrame(nsefetch(EVENT_CALENDAR_URL))
+    except Exception as e:
+        print(f"Error downloading NSE event calendar: {e}")
+        return pd.DataFrame(columns=MEETING_COLUMNS)
+    if events.empty or "symbol" not in events or "date" not in events:
+        return pd.DataFrame(columns=MEETING_COLUMNS)
+
+    purpose = events.get("purpose", pd.Series("", index=events.index)).fillna("").astype(str)
+    description = events.get("bm_desc", pd.Series("", index=events.index)).fillna("").astype(str)
+    meetings = pd.DataFrame({
+        "Symbol": events["symbol"].astype(str).str.upper().str.strip(),
+        "Company": events.get("company", pd.Series("", index=events.index)).fillna("").astype(str),
+        "Date": pd.to_datetime(events["date"], format="%d-%b-%Y", errors="coerce"),
+        "Purpose": purpose,
+        "Description": description,
+        "Is_Results": (purpose + " " + description).str.contains(RESULTS_PURPOSE_PATTERN, case=False, regex=True),
+    })
+    meetings = meetings.dropna(subset=["Date"])
+    return meetings.drop_duplicates(["Symbol", "Date", "Purpose"]).sort_values("Date", kind="stable")
+
+
+def load_board_meetings(refresh: bool = False) -> pd.DataFrame:
+    """
+    Today's board-meeting table, downloaded at most once per trading day.
+
+    Args:
+        refresh: Download again even if today's table is stored
+
+    Returns:
+        DataFrame with MEETING_COLUMNS sorted by Date (empty if unavailable)
+    """
+    path = store_path("board_meetings", f"{last_trading_day()}.pkl")
+    if not refresh:
+        meetings = read_frame(path)
+        if not meetings.empty:
+            return meetings
+
+    meetings = _download_board_meetings()
+    if not meetings.empty:
+        write_frame(meetings, path)
+    return meetings
+
+
+class BoardMeetingCalendar:
+    """Results meetings indexed by symbol (next date) and by date (range queries)."""
+
+    def __init__(self, meetings: pd.DataFrame, today=None):
+        self.meetings = meetings
+        self.today = to_days(market_now() if today is None else today)
+
+        results = meetings[meetings["Is_Results"].to_numpy(dtype=bool)] if not meetings.empty else meetings
+        self._dates = pd.to_datetime(results["Date"]).values.astype("datetime64[D]")
+        order = np.argsort(self._dates, kind="stable")
+        self._dates = self._dates[order]
+        self._results = results.iloc[order].reset_index(drop=True)
+
+        # Rows are date-sorted, so the first upcoming row per symbol is its next results meeting
+        upcoming = self._results.iloc[np.searchsorted(self._dates, self.today, side="left"):]
+        first = upcoming.drop_duplicates("Symbol", keep="first")
+        self._next_by_symbol = dict(zip(first["Symbol"], pd.to_datetime(first["Date"])))
+
+    def __len__(self) -> int:
+        return len(self._results)
+
+    def next_results_date(self, symbol: str) -> Optional[datetime]:
+        """Date of the symbol's next results meeting on or after today, or None."""
+        return self._next_by_symbol.get(symbol.upper().strip().removesuffix(".NS"))
+
+    def reporting_between(self, start, end) -> pd.DataFrame:
+        """
+        Results meetings from start to end inclusive.
+
+        Returns:
+            Rows of the meetings table, sorted by Date
+        """
+        lo = np.searchsorted(self._dates, to_days(start), side="left")
+        hi = np.searchsorted(self._dates, to_days(end), side="right")
+        return self._results.iloc[lo:hi]
+
+    def reporting_within(self, days: int) -> pd.DataFrame:
+        """Results meetings in the next `days` calendar days (today included)."""
+        today = self.today.astype(datetime)
+        return self.reporting_between(today, today + timedelta(days=days))
+
+
+def get_board_meeting_calendar(refresh: bool = False) -> BoardMeetingCalendar:
+    """
+    Indexed board-meeting calendar, built at most once per process and day.
+
+    Args:
+        refresh: Download the calendar again
+
+    Returns:
+        BoardMeetingCalendar (empty if the calendar could not be downloaded)
+    """
+    # Keyed by calendar day: "next" and "within N days" are relative to today
+    global _failed_download
+    day = str(to_days(market_now()))
+    with _calendar_lock:
+        calendar = _calendar_cache.get(day)
+        if calendar is not None and not refresh:
+            return calendar
+        # While NSE is failing, don't make every caller wait on another download
+        if (not refresh and _failed_download is not None
+                and time.monotonic() - _failed_download[0] < FAILED_DOWNLOAD_RETRY_SECONDS):
+            return _failed_download[1]
+        calendar = BoardMeetingCalendar(load_board_meetings(refresh))
+        # An empty calendar (failed download) is kept only briefly, so a later call retries
+        if len(calendar.meetings):
+            _calendar_cache.clear()
+            _calendar_cache[day] = calendar
+            _failed_download = None
+        else:
+            _failed_download = (time.monotonic(), calendar)
+        return calendar
@@ -0,0 +1,154 @@
+"""
+Corporate Actions - Local split/dividend adjustment of raw OHLCV
+
+We store unadjusted prices once and derive adjusted series locally, instead
+of downloading the same symbol in several adjusted variants.
+
+- Raw bars: prices as actually traded on each day
+- Factor table: one row per split/dividend ex-date with its price factor
+- Adjusted bars: raw * product of all factors with an ex-date after the bar
+
+A new split or dividend only adds a row to the factor table; stored raw
+bars never change.
+"""
+import numpy as np
+import pandas as pd
+
+PRICE_COLUMNS = ["Open", "High", "Low", "Close"]
+
+FACTOR_COLUMNS = ["Date", "Split_Ratio", "Dividend", "Prev_Close", "Split_Factor", "Dividend_Factor"]
+
+
+def _suffix_product(event_dates: np.ndarray, event_factors: np.ndarray, bar_dates: np.ndarray) -> np.ndarray:
+    """
+    For each bar, multiply all event factors whose ex-date is after the bar.
+
+    Vectorized: reverse cumulative product over events, then one searchsorted
+    to find the first event after each bar.
+    """
+    if len(event_dates) == 0:
+        return np.ones(len(bar_dates))
+    order = np.argsort(event_dates)
+    event_dates = event_dates[order]
+    event_factors = event_factors[order]
+    suffix = np.append(np.cumprod(event_factors[::-1])[::-1], 1.0)
+    return suffix[np.searchsorted(event_dates, bar_dates, side="right")]
+
+
+def _scale_volume(volume: pd.Series, multiplier: np.ndarray) -> pd.Series:
+    """Scale share volume, keeping whole-share integers when there are no gaps."""
+    scaled = (volume / multiplier).round()
+    return scaled if scaled.isna().any() else scaled.astype("int64")
+
+
+def unadjust_yfinance_history(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Convert a yfinance history(auto_adjust=False, actions=True) frame to raw bars.
+
+    Yahoo returns OHLC, volume and dividends already adjusted for every split
+    that happened later inside the downloaded window. This undoes that, so the
+    stored bars are the prices actually traded on each day.
+
+    Args:
+        df: DataFrame with a Date column, OHLC, Volume, Dividends, Stock Splits
+
+    Returns:
+        DataFrame with Date, Open, High, Low, Close, Volume, Dividends, Stock Splits
+    """
+    df = df.copy()
+    if "Dividends" not in df.columns:
+        df["Dividends"] = 0.0
+    if "Stock Splits" not in df.columns:
+        df["Stock Splits"] = 0.0
+
+    splits = df["Stock Splits"].fillna(0).to_numpy(dtype="float64")
+    dates = df["Date"].to_numpy()
+    has_split = splits > 0
+    multiplier = _suffix_product(dates[has_split], splits[has_split], dates)
+
+    for column in PRICE_COLUMNS:
+        df[column] = df[column] * multiplier
+    df["Dividends"] = df["Dividends"].fillna(0) * multiplier
+    df["Volume"] = _scale_volume(df["Volume"], multiplier)
+
+    return df[["Date"] + PRICE_COLUMNS + ["Volume", "Dividends", "Stock Splits"]]
+
+
+def build_factor_table(raw: pd.DataFrame) -> pd.DataFrame:
+    """
+    Build the per-symbol split/dividend factor table from raw bars.
+
+    Split_Factor is 1/ratio. Dividend_Factor is 1 - dividend / previous raw
+    close (the same method Yahoo uses for adjusted close).
+
+    Args:
+        raw: Raw bars from unadjust_yfinance_history(), sorted by Date
+
+    Returns:
+        DataFrame with FACTOR_COLUMNS, one row per ex-date
+    """
+    splits = raw["Stock Splits"].fillna(0)
+    dividends = raw["Dividends"].fillna(0)
+    prev_close = raw["Close"].shift(1)
+
+    events = raw[(splits > 0) | (dividends > 0)]
+    if events.empty:
+        return pd.DataFrame(columns=FACTOR_COLUMNS)
+
+    table = pd.DataFrame({
+        "Date": events["Date"].to_numpy(),
+        "Split_Ratio": splits[events.index].to_numpy(),
+        "Dividend": dividends[events.index].to_numpy(),
+        "Prev_Close": prev_close[events.index].to_numpy(),
+    })
+    ratio = table["Split_Ratio"]
+    table["Split_Factor"] = (1.0 / ratio.where(ratio > 0)).fillna(1.0)
+    # Without a previous close (first bar of the window) the dividend factor is unknown; treat as 1
+    dividend_factor = 1.0 - table["Dividend"] / table["Prev_Close"]
+    table["Dividend_Factor"] = dividend_factor.where(table["Prev_Close"] > 0, 1.0).clip(lower=0.0, upper=1.0)
+    return table[FACTOR_COLUMNS]
+
+
+def merge_factor_tables(old: pd.DataFrame, new: pd.DataFrame) -> pd.DataFrame:
+    """Combine factor tables, letting newer rows replace ones with the same Date."""
+    if old.empty:
+        return new.reset_index(drop=True)
+    if new.empty:
+        return old.reset_index(drop=True)
+    combined = pd.concat([old, new], ignore_index=True)
+    combined["Date"] = pd.to_datetime(combined["Date"])
+    combined = combined.drop_duplicates(subset="Date", keep="last")
+    return combined.sort_values("Date").reset_index(drop=True)
+
+
+def adjust_prices(raw: pd.DataFrame, factors: pd.DataFrame, dividends: bool = True) -> pd.DataFrame:
+    """
+    Derive adjusted OHLCV from raw bars and the factor table.
+
+    Args:
+        raw: Raw bars with Date, Open, High, Low, Close, Volume
+        factors: Factor table from build_factor_table()
+        dividends: Also adjust for dividends (True matches yfinance auto_adjust)
+
+    Returns:
+        Copy of raw with adjusted OHLC and split-adjusted Volume
+    """
+    adjusted = raw.copy()
+    if factors.empty:
+        return adjusted
+
+    bar_dates = pd.to_datetime(raw["Date"]).to_numpy()
+    event_dates = pd.to_datetime(factors["Date"]).to_numpy()
+    split_factor = factors["Split_Factor"].to_numpy(dtype="float64")
+
+    price_factor = split_factor
+    if dividends:
+        price_factor = split_factor * factors["Dividend_Factor"].to_numpy(dtype="float64")
+
+    price_multiplier = _suffix_product(event_dates, price_factor, bar_dates)
+    volume_multiplier = _suffix_product(event_dates, split_factor, bar_dates)
+
+    for column in PRICE_COLUMNS:
+        adjusted[column] = raw[column] * price_multiplier
+    adjusted["Volume"] = _scale_volume(raw["Volume"], volume_multiplier)
+    return adjusted
@@ -7,13 +7,32 @@ for both NSE (Indian) and US stocks without API limits.
 Sources:
 - yfinance: ticker.calendar, ticker.get_earnings_dates()
 - yahoo_fin: stock_info.get_next_earnings_date()
+- NSE board-meeting calendar (board_meetings.py): next results date for NSE stocks
+
+Earnings history and the next earnings date are kept in a local store
+(earnings_store.py) and only scraped again after a new report date.
 """
 import yfinance as yf
+import numpy as np
 import pandas as pd
 from datetime import datetime, timedelta
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, List, Tuple
 
+from v2.config import BENCHMARK_INDEX
 from v2.data.alphavantage_service import fetch_earnings_calendar as fetch_av_earnings_calendar
+from v2.data.benchmarks import close_series, history_days_for, relative_returns, sector_benchmark
+from v2.data.board_meetings import get_board_meeting_calendar
+from v2.data.earnings_store import (
+    get_stored_next_earnings,
+    load_earnings_events,
+    needs_refresh,
+    save_earnings_events,
+)
+from v2.data.fundamentals_service import get_fundamentals
+from v2.data.memory_cache import memoized
+from v2.data.symbols import is_us_stock, to_ticker_symbol
+from v2.data.trading_calendar import MARKET_TZ, market_now, market_timestamps, to_days
+from v2.engine.alignment import event_window_starts
 
 # Try importing yahoo_fin (optional, provides cleaner next earnings date)
 try:
@@ -31,39 +50,6 @@ except ImportError:
     NSEPYTHON_AVAILABLE = False
     print("nsepython not installed. Install with: pip install nsepython")
 
-# NIFTY 50 symbol for relative performance
-NIFTY_SYMBOL = "^NSEI"
-
-
-def _get_ticker_symbol(symbol: str) -> str:
-    """
-    Convert symbol to yfinance format.
-    NSE stocks need .NS suffix, US stocks use as-is.
-    """
-    symbol = symbol.upper().strip()
-    # If already has suffix, return as-is
-    if symbol.endswith(".NS") or symbol.endswith(".BSE"):
-        return symbol
-    # Common US stocks - don't add suffix
-    us_stocks = ["AAPL", "MSFT", "GOOGL", "GOOG", "AMZN", "NVDA", "META", "TSLA", "IBM", "NFLX"]
-    if symbol in us_stocks:
-        return symbol
-    # Assume NSE stock, add .NS suffix
-    return f"{symbol}.NS"
-
-
-def _is_us_stock(symbol: str) -> bool:
-    """
-    Check if a symbol is a US stock (for Alpha Vantage compatibility).
-    """
-    symbol = symbol.upper().strip()
-    if symbol.endswith(".NS") or symbol.endswith(".BSE"):
-        return False
-    us_stocks = ["AAPL", "MSFT", "GOOGL", "GOOG", "AMZN", "NVDA", "META", "TSLA", "IBM", "NFLX"]
-    return symbol in us_stocks
-
-
-
 
 
 def fetch_next_earnings_date(symbol: str) -> Optional[datetime]:
@@ -76,8 +62,8 @@ def fetch_next_earnings_date(symbol: str) -> Optional[datetime]:
     Returns:
         datetime of next earnings, or None if not available
     """
-    ticker_symbol = _get_ticker_symbol(symbol)
-    is_us = _is_us_stock(symbol)
+    ticker_symbol = to_ticker_symbol(symbol)
+    is_us = is_us_stock(symbol)
     print(f"\n[DEBUG] Fetching next earnings date for {symbol} (ticker: {ticker_symbol}, US stock: {is_us})")
 
     # Method 1: Try Alpha Vantage (US stocks only)
@@ -110,6 +96,14 @@ def fetch_next_earnings_date(symbol: str) -> Optional[datetime]:
         except Exception as e:
             print(f"[DEBUG] Alpha Vantage failed for {symbol}: {e}")
 
+    # Method 1b: NSE board-meeting calendar (one download per day covers every NSE stock)
+    if not is_us:
+        calendar = get_board_meeting_calendar()
+        next_date = calendar.next_results_date(symbol)
+        if next_date is not None:
+            print(f"[DEBUG] Found next earnings date from NSE board meetings: {next_date}")
+            return next_date
+
     # Method 2: Try yahoo_fin (cleaner API)
     if YAHOO_FIN_AVAILABLE:
         try:
@@ -179,19 +173,14 @@ def fetch_next_earnings_date(symbol: str) -> Optional[datetime]:
     return None
 
 
-def fetch_earnings_history(symbol: str, limit: int = 12) -> pd.DataFrame:
+def _scrape_earnings_history(symbol: str, limit: int) -> Optional[pd.DataFrame]:
     """
-    Fetch historical earnings dates and EPS data.
-    
-    Args:
-        symbol: Stock symbol (e.g., "RELIANCE", "TCS", "AAPL")
-        limit: Number of past earnings to fetch (default 12 = 3 years quarterly)
+    Scrape earnings dates and EPS from yfinance (slow; use fetch_earnings_history).
     
     Returns:
-        DataFrame with columns: Date, EPS, Surprise (if available)
-        Returns empty DataFrame if fetch fails
+        DataFrame (possibly empty), or None if the scrape failed
     """
-    ticker_symbol = _get_ticker_symbol(symbol)
+    ticker_symbol = to_ticker_symbol(symbol)
     
     try:
         ticker = yf.Ticker(ticker_symbol)
@@ -216,7 +205,65 @@ def fetch_earnings_history(symbol: str, limit: int = 12) -> pd.DataFrame:
         
     except Exception as e:
         print(f"Error fetching earnings history for {symbol}: {e}")
-        return pd.DataFrame()
+        return None
+
+
+def get_earnings_events(symbol: str, limit: int = 12, refresh: bool = False) -> Tuple[pd.DataFrame, Optional[datetime]]:
+    """
+    Earnings events and next earnings date, served from the local earnings store.
+    
+    The store is scraped again only when the stored next earnings date has
+    passed, the data is older than earnings_store_max_age_days, more
+    quarters are requested than stored, or refresh=True.
+    
+    Args:
+        symbol: Stock symbol (e.g., "RELIANCE", "TCS", "AAPL")
+        limit: Number of earnings events needed
+        refresh: Force a new scrape
+    
+    Returns:
+        (DataFrame with Date, EPS_Estimate, EPS_Reported, Surprise_Pct, next earnings date or None)
+    """
+    ticker_symbol = to_ticker_symbol(symbol)
+    events, meta = load_earnings_events(ticker_symbol)
+    
+    if refresh or needs_refresh(meta, limit):
+        scraped = _scrape_earnings_history(symbol, limit)
+        if scraped is not None:
+            next_earnings = fetch_next_earnings_date(symbol)
+            if next_earnings is None and not scraped.empty:
+                # get_earnings_dates also lists upcoming reports (without EPS)
+                dates = pd.to_datetime(scraped["Date"], utc=True)
+                upcoming = dates[dates > pd.Timestamp.now(tz="UTC")]
+                if not upcoming.empty:
+                    next_earnings = upcoming.min().tz_convert(MARKET_TZ)
+            save_earnings_events(ticker_symbol, scraped, next_earnings, limit)
+            events, meta = load_earnings_events(ticker_symbol)
+        elif meta:
+            print(f"Using stored earnings history for {symbol}")
+    
+    return events.head(limit), get_stored_next_earnings(meta)
+
+
+@memoized()
+def fetch_earnings_history(symbol: str, limit: int = 12, refresh: bool = False) -> pd.DataFrame:
+    """
+    Fetch historical earnings dates and EPS data.
+    
+    Served from the local earnings store; see get_earnings_events().
+    Results are kept in the shared memory cache (refresh=True replaces them).
+    
+    Args:
+        symbol: Stock symbol (e.g., "RELIANCE", "TCS", "AAPL")
+        limit: Number of past earnings to fetch (default 12 = 3 years quarterly)
+        refresh: Force a new scrape from yfinance
+    
+    Returns:
+        DataFrame with columns: Date, EPS, Surprise (if available)
+        Returns empty DataFrame if fetch fails
+    """
+    events, _ = get_earnings_events(symbol, limit=limit, refresh=refresh)
+    return events
 
 
 def fetch_earnings_calendar(symbol: str) -> Dict[str, Any]:
@@ -229,7 +276,7 @@ def fetch_earnings_calendar(symbol: str) -> Dict[str, Any]:
     Returns:
         Dictionary with calendar info (earnings date, revenue estimate, etc.)
     """
-    ticker_symbol = _get_ticker_symbol(symbol)
+    ticker_symbol = to_ticker_symbol(symbol)
     
     try:
         ticker = yf.Ticker(ticker_symbol)
@@ -254,82 +301,34 @@ def fetch_earnings_calendar(symbol: str) -> Dict[str, Any]:
         return {}
 
 
+@memoized()
 def fetch_company_info(symbol: str) -> Dict[str, Any]:
     """
     Fetch company info and key metrics.
     
+    Served from the daily fundamentals snapshot (see fundamentals_service.py).
+    
     Args:
         symbol: Stock symbol
     
     Returns:
         Dictionary with company info
     """
-    ticker_symbol = _get_ticker_symbol(symbol)
+    fundamentals = get_fundamentals(symbol)
     
-    try:
-        ticker = yf.Ticker(ticker_symbol)
-        info = ticker.info
-        
-        if not info:
-            return {}
-        
-        # Extract relevant fields
-        return {
-            "name": info.get("longName", info.get("shortName", "N/A")),
-            "sector": info.get("sector", "N/A"),
-            "industry": info.get("industry", "N/A"),
-            "market_cap": info.get("marketCap", "N/A"),
-            "pe_ratio": info.get("trailingPE", info.get("forwardPE", "N/A")),
-            "eps": info.get("trailingEps", "N/A"),
-            "52w_high": info.get("fiftyTwoWeekHigh", "N/A"),
-            "52w_low": info.get("fiftyTwoWeekLow", "N/A"),
-            "50_dma": info.get("fiftyDayAverage", "N/A"),
-            "200_dma": info.get("twoHundredDayAverage", "N/A"),
-            "dividend_yield": info.get("dividendYield", "N/A"),
-            "beta": info.get("beta", "N/A")
-        }
-        
-    except Exception as e:
-        print(f"Error fetching company info for {symbol}: {e}")
+    if not fundamentals:
         return {}
-
-
-
-def _get_price_change(symbol: str, start_date: datetime, days: int = 7) -> Optional[float]:
-    """
-    Calculate price change % over a period starting from a date.
     
-    Args:
-        symbol: Stock symbol with suffix (e.g., "RELIANCE.NS")
-        start_date: Start date for calculation
-        days: Number of days to measure (default 7 = 1 week)
-    
-    Returns:
-        Percentage change or None if data unavailable
-    """
-    try:
-        end_date = start_date + timedelta(days=days + 5)  # Extra buffer for weekends
-        ticker = yf.Ticker(symbol)
-        hist = ticker.history(start=start_date, end=end_date)
-        
-        if hist.empty or len(hist) < 2:
-            return None
-        
-        # Get price on earnings date and after 'days' trading days
-        start_price = hist['Close'].iloc[0]
-        end_idx = min(days, len(hist) - 1)
-        end_price = hist['Close'].iloc[end_idx]
-        
-        return ((end_price - start_price) / start_price) * 100
-        
-    except Exception as e:
-        print(f"Error calculating price change: {e}")
-        return None
+    return {field: ("N/A" if value is None else value) for field, value in fundamentals.items()}
 
 
 def fetch_earnings_with_performance(symbol: str, num_quarters: int = 3) -> Dict[str, Any]:
     """
-    Fetch earnings dates with stock and NIFTY performance after each earnings.
+    Fetch earnings dates with stock, NIFTY and sector performance after each earnings.
+    
+    The stock's closes are loaded once and every window (each earnings week
+    and the last month) is measured against the shared benchmark series,
+    so adding benchmarks costs no extra downloads per stock.
     
     Args:
         symbol: Stock symbol (e.g., "RELIANCE", "TCS", "NETWEB")
@@ -340,84 +339,75 @@ def fetch_earnings_with_performance(symbol: str, num_quarters: int = 3) -> Dict[
         - symbol: Stock symbol
         - next_earnings: Next earnings date
         - relative_performance: Stock vs NIFTY 50 (last month)
+        - sector_index: Sector benchmark name (None if unknown)
+        - sector_relative_performance: Stock vs sector index (last month)
         - history: List of past earnings with performance data
     """
-    ticker_symbol = _get_ticker_symbol(symbol)
+    ticker_symbol = to_ticker_symbol(symbol)
     
     result = {
         "symbol": symbol,
         "ticker": ticker_symbol,
         "next_earnings": None,
         "relative_performance": None,
+        "sector_index": None,
+        "sector_relative_performance": None,
         "history": []
     }
     
-    # 1. Get next earnings date
-    result["next_earnings"] = fetch_next_earnings_date(symbol)
-    
-    # 2. Get earnings history
-    earnings_df = fetch_earnings_history(symbol, limit=num_quarters * 2)  # Fetch extra to filter
+    # 1. Get earnings history and next earnings date (from the local store)
+    earnings_df, result["next_earnings"] = get_earnings_events(symbol, limit=num_quarters * 2)  # Fetch extra to filter
     
+    # No earnings history: nothing to measure, so skip the price and benchmark downloads
     if earnings_df.empty:
         return result
     
-    # 3. Calculate performance for each past earnings date
+    # Past earnings dates, most recent first (zones normalized once for the whole column)
+    event_times = market_timestamps(earnings_df["Date"])
+    is_past = (event_times.notna() & (event_times <= market_now())).to_numpy()
+    past_rows = np.flatnonzero(is_past)[:num_quarters]
+    past = [(pd.Timestamp(earnings_df["Date"].iloc[i]), earnings_df.iloc[i]) for i in past_rows]
+    
+    # 2. One stock series and the shared benchmark series cover every window
+    sector_index = sector_benchmark(symbol) if not is_us_stock(symbol) else None
+    benchmarks = [BENCHMARK_INDEX] + ([sector_index] if sector_index and sector_index != BENCHMARK_INDEX else [])
+    result["sector_index"] = sector_index
+    
+    # Each window starts at the last close before the results were public (see engine/alignment.py),
+    # so an announcement during market hours is not already in the starting close
+    earnings_days = event_window_starts(event_times.iloc[past_rows])
+    month_start = np.array([to_days(market_now() - timedelta(days=30))], dtype="datetime64[D]")
+    try:
+        # History back to the oldest past earnings, or just the last month if none have happened yet
+        stock_close = close_series(ticker_symbol, history_days_for(np.concatenate([earnings_days, month_start]), 30))
+        weekly = relative_returns(stock_close, earnings_days, 7, benchmarks) if len(earnings_days) else None
+        monthly = relative_returns(stock_close, month_start, 30, benchmarks).iloc[0]
+    except Exception as e:
+        print(f"Error calculating performance for {symbol}: {e}")
+        weekly, monthly = None, None
+    
+    def _pct(value) -> Optional[float]:
+        return None if value is None or pd.isna(value) else round(float(value), 1)
+    
     history = []
-    count = 0
-    
-    for _, row in earnings_df.iterrows():
-        if count >= num_quarters:
-            break
-            
-        earnings_date = row.get("Date")
-        if pd.isna(earnings_date):
-            continue
-            
-        # Convert to datetime if needed
-        if isinstance(earnings_date, str):
-            try:
-                earnings_date = pd.to_datetime(earnings_date)
-            except:
-                continue
-        
-        # Get current time in the same timezone as earnings_date for correct comparison
-        now_aware = pd.Timestamp.now(tz=earnings_date.tz)
-
-        # Skip future dates
-        if earnings_date > now_aware:
-            continue
-        
-        # Calculate stock performance (1 week after earnings)
-        stock_perf = _get_price_change(ticker_symbol, earnings_date, days=7)
-        
-        # Calculate NIFTY performance (same period)
-        nifty_perf = _get_price_change(NIFTY_SYMBOL, earnings_date, days=7)
-        
+    for i, (earnings_date, row) in enumerate(past):
+        window = weekly.iloc[i] if weekly is not None else {}
         history.append({
             "date": earnings_date.strftime("%Y-%m-%d") if hasattr(earnings_date, 'strftime') else str(earnings_date),
-            "stock_performance": round(stock_perf, 1) if stock_perf is not None else None,
-            "nifty_performance": round(nifty_perf, 1) if nifty_perf is not None else None,
+            "stock_performance": _pct(window.get("Stock")),
+            "nifty_performance": _pct(window.get(BENCHMARK_INDEX)),
+            "sector_performance": _pct(window.get(sector_index)) if sector_index else None,
             "eps_reported": row.get("EPS_Reported"),
             "eps_estimate": row.get("EPS_Estimate"),
             "surprise_pct": row.get("Surprise_Pct")
         })
-        
-        count += 1
-    
     result["history"] = history
     
-    # 4. Calculate relative performance vs NIFTY (last month)
-    try:
-        end_date = datetime.now()
-        start_date = end_date - timedelta(days=30)
-        
-        stock_month_perf = _get_price_change(ticker_symbol, start_date, days=30)
-        nifty_month_perf = _get_price_change(NIFTY_SYMBOL, start_date, days=30)
-        
-        if stock_month_perf is not None and nifty_month_perf is not None:
-            result["relative_performance"] = round(stock_month_perf - nifty_month_perf, 1)
-    except Exception as e:
-        print(f"Error calculating relative performance: {e}")
+    # 3. Relative performance vs NIFTY and the sector index (last month)
+    if monthly is not None:
+        result["relative_performance"] = _pct(monthly["Stock"] - monthly[BENCHMARK_INDEX])
+        if sector_index:
+            result["sector_relative_performance"] = _pct(monthly["Stock"] - monthly[sector_index])
     
     return result
 
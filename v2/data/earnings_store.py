@@ -0,0 +1,133 @@
+"""
+Earnings Store - Local per-symbol history of earnings events
+
+Past earnings dates and EPS only change once a quarter, so the slow
+yfinance earnings scrape is stored per symbol and reused until:
+
+- the stored next-earnings date has passed (a new report is out), or
+- the stored data is older than the maximum age, or
+- more quarters are requested than were stored
+
+Each symbol has two files under CACHE_DIR/earnings:
+- {TICKER}.pkl: Date, EPS_Estimate, EPS_Reported, Surprise_Pct
+- {TICKER}.json: refreshed_at (market time), next_earnings, limit
+"""
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional, Tuple
+
+import pandas as pd
+
+from v2.constants.constants import earnings_store_max_age_days
+from v2.data.local_store import read_frame, read_json, store_path, write_frame, write_json
+from v2.data.trading_calendar import MARKET_TZ, market_now
+
+EARNINGS_COLUMNS = ["Date", "EPS_Estimate", "EPS_Reported", "Surprise_Pct"]
+
+
+def _paths(ticker_symbol: str) -> Tuple[str, str]:
+    return (
+        store_path("earnings", f"{ticker_symbol}.pkl"),
+        store_path("earnings", f"{ticker_symbol}.json"),
+    )
+
+
+def load_earnings_events(ticker_symbol: str) -> Tuple[pd.DataFrame, Dict[str, Any]]:
+    """
+    Read stored earnings events for one symbol.
+
+    Args:
+        ticker_symbol: yfinance ticker (e.g., "TCS.NS")
+
+    Returns:
+        (events DataFrame, metadata dict). Both empty if nothing is stored.
+    """
+    events_path, meta_path = _paths(ticker_symbol)
+    return read_frame(events_path), read_json(meta_path)
+
+
+def save_earnings_events(ticker_symbol: str, events: pd.DataFrame,
+                         next_earnings: Optional[datetime], limit: int):
+    """
+    Store earnings events and the next report date for one symbol.
+
+    Args:
+        ticker_symbol: yfinance ticker (e.g., "TCS.NS")
+        events: DataFrame with EARNINGS_COLUMNS (extra columns are dropped)
+        next_earnings: Next known report date, or None
+        limit: Number of earnings requested from the source
+    """
+    events_path, meta_path = _paths(ticker_symbol)
+    columns = [c for c in EARNINGS_COLUMNS if c in events.columns]
+    write_frame(events[columns].reset_index(drop=True), events_path)
+    write_json({
+        "refreshed_at": market_now().isoformat(),
+        "next_earnings": pd.Timestamp(next_earnings).isoformat() if next_earnings is not None else None,
+        "limit": limit,
+    }, meta_path)
+
+
+def get_stored_next_earnings(meta: Dict[str, Any]) -> Optional[pd.Timestamp]:
+    """Next earnings date from stored metadata, or None."""
+    value = meta.get("next_earnings")
+    return pd.Timestamp(value) if value else None
+
+
+def needs_refresh(meta: Dict[str, Any], limit: int,
+                  max_age_days: int = earnings_store_max_age_days,
+                  now: Optional[datetime] = None) -> bool:
+    """
+    Decide whether the stored events for a symbol must be scraped again.
+
+    Args:
+        meta: Metadata from load_earnings_events()
+        limit: Number of earnings the caller needs
+        max_age_days: Refresh anyway after this many days
+        now: Current market-local time (default trading_calendar.market_now())
+
+    Returns:
+        True if the store is missing, too small, too old, or a report is due
+    """
+    if not meta.get("refreshed_at"):
+        return True
+    if meta.get("limit", 0) < limit:
+        return True
+
+    now = pd.Timestamp(now or market_now())
+    refreshed_at = pd.Timestamp(meta["refreshed_at"])
+    if now - refreshed_at > timedelta(days=max_age_days):
+        return True
+
+    next_earnings = get_stored_next_earnings(meta)
+    if next_earnings is not None:
+        if next_earnings.tz is not None:
+            next_earnings = next_earnings.tz_convert(MARKET_TZ).tz_localize(None)
+        # The report date has passed since the last refresh: new numbers are out
+        if refreshed_at < next_earnings <= now:
+            return True
+
+    return False
+
+
+def load_universe_earnings(ticker_symbols: List[str]) -> pd.DataFrame:
+    """
+    All stored earnings events for a universe, without any network calls.
+
+    Args:
+        ticker_symbols: yfinance tickers (e.g., ["TCS.NS", "INFY.NS"])
+
+    Returns:
+        Long DataFrame with a Ticker column plus EARNINGS_COLUMNS and Next_Earnings
+    """
+    frames = []
+    for ticker_symbol in ticker_symbols:
+        events, meta = load_earnings_events(ticker_symbol)
+        if events.empty:
+            continue
+        events = events.copy()
+        events.insert(0, "Ticker", ticker_symbol)
+        events["Next_Earnings"] = get_stored_next_earnings(meta)
+        frames.append(events)
+
+    if not frames:
+        return pd.DataFrame(columns=["Ticker"] + EARNINGS_COLUMNS + ["Next_Earnings"])
+    return pd.concat(frames, ignore_index=True)
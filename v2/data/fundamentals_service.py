@@ -0,0 +1,239 @@
+"""
+Fundamentals Service - Daily snapshot table of company fundamentals
+
+yfinance's Ticker.info is one of the slowest calls we make. Instead of
+calling it per request, a batch job fetches it for the whole universe
+concurrently and stores one columnar snapshot per trading day:
+
+    CACHE_DIR/fundamentals/YYYY-MM-DD.pkl   # one row per ticker
+
+All callers read the latest snapshot, and screens (sector, PE, market cap)
+run as vectorized filters over it without any network calls. A symbol
+missing from the snapshot (or older than fundamentals_max_age_days) is
+fetched once and added to the current day's snapshot.
+"""
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+import yfinance as yf
+
+from v2.constants.constants import fundamentals_max_age_days
+from v2.data.local_store import read_frame, store_path, write_frame
+from v2.data.symbols import to_ticker_symbol
+from v2.data.trading_calendar import last_trading_day, market_now
+
+# Snapshot column -> yfinance info keys (first present key wins)
+FUNDAMENTAL_FIELDS = {
+    "name": ("longName", "shortName"),
+    "sector": ("sector",),
+    "industry": ("industry",),
+    "market_cap": ("marketCap",),
+    "pe_ratio": ("trailingPE", "forwardPE"),
+    "trailing_pe": ("trailingPE",),
+    "eps": ("trailingEps",),
+    "52w_high": ("fiftyTwoWeekHigh",),
+    "52w_low": ("fiftyTwoWeekLow",),
+    "50_dma": ("fiftyDayAverage",),
+    "200_dma": ("twoHundredDayAverage",),
+    "beta": ("beta",),
+    "dividend_yield": ("dividendYield",),
+}
+
+TEXT_FIELDS = ["name", "sector", "industry"]
+NUMERIC_FIELDS = [f for f in FUNDAMENTAL_FIELDS if f not in TEXT_FIELDS]
+
+_snapshot_lock = threading.Lock()
+_snapshot_cache: Dict[str, tuple] = {}
+
+# Serializes read-merge-write of today's snapshot (concurrent get_fundamentals calls)
+_upsert_lock = threading.Lock()
+
+
+def _snapshot_dir() -> str:
+    return os.path.dirname(store_path("fundamentals", "index"))
+
+
+def _snapshot_path(day: np.datetime64) -> str:
+    return store_path("fundamentals", f"{day}.pkl")
+
+
+def _fetch_info_row(ticker_symbol: str) -> Optional[Dict[str, Any]]:
+    """Fetch Ticker.info for one ticker and keep only the snapshot fields."""
+    try:
+        info = yf.Ticker(ticker_symbol).info
+    except Exception as e:
+        print(f"Error fetching company info for {ticker_symbol}: {e}")
+        return None
+    if not info:
+        return None
+
+    row = {"Ticker": ticker_symbol, "As_Of": pd.Timestamp(market_now().date())}
+    for field, keys in FUNDAMENTAL_FIELDS.items():
+        row[field] = next((info[k] for k in keys if info.get(k) is not None), None)
+    return row
+
+
+def _normalize(snapshot: pd.DataFrame) -> pd.DataFrame:
+    """Fixed dtypes: float64 numbers, categorical text, indexed by Ticker."""
+    snapshot = snapshot.copy()
+    for field in NUMERIC_FIELDS:
+        snapshot[field] = pd.to_numeric(snapshot.get(field), errors="coerce").astype("float64")
+    for field in TEXT_FIELDS:
+        snapshot[field] = snapshot.get(field).astype("category")
+    snapshot["As_Of"] = pd.to_datetime(snapshot["As_Of"])
+    return snapshot.set_index("Ticker")[["As_Of"] + list(FUNDAMENTAL_FIELDS)]
+
+
+def snapshot_days() -> List[np.datetime64]:
+    """Days with a stored fundamentals snapshot, oldest first."""
+    return sorted(
+        np.datetime64(f[:-4], "D") for f in os.listdir(_snapshot_dir())
+        if f.endswith(".pkl") and not f.startswith(".")
+    )
+
+
+def _latest_snapshot_day(on: Optional[np.datetime64] = None) -> Optional[np.datetime64]:
+    days = snapshot_days()
+    if on is not None:
+        days = [d for d in days if d <= on]
+    return days[-1] if days else None
+
+
+def load_fundamentals_snapshot(day=None) -> pd.DataFrame:
+    """
+    Latest fundamentals snapshot on or before a trading day.
+
+    Args:
+        day: Date to look up (default: latest available)
+
+    Returns:
+        DataFrame indexed by Ticker with As_Of plus FUNDAMENTAL_FIELDS columns,
+        empty if no snapshot exists. Treat it as read-only; it is shared.
+    """
+    snapshot_day = _latest_snapshot_day(None if day is None else np.datetime64(pd.Timestamp(day).date(), "D"))
+    if snapshot_day is None:
+        return pd.DataFrame(columns=["As_Of"] + list(FUNDAMENTAL_FIELDS))
+
+    path = _snapshot_path(snapshot_day)
+    mtime = os.path.getmtime(path)
+    with _snapshot_lock:
+        cached = _snapshot_cache.get(path)
+        if cached is None or cached[0] != mtime:
+            # Snapshots written before a field was added get it as an empty column
+            _snapshot_cache[path] = (mtime, read_frame(path).reindex(columns=["As_Of"] + list(FUNDAMENTAL_FIELDS)))
+        return _snapshot_cache[path][1]
+
+
+def _upsert_snapshot(rows: List[Dict[str, Any]]) -> pd.DataFrame:
+    """Merge fetched rows into today's snapshot, carrying forward the latest one."""
+    day = last_trading_day()
+    with _upsert_lock:
+        base = load_fundamentals_snapshot(day)
+        if rows:
+            new = _normalize(pd.DataFrame(rows))
+            if base.empty:
+                merged = new
+            else:
+                merged = pd.concat([base[~base.index.isin(new.index)].reset_index(), new.reset_index()])
+                merged = _normalize(merged)
+        else:
+            merged = base
+        write_frame(merged, _snapshot_path(day))
+        return load_fundamentals_snapshot(day)
+
+
+def refresh_fundamentals_snapshot(symbols: Sequence[str], workers: int = 8) -> pd.DataFrame:
+    """
+    Fetch fundamentals for a universe concurrently and store today's snapshot.
+
+    Symbols whose fetch fails keep their previous row (if any).
+
+    Args:
+        symbols: Stock symbols (e.g., ["RELIANCE", "TCS"])
+        workers: Concurrent Ticker.info requests
+
+    Returns:
+        The updated snapshot
+    """
+    tickers = [to_ticker_symbol(s) for s in symbols]
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as executor:
+        rows = [row for row in executor.map(_fetch_info_row, tickers) if row is not None]
+    print(f"Fundamentals snapshot: {len(rows)}/{len(tickers)} symbols refreshed")
+    return _upsert_snapshot(rows)
+
+
+def get_fundamentals(symbol: str, fetch_missing: bool = True) -> Dict[str, Any]:
+    """
+    Fundamentals for one symbol from the latest snapshot.
+
+    Args:
+        symbol: Stock symbol (e.g., "TCS" or "TCS.NS")
+        fetch_missing: Fetch and store the symbol if it is missing or stale
+
+    Returns:
+        Dictionary with FUNDAMENTAL_FIELDS keys (missing values are None),
+        or empty dict if unavailable
+    """
+    ticker_symbol = to_ticker_symbol(symbol)
+    snapshot = load_fundamentals_snapshot()
+
+    is_stale = ticker_symbol not in snapshot.index or (
+        pd.Timestamp(market_now()) - snapshot.at[ticker_symbol, "As_Of"]
+    ).days > fundamentals_max_age_days
+
+    if is_stale and fetch_missing:
+        row = _fetch_info_row(ticker_symbol)
+        if row is not None:
+            snapshot = _upsert_snapshot([row])
+
+    if ticker_symbol not in snapshot.index:
+        return {}
+
+    record = snapshot.loc[ticker_symbol, list(FUNDAMENTAL_FIELDS)].to_dict()
+    return {k: (None if pd.isna(v) else v) for k, v in record.items()}
+
+
+def screen_fundamentals(snapshot: pd.DataFrame,
+                        sectors: Optional[Sequence[str]] = None,
+                        industries: Optional[Sequence[str]] = None,
+                        min_pe: Optional[float] = None, max_pe: Optional[float] = None,
+                        min_market_cap: Optional[float] = None,
+                        max_beta: Optional[float] = None,
+                        min_dividend_yield: Optional[float] = None) -> pd.DataFrame:
+    """
+    Filter a snapshot with vectorized conditions (no network calls).
+
+    Args:
+        snapshot: Result of load_fundamentals_snapshot()
+        sectors / industries: Keep only these (exact match)
+        min_pe / max_pe: Trailing PE bounds (rows without PE are dropped)
+        min_market_cap: Market cap lower bound
+        max_beta: Beta upper bound
+        min_dividend_yield: Dividend yield lower bound
+
+    Returns:
+        Filtered snapshot
+
+    Example:
+        it_value = screen_fundamentals(load_fundamentals_snapshot(), sectors=["Technology"], max_pe=25)
+    """
+    mask = np.ones(len(snapshot), dtype=bool)
+    if sectors is not None:
+        mask &= snapshot["sector"].isin(sectors).to_numpy()
+    if industries is not None:
+        mask &= snapshot["industry"].isin(industries).to_numpy()
+    if min_pe is not None:
+        mask &= (snapshot["pe_ratio"] >= min_pe).to_numpy()
+    if max_pe is not None:
+        mask &= (snapshot["pe_ratio"] <= max_pe).to_numpy()
+    if min_market_cap is not None:
+        mask &= (snapshot["market_cap"] >= min_market_cap).to_numpy()
+    if max_beta is not None:
+        mask &= (snapshot["beta"] <= max_beta).to_numpy()
+    if min_dividend_yield is not None:
+        mask &= (snapshot["dividend_yield"] >= min_dividend_yield).to_numpy()
+    return snapshot[mask]
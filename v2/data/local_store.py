@@ -0,0 +1,112 @@
+"""
+Local Store - Small on-disk cache shared by the data layer
+
+Services use this to persist downloaded data under CACHE_DIR so that repeat
+requests (and other processes on the same machine) read from disk instead
+of calling yfinance/NSE again. Writes go to a temporary file first and are
+moved into place, so readers never see a half-written file.
+"""
+import json
+import os
+import tempfile
+from typing import Any, Dict
+
+import numpy as np
+import pandas as pd
+
+from v2.config import CACHE_DIR
+
+
+def store_path(*parts: str) -> str:
+    """
+    Build a path inside the cache directory, creating parent folders.
+
+    Args:
+        *parts: Path components relative to CACHE_DIR (e.g. "prices", "TCS.NS.pkl")
+
+    Returns:
+        Absolute file path
+    """
+    path = os.path.join(CACHE_DIR, *parts)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    return path
+
+
+def _atomic_write(path: str, write_fn):
+    directory = os.path.dirname(path) or "."
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".tmp-")
+    os.close(fd)
+    try:
+        write_fn(tmp_path)
+        os.replace(tmp_path, path)
+    except Exception:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def read_frame(path: str) -> pd.DataFrame:
+    """
+    Read a cached DataFrame (.pkl or .csv).
+
+    Returns:
+        The stored DataFrame, or an empty DataFrame if missing or unreadable
+    """
+    if not os.path.exists(path):
+        return pd.DataFrame()
+    try:
+        if path.endswith(".csv"):
+            return pd.read_csv(path)
+        return pd.read_pickle(path)
+    except Exception as e:
+        print(f"Error reading cached data {path}: {e}")
+        return pd.DataFrame()
+
+
+def write_frame(df: pd.DataFrame, path: str):
+    """Atomically write a DataFrame (.pkl or .csv)."""
+    if path.endswith(".csv"):
+        _atomic_write(path, lambda tmp: df.to_csv(tmp, index=False))
+    else:
+        _atomic_write(path, lambda tmp: df.to_pickle(tmp))
+
+
+def read_json(path: str) -> Dict[str, Any]:
+    """Read a cached JSON object, or an empty dict if missing or unreadable."""
+    if not os.path.exists(path):
+        return {}
+    try:
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+    except Exception as e:
+        print(f"Error reading cached data {path}: {e}")
+        return {}
+
+
+def write_json(data: Dict[str, Any], path: str):
+    """Atomically write a JSON object."""
+    def _write(tmp: str):
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(data, f, indent=2, default=str)
+    _atomic_write(path, _write)
+
+
+def read_arrays(path: str) -> Dict[str, np.ndarray]:
+    """Read cached named arrays (.npz), or an empty dict if missing or unreadable."""
+    if not os.path.exists(path):
+        return {}
+    try:
+        with np.load(path, allow_pickle=False) as data:
+            return {name: data[name] for name in data.files}
+    except Exception as e:
+        print(f"Error reading cached data {path}: {e}")
+        return {}
+
+
+def write_arrays(arrays: Dict[str, np.ndarray], path: str):
+    """Atomically write named arrays (.npz, uncompressed)."""
+    def _write(tmp: str):
+        with open(tmp, "wb") as f:
+            np.savez(f, **arrays)
+    _atomic_write(path, _write)
@@ -0,0 +1,287 @@
+"""
+Memory Cache - Size-aware in-process cache shared by the data and analysis layers
+
+Memoizing fetch_price_data or fetch_earnings_history with a plain dict or
+lru_cache grows without limit in a long-lived Streamlit or API server
+process: full histories for hundreds of symbols add up fast. MemoryCache
+measures the actual bytes of every DataFrame, Series and array it keeps,
+evicts least-recently-used entries once a memory budget is reached, expires
+entries after a time-to-live, and counts hits, misses and evictions.
+
+Concurrent misses for the same key run the computation once (SingleFlight).
+
+    @memoized(ttl=600)
+    def fetch_something(symbol): ...
+
+    get_memory_cache().stats()   # {"hits": ..., "misses": ..., "evictions": ..., "bytes": ...}
+
+Budget and default TTL come from config.MEMORY_CACHE_MB / MEMORY_CACHE_TTL.
+"""
+import functools
+import inspect
+import sys
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional
+
+import numpy as np
+import pandas as pd
+
+from v2.config import MEMORY_CACHE_MB, MEMORY_CACHE_TTL
+from v2.data.trading_calendar import last_trading_day
+
+_MISSING = object()
+
+
+class SingleFlight:
+    """
+    Collapse concurrent calls with the same key into one execution.
+
+    The first caller runs the function; callers arriving while it runs wait
+    and receive the same result (or exception).
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls: Dict[Hashable, Dict[str, Any]] = {}
+
+    def do(self, key: Hashable, fn: Callable[[], Any]) -> Any:
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = {"done": threading.Event(), "result": None, "error": None}
+                self._calls[key] = call
+
+        if not leader:
+            call["done"].wait()
+        else:
+            try:
+                call["result"] = fn()
+            except Exception as e:
+                call["error"] = e
+            finally:
+                with self._lock:
+                    del self._calls[key]
+                call["done"].set()
+
+        if call["error"] is not None:
+            raise call["error"]
+        return call["result"]
+
+
+def sizeof(value: Any) -> int:
+    """
+    Approximate memory held by a cached value, in bytes.
+
+    DataFrames and Series are measured with memory_usage(deep=True) (object
+    columns included), arrays by nbytes; containers are summed recursively.
+    """
+    if isinstance(value, pd.DataFrame):
+        return int(value.memory_usage(index=True, deep=True).sum())
+    if isinstance(value, (pd.Series, pd.Index)):
+        return int(value.memory_usage(deep=True))
+    if isinstance(value, np.ndarray):
+        return int(value.nbytes)
+    if isinstance(value, dict):
+        return sys.getsizeof(value) + sum(sizeof(k) + sizeof(v) for k, v in value.items())
+    if isinstance(value, (list, tuple, set, frozenset)):
+        return sys.getsizeof(value) + sum(sizeof(v) for v in value)
+    return sys.getsizeof(value)
+
+
+def _is_empty(value: Any) -> bool:
+    """Failed fetches return empty frames/dicts; those are not worth keeping."""
+    if value is None:
+        return True
+    if isinstance(value, (pd.DataFrame, pd.Series)):
+        return value.empty
+    if isinstance(value, (dict, list, tuple)):
+        return len(value) == 0
+    return False
+
+
+def _copy_value(value: Any) -> Any:
+    """Copy handed to callers, so they can add columns without touching the cached value."""
+    if isinstance(value, (pd.DataFrame, pd.Series, np.ndarray)):
+        return value.copy()
+    if isinstance(value, dict):
+        return dict(value)
+    if isinstance(value, list):
+        return list(value)
+    return value
+
+
+class MemoryCache:
+    """
+    LRU cache with a byte budget and a per-entry time-to-live.
+
+    Args:
+        max_bytes: Memory budget; least-recently-used entries are evicted above it
+        ttl: Default seconds an entry is served (None = until evicted)
+    """
+
+    def __init__(self, max_bytes: int, ttl: Optional[float] = None):
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        # key -> (value, size, expires_at)
+        self._entries: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._bytes = 0
+        self._flight = SingleFlight()
+        self._counters = {"hits": 0, "misses": 0, "evictions": 0, "expirations": 0, "rejected": 0}
+
+    def _remove(self, key: Hashable):
+        _, size, _ = self._entries.pop(key)
+        self._bytes -= size
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Cached value for `key` (marked most recently used), or `default`."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[2] is not None and entry[2] <= time.monotonic():
+                self._remove(key)
+                self._counters["expirations"] += 1
+                entry = None
+            if entry is None:
+                self._counters["misses"] += 1
+                return default
+            self._entries.move_to_end(key)
+            self._counters["hits"] += 1
+            return entry[0]
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = _MISSING) -> bool:
+        """
+        Store a value, evicting least-recently-used entries to stay within budget.
+
+        Args:
+            key: Hashable key
+            value: Value to keep (not copied)
+            ttl: Seconds to serve it (default: the cache's ttl; None = no expiry)
+
+        Returns:
+            False if the value alone exceeds the budget (it is not stored)
+        """
+        size = sizeof(value)
+        ttl = self.ttl if ttl is _MISSING else ttl
+        expires_at = time.monotonic() + ttl if ttl is not None else None
+
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            if size > self.max_bytes:
+                self._counters["rejected"] += 1
+                return False
+
+            if self._bytes + size > self.max_bytes:
+                # Drop expired entries before evicting live ones
+                now = time.monotonic()
+                for stale in [k for k, e in self._entries.items() if e[2] is not None and e[2] <= now]:
+                    self._remove(stale)
+                    self._counters["expirations"] += 1
+            while self._bytes + size > self.max_bytes:
+                self._remove(next(iter(self._entries)))
+                self._counters["evictions"] += 1
+
+            self._entries[key] = (value, size, expires_at)
+            self._bytes += size
+            return True
+
+    def get_or_compute(self, key: Hashable, compute: Callable[[], Any], ttl: Optional[float] = _MISSING,
+                       store_empty: bool = True) -> Any:
+        """
+        Cached value for `key`, computing and storing it on a miss.
+
+        Concurrent misses for the same key wait for a single computation.
+
+        Args:
+            key: Hashable key
+            compute: Zero-argument function producing the value
+            ttl: Seconds to serve the value (default: the cache's ttl)
+            store_empty: Also keep empty results (None, empty frames/dicts)
+        """
+        value = self.get(key, _MISSING)
+        if value is not _MISSING:
+            return value
+
+        def _compute_and_store():
+            result = compute()
+            if store_empty or not _is_empty(result):
+                self.set(key, result, ttl)
+            return result
+
+        return self._flight.do(key, _compute_and_store)
+
+    def invalidate(self, predicate: Optional[Callable[[Hashable], bool]] = None):
+        """Drop every entry (or those whose key matches `predicate`)."""
+        with self._lock:
+            for key in [k for k in self._entries if predicate is None or predicate(k)]:
+                self._remove(key)
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss/eviction counters plus current entries, bytes and budget."""
+        with self._lock:
+            return {**self._counters, "entries": len(self._entries), "bytes": self._bytes,
+                    "max_bytes": self.max_bytes}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+_shared_cache = MemoryCache(MEMORY_CACHE_MB * 1024 * 1024, MEMORY_CACHE_TTL)
+
+
+def get_memory_cache() -> MemoryCache:
+    """The process-wide cache used by memoized() and the API server."""
+    return _shared_cache
+
+
+def configure_memory_cache(max_mb: Optional[float] = None, ttl: Optional[float] = _MISSING):
+    """Change the shared cache's budget (in MB) and/or default TTL; shrinking evicts on the next store."""
+    if max_mb is not None:
+        _shared_cache.max_bytes = int(max_mb * 1024 * 1024)
+    if ttl is not _MISSING:
+        _shared_cache.ttl = ttl
+
+
+def memoized(ttl: Optional[float] = _MISSING, refresh_arg: Optional[str] = "refresh"):
+    """
+    Memoize a data-layer function in the shared MemoryCache.
+
+    Keys are the function, its arguments and the last completed trading day,
+    so results roll over with the session. Empty results (failed fetches)
+    are not kept, and every caller gets its own copy of a cached DataFrame,
+    array, dict or list.
+
+    Args:
+        ttl: Seconds to serve a result (default: config.MEMORY_CACHE_TTL)
+        refresh_arg: Keyword argument that, when true, bypasses and replaces the cached value
+
+    Example:
+        @memoized()
+        def fetch_price_data(symbol, days=60): ...
+    """
+    def decorator(func):
+        name = f"{func.__module__}.{func.__qualname__}"
+        signature = inspect.signature(func)
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            cache = get_memory_cache()
+            # fetch("TCS"), fetch("TCS", 60) and fetch(symbol="TCS", days=60) share one entry
+            bound = signature.bind(*args, **kwargs)
+            bound.apply_defaults()
+            arguments = dict(bound.arguments)
+            refresh = bool(refresh_arg and arguments.pop(refresh_arg, False))
+            key = (name, str(last_trading_day()), tuple(arguments.items()))
+
+            if refresh:
+                value = func(*args, **kwargs)
+                if not _is_empty(value):
+                    cache.set(key, value, ttl)
+                return _copy_value(value)
+            return _copy_value(cache.get_or_compute(key, lambda: func(*args, **kwargs), ttl, store_empty=False))
+
+        return wrapper
+    return decorator
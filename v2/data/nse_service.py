@@ -3,12 +3,38 @@ NSE Service - Fetches data directly from NSE using nsepython
 
 This service provides access to official NSE data for:
 - Board meetings (including for financial results/earnings)
+
+Upcoming results dates come from the exchange-wide board-meeting calendar
+(board_meetings.py), downloaded once per day for every symbol. The
+per-symbol nse_eq() payload is only used when that calendar is unavailable.
 """
 from nsepython import nse_eq
 from datetime import datetime
-from typing import Optional, List, Dict, Any
+from typing import Optional
 import pandas as pd
 
+from v2.data.board_meetings import RESULTS_PURPOSE_PATTERN, get_board_meeting_calendar
+
+
+def _fetch_next_earnings_date_from_nse_eq(symbol: str) -> Optional[datetime]:
+    """Next results meeting from the symbol's own nse_eq() payload (one request per symbol)."""
+    try:
+        data = nse_eq(symbol)
+        board_meetings = pd.DataFrame(data.get('corporate', {}).get('boardMeetings', []))
+        if board_meetings.empty or 'purposedate' not in board_meetings:
+            return None
+
+        purpose = board_meetings.get('purpose', pd.Series('', index=board_meetings.index)).fillna('')
+        dates = pd.to_datetime(board_meetings['purposedate'], errors='coerce')
+        is_results = purpose.str.contains(RESULTS_PURPOSE_PATTERN, case=False, regex=True)
+        future = dates[is_results & (dates >= pd.Timestamp.now().normalize())]
+        return future.min() if not future.empty else None
+
+    except Exception as e:
+        print(f"Error fetching data from nsepython for {symbol}: {e}")
+        return None
+
+
 def fetch_next_earnings_date_from_nse(symbol: str) -> Optional[datetime]:
     """
     Fetch the next earnings date from NSE board meetings.
@@ -19,49 +45,7 @@ def fetch_next_earnings_date_from_nse(symbol: str) -> Optional[datetime]:
     Returns:
         datetime of the next board meeting for financial results, or None
     """
-    print(f"\n[DEBUG][NSE] Fetching board meetings for {symbol}")
-    try:
-        # Fetch detailed equity data from nsepython
-        data = nse_eq(symbol)
-        
-        # Log the raw response
-        print(f"[DEBUG][NSE] Raw response from nse_eq('{symbol}'):")
-        print(data)
-
-        corporate_info = data.get('corporate', {})
-        board_meetings = corporate_info.get('boardMeetings', [])
-
-        if not board_meetings:
-            print("[DEBUG][NSE] No board meetings found.")
-            return None
-
-        future_meetings = []
-        for meeting in board_meetings:
-            purpose = meeting.get('purpose', '').lower()
-            date_str = meeting.get('purposedate')
-
-            if not date_str:
-                continue
-
-            # Check if the purpose is related to earnings/financial results
-            if "financial results" in purpose or "earnings" in purpose or "audited" in purpose or "unaudited" in purpose:
-                try:
-                    meeting_date = pd.to_datetime(date_str)
-                    # Check if the meeting is in the future
-                    if meeting_date >= pd.Timestamp.now().normalize():
-                        future_meetings.append(meeting_date)
-                except Exception as e:
-                    print(f"[DEBUG][NSE] Error parsing date '{date_str}': {e}")
-        
-        if not future_meetings:
-            print("[DEBUG][NSE] No future board meetings for financial results found.")
-            return None
-        
-        # Return the earliest future meeting date
-        next_meeting_date = min(future_meetings)
-        print(f"[DEBUG][NSE] Found next earnings-related board meeting: {next_meeting_date}")
-        return next_meeting_date
-
-    except Exception as e:
-        print(f"Error fetching data from nsepython for {symbol}: {e}")
-        return None
+    calendar = get_board_meeting_calendar()
+    if len(calendar.meetings):
+        return calendar.next_results_date(symbol)
+    return _fetch_next_earnings_date_from_nse_eq(symbol)
@@ -0,0 +1,288 @@
+"""
+Price Archive - Memory-mapped columnar store of daily OHLCV for a universe
+
+Universe-wide scans read from one on-disk archive instead of loading
+thousands of per-symbol DataFrames:
+
+    archive/
+    ├── CURRENT                      # name of the live build directory
+    └── build-YYYYmmdd-HHMMSS-ID/
+        ├── index.json               # symbols, fields, dtypes, shape
+        ├── dates.npy                # datetime64[D] trading dates (row axis)
+        ├── open.npy                 # float32 [dates x symbols]
+        ├── high.npy / low.npy / close.npy
+        ├── volume.npy               # float64 [dates x symbols] (NaN = no bar)
+        └── quality.csv              # per-symbol data-quality counts (see quality.py)
+
+Fields are opened with numpy memmap, so slices are served straight from the
+OS page cache and every process (Streamlit, scanners, backtests) shares the
+same physical pages. Missing bars are NaN.
+
+A rebuild writes a new build directory and then switches CURRENT with one
+os.replace, so a reader sees either the old build or the new one, never a
+mix. PriceArchive maps all of its fields when it opens, so an open handle
+keeps reading its own build after a switch.
+"""
+import json
+import os
+import shutil
+import threading
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Sequence, Union
+
+import numpy as np
+import pandas as pd
+
+from v2.data.local_store import store_path
+from v2.data.price_service import fetch_price_data
+from v2.data.quality import validate_panel
+from v2.data.trading_calendar import fetch_window, last_trading_day, trading_sessions
+
+FIELD_DTYPES = {
+    "open": "float32",
+    "high": "float32",
+    "low": "float32",
+    "close": "float32",
+    "volume": "float64",
+}
+
+_SOURCE_COLUMNS = {"open": "Open", "high": "High", "low": "Low", "close": "Close", "volume": "Volume"}
+
+DateLike = Union[str, np.datetime64, pd.Timestamp, None]
+
+# Pointer file naming the live build directory
+CURRENT_FILE = "CURRENT"
+
+
+def default_archive_path() -> str:
+    """Location of the shared archive inside the cache directory."""
+    return os.path.dirname(store_path("archive", CURRENT_FILE))
+
+
+def current_build_path(path: Optional[str] = None) -> Optional[str]:
+    """
+    Directory of the live build of an archive.
+
+    Args:
+        path: Archive directory (default: CACHE_DIR/archive)
+
+    Returns:
+        Build directory, or None if no archive has been built yet
+    """
+    path = path or default_archive_path()
+    try:
+        with open(os.path.join(path, CURRENT_FILE), encoding="utf-8") as f:
+            build = os.path.join(path, f.read().strip())
+    except FileNotFoundError:
+        # Archives built before CURRENT existed keep their files in the directory itself
+        build = path
+    return build if os.path.exists(os.path.join(build, "index.json")) else None
+
+
+def _archive_dates(days: int) -> np.ndarray:
+    """Row axis for a new archive: the last `days` NSE trading sessions up to today."""
+    start, _ = fetch_window(days)
+    return trading_sessions(start, last_trading_day())
+
+
+def build_price_archive(symbols: Sequence[str], days: int, path: Optional[str] = None,
+                        adjusted: bool = True, workers: int = 4) -> str:
+    """
+    Build (or rebuild) the archive from the cached per-symbol price data.
+
+    The new archive is written to its own build directory and made live by
+    replacing the CURRENT pointer in one step. Older builds are removed,
+    except the one just replaced (a reader may be opening it).
+
+    Args:
+        symbols: Universe to store (column order of the archive)
+        days: Number of trading days (rows)
+        path: Archive directory (default: CACHE_DIR/archive)
+        adjusted: Store split/dividend adjusted prices
+        workers: Symbols fetched concurrently
+
+    Returns:
+        Archive directory path
+    """
+    path = path or default_archive_path()
+    previous = current_build_path(path)
+    # Unique per build, so a rebuild never writes into the live directory
+    build_name = f"build-{pd.Timestamp.now():%Y%m%d-%H%M%S}-{uuid.uuid4().hex[:8]}"
+    build_path = os.path.join(path, build_name)
+    os.makedirs(build_path)
+
+    symbols = [s.upper() for s in symbols]
+    dates = _archive_dates(days)
+    shape = (len(dates), len(symbols))
+
+    arrays = {}
+    for field, dtype in FIELD_DTYPES.items():
+        arrays[field] = np.lib.format.open_memmap(
+            os.path.join(build_path, f"{field}.npy"), mode="w+", dtype=dtype, shape=shape
+        )
+        arrays[field][:] = np.nan
+
+    def load(symbol: str) -> pd.DataFrame:
+        return fetch_price_data(symbol, days=days, adjusted=adjusted, compact=True)
+
+    filled = 0
+    chunk = max(1, workers) * 4
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as executor:
+        for offset in range(0, len(symbols), chunk):
+            batch = symbols[offset:offset + chunk]
+            for col, df in enumerate(executor.map(load, batch), start=offset):
+                if df.empty:
+                    continue
+                bar_dates = df["Date"].values.astype("datetime64[D]")
+                rows = np.searchsorted(dates, bar_dates)
+                in_range = (rows < len(dates)) & (dates[np.minimum(rows, len(dates) - 1)] == bar_dates)
+                for field, column in _SOURCE_COLUMNS.items():
+                    arrays[field][rows[in_range], col] = df[column].to_numpy()[in_range]
+                filled += 1
+
+    # Universe-wide quality counts, stored with the archive
+    quality = validate_panel(arrays["close"], arrays["volume"], symbols, dates)
+    quality.to_csv(os.path.join(build_path, "quality.csv"))
+
+    for array in arrays.values():
+        array.flush()
+    del arrays
+
+    np.save(os.path.join(build_path, "dates.npy"), dates)
+    with open(os.path.join(build_path, "index.json"), "w", encoding="utf-8") as f:
+        json.dump({
+            "symbols": symbols,
+            "fields": FIELD_DTYPES,
+            "shape": list(shape),
+            "adjusted": adjusted,
+            "built_at": pd.Timestamp.now().isoformat(),
+        }, f, indent=2)
+
+    # Switch readers to the new build atomically
+    pointer_tmp = os.path.join(path, f".{CURRENT_FILE}.tmp-{os.getpid()}")
+    with open(pointer_tmp, "w", encoding="utf-8") as f:
+        f.write(build_name)
+    os.replace(pointer_tmp, os.path.join(path, CURRENT_FILE))
+    _remove_old_builds(path, keep={build_name, os.path.basename(previous or "")})
+
+    print(f"Price archive built: {filled}/{len(symbols)} symbols x {len(dates)} days -> {build_path}")
+    flagged = int((~quality["clean"] & (quality["bars"] > 0)).sum())
+    if flagged:
+        print(f"Data quality: {flagged} symbol(s) flagged, see {os.path.join(build_path, 'quality.csv')}")
+    return path
+
+
+def _remove_old_builds(path: str, keep: set):
+    """Delete build directories (and pre-CURRENT files) other than `keep`."""
+    for name in os.listdir(path):
+        full = os.path.join(path, name)
+        if name.startswith("build-") and name not in keep and os.path.isdir(full):
+            shutil.rmtree(full, ignore_errors=True)
+        elif name in ("index.json", "dates.npy", "quality.csv") or name in {f"{f}.npy" for f in FIELD_DTYPES}:
+            os.remove(full)
+
+
+class PriceArchive:
+    """
+    Read-only, memory-mapped view of one build of a price archive.
+
+    Args:
+        path: Archive directory (default: CACHE_DIR/archive); its live build is opened
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        root = path or default_archive_path()
+        self.path = current_build_path(root)
+        if self.path is None:
+            raise FileNotFoundError(f"No price archive in {root}")
+        with open(os.path.join(self.path, "index.json"), encoding="utf-8") as f:
+            self.index = json.load(f)
+        self.symbols: List[str] = self.index["symbols"]
+        self.dates: np.ndarray = np.load(os.path.join(self.path, "dates.npy"))
+        self._symbol_pos: Dict[str, int] = {s: i for i, s in enumerate(self.symbols)}
+        # Mapped up front: the mappings stay valid even after a rebuild removes this build
+        self._fields: Dict[str, np.memmap] = {
+            name: np.load(os.path.join(self.path, f"{name}.npy"), mmap_mode="r") for name in FIELD_DTYPES
+        }
+
+    def field(self, name: str) -> np.memmap:
+        """Full [dates x symbols] memmap for one field (open, high, low, close, volume)."""
+        if name not in self._fields:
+            raise KeyError(f"Unknown archive field: {name}")
+        return self._fields[name]
+
+    def date_slice(self, start: DateLike = None, end: DateLike = None) -> slice:
+        """Row slice covering start..end inclusive (None = open ended)."""
+        lo = 0 if start is None else int(np.searchsorted(self.dates, np.datetime64(pd.Timestamp(start).date()), side="left"))
+        hi = len(self.dates) if end is None else int(np.searchsorted(self.dates, np.datetime64(pd.Timestamp(end).date()), side="right"))
+        return slice(lo, hi)
+
+    def symbol_indexer(self, symbols: Optional[Sequence[str]] = None) -> Union[slice, np.ndarray]:
+        """
+        Column indexer for a symbol subset.
+
+        Returns a slice when the symbols form a contiguous run in archive
+        order (zero-copy), otherwise an integer array (copies only the subset).
+        Unknown symbols raise KeyError.
+        """
+        if symbols is None:
+            return slice(0, len(self.symbols))
+        positions = np.array([self._symbol_pos[s.upper()] for s in symbols], dtype=np.int64)
+        if len(positions) and np.all(np.diff(positions) == 1):
+            return slice(int(positions[0]), int(positions[-1]) + 1)
+        return positions
+
+    def get(self, name: str, start: DateLike = None, end: DateLike = None,
+            symbols: Optional[Sequence[str]] = None) -> np.ndarray:
+        """
+        [dates x symbols] array for one field.
+
+        Date ranges and contiguous symbol runs are zero-copy views of the memmap.
+        """
+        rows = self.date_slice(start, end)
+        cols = self.symbol_indexer(symbols)
+        return self.field(name)[rows, cols]
+
+    def quality_report(self) -> pd.DataFrame:
+        """Per-symbol data-quality counts computed when the archive was built (empty if absent)."""
+        quality_path = os.path.join(self.path, "quality.csv")
+        if not os.path.exists(quality_path):
+            return pd.DataFrame()
+        return pd.read_csv(quality_path, index_col="Symbol")
+
+    def frame(self, name: str, start: DateLike = None, end: DateLike = None,
+              symbols: Optional[Sequence[str]] = None) -> pd.DataFrame:
+        """Same as get(), wrapped in a DataFrame indexed by date with symbol columns."""
+        rows = self.date_slice(start, end)
+        cols = self.symbol_indexer(symbols)
+        columns = self.symbols[cols] if isinstance(cols, slice) else [self.symbols[i] for i in cols]
+        return pd.DataFrame(self.field(name)[rows, cols], index=pd.DatetimeIndex(self.dates[rows]),
+                            columns=columns, copy=False)
+
+
+_archive_lock = threading.Lock()
+_open_archives: Dict[str, tuple] = {}
+
+
+def open_price_archive(path: Optional[str] = None) -> Optional[PriceArchive]:
+    """
+    Process-wide archive handle, reopened only when the archive is rebuilt.
+
+    Returns:
+        PriceArchive, or None if no archive has been built yet
+    """
+    path = path or default_archive_path()
+    build = current_build_path(path)
+    if build is None:
+        return None
+
+    with _archive_lock:
+        cached = _open_archives.get(path)
+        if cached is None or cached[0] != build:
+            try:
+                archive = PriceArchive(path)
+            except FileNotFoundError:
+                return cached[1] if cached else None
+            _open_archives[path] = (archive.path, archive)
+        return _open_archives[path][1]
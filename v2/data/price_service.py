@@ -4,97 +4,331 @@ Price Data Service - Fetches OHLC data from yfinance
 This service fetches historical price data (Open, High, Low, Close, Volume)
 for NSE stocks. We need 60 days of data to calculate 20-day rolling averages
 with enough history for the display period.
+
+Each symbol is downloaded once, unadjusted, together with its splits and
+dividends. Raw bars and a split/dividend factor table are cached locally;
+adjusted prices are derived from them (see corporate_actions.py), so raw,
+adjusted and debug views all come from the same fetch. Downloaded bars pass
+through the data-quality checks (see quality.py) before they are cached.
+Within a process, fetch_price_data results are also kept in the shared
+memory cache (see memory_cache.py).
 """
-from datetime import datetime, timedelta
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import List, Sequence, Tuple
 
+import numpy as np
 import pandas as pd
 import yfinance as yf
 
 from v2.constants.constants import fetch_price_data_days
+from v2.data.corporate_actions import (
+    adjust_prices,
+    build_factor_table,
+    merge_factor_tables,
+    unadjust_yfinance_history,
+)
+from v2.data.local_store import read_frame, read_json, store_path, write_frame, write_json
+from v2.data.memory_cache import memoized
+from v2.data.quality import validate_bars
+from v2.data.symbols import to_ticker_symbol
+from v2.data.trading_calendar import MARKET_CLOSE, MARKET_TZ, fetch_window, last_completed_session
+
+
+# Column dtypes of compact frames (fetch_price_data(compact=True), fetch_price_frame_long)
+COMPACT_DTYPES = {"Open": "float32", "High": "float32", "Low": "float32", "Close": "float32", "Volume": "int64"}
 
 
-def _fetch_yfinance_data(symbol: str, days: int) -> pd.DataFrame:
+def _get_ticker_symbol(symbol: str) -> str:
+    """Add .NS suffix for NSE stocks if not present (indices and US stocks are left as-is)."""
+    return to_ticker_symbol(symbol)
+
+
+def _download_history(ticker_symbol: str, start_date: datetime, end_date: datetime) -> pd.DataFrame:
     """
-    Private function to fetch raw data from yfinance.
+    Download unadjusted bars plus corporate actions and convert them to raw prices.
     """
-    # Add .NS suffix for NSE stocks if not present
-    ticker_symbol = symbol.upper()
-    if not ticker_symbol.endswith(".NS"):
-        ticker_symbol = f"{ticker_symbol}.NS"
-    
+    ticker = yf.Ticker(ticker_symbol)
+    df = ticker.history(start=start_date, end=end_date, auto_adjust=False, actions=True)
+
+    if df.empty:
+        return pd.DataFrame()
+
+    df = df.reset_index()
+    # Store plain trading dates (no time/timezone) so cached files compare cleanly
+    df["Date"] = pd.to_datetime(df["Date"]).dt.tz_localize(None).dt.normalize()
+    df = df.sort_values("Date").reset_index(drop=True)
+    return unadjust_yfinance_history(df)
+
+
+def _load_price_history(symbol: str, days: int) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """
+    Return cached raw bars and factor table, fetching only what is missing.
+
+    - Cache covers the window and its last bar is a completed session, stored
+      after that session closed: no network call
+    - Otherwise: fetch only the bars since the last stored date
+    - Window starts before the cache: refetch the full window
+
+    Returns:
+        (raw bars, factor table). Both empty if the fetch fails.
+    """
+    ticker_symbol = _get_ticker_symbol(symbol)
+    raw_path = store_path("prices", f"{ticker_symbol}.pkl")
+    factors_path = store_path("prices", f"{ticker_symbol}.factors.csv")
+    meta_path = store_path("prices", f"{ticker_symbol}.json")
+
+    # Exact window of `days` NSE trading sessions ending today
+    start_date, end_date = fetch_window(days)
+    now = pd.Timestamp.now(tz=MARKET_TZ).tz_localize(None)
+    last_session = pd.Timestamp(last_completed_session(now))
+
+    raw = read_frame(raw_path)
+    factors = read_frame(factors_path)
+    meta = read_json(meta_path)
+    if not factors.empty:
+        factors["Date"] = pd.to_datetime(factors["Date"])
+
+    # A symbol listed after start_date never has bars back to it, so also
+    # trust the window that was requested when the cache was filled
+    covers_window = not raw.empty and (
+        raw["Date"].iloc[0] <= pd.Timestamp(start_date)
+        or pd.Timestamp(meta.get("window_start", raw["Date"].iloc[0])) <= pd.Timestamp(start_date)
+    )
+    # Fresh if the last bar is the last completed session and was stored after
+    # that session closed; a bar fetched mid-session is partial and is refetched
+    # (no refetch over weekends and holidays)
+    is_fresh = (
+        not raw.empty
+        and raw["Date"].iloc[-1] >= last_session
+        and meta.get("fetched_at", "")
+        >= datetime.combine(raw["Date"].iloc[-1].date(), MARKET_CLOSE).isoformat(timespec="seconds")
+    )
+
     try:
-        # Fetch extra days to account for weekends/holidays
-        # Rule of thumb: multiply by 1.5 to ensure we get enough trading days
-        calendar_days = int(days * 1.5)
-        end_date = datetime.now()
-        start_date = end_date - timedelta(days=calendar_days)
-        
-        # Download data from yfinance
-        ticker = yf.Ticker(ticker_symbol)
-        df = ticker.history(start=start_date, end=end_date)
-        
-        if df.empty:
-            return pd.DataFrame()
-        
-        return df
-        
+        if covers_window and is_fresh:
+            return raw, factors
+
+        if covers_window:
+            # Incremental: re-download from the last stored bar (it may have been a partial day)
+            last_date = raw["Date"].iloc[-1]
+            new_raw = _download_history(ticker_symbol, last_date.to_pydatetime(), end_date)
+            if not new_raw.empty:
+                first_new = new_raw["Date"].iloc[0]
+                raw = pd.concat([raw[raw["Date"] < first_new], new_raw], ignore_index=True)
+                # Repair first, as on the full path, so factors never come from bad closes
+                raw, _ = validate_bars(raw, ticker_symbol)
+                # Factors need the previous close: build them on the combined bars so the
+                # first refetched bar sees the stored close before it, and keep only the
+                # refetched dates (stored factors for older ex-dates stay as they are)
+                new_factors = build_factor_table(raw)
+                factors = merge_factor_tables(factors, new_factors[new_factors["Date"] >= first_new])
+        else:
+            raw = _download_history(ticker_symbol, start_date, end_date)
+            if raw.empty:
+                return pd.DataFrame(), pd.DataFrame()
+            # Catch bad bars once here, before they reach the cache and every indicator
+            raw, _ = validate_bars(raw, ticker_symbol)
+            factors = build_factor_table(raw)
+            meta["window_start"] = start_date.date().isoformat()
+
+        write_frame(raw, raw_path)
+        write_frame(factors, factors_path)
+        meta.update({"fetched_at": now.isoformat(timespec="seconds"), "first_date": raw["Date"].iloc[0], "last_date": raw["Date"].iloc[-1]})
+        write_json(meta, meta_path)
+        return raw, factors
+
     except Exception as e:
         print(f"Error fetching price data for {symbol}: {e}")
-        return pd.DataFrame()
+        if not raw.empty:
+            # Serve stale cached data rather than nothing
+            return raw, factors
+        return pd.DataFrame(), pd.DataFrame()
 
 
-def fetch_price_data(symbol: str, days: int = fetch_price_data_days) -> pd.DataFrame:
+@memoized()
+def fetch_price_data(symbol: str, days: int = fetch_price_data_days, adjusted: bool = True,
+                     compact: bool = False) -> pd.DataFrame:
     """
     Fetch OHLC price data for an NSE stock.
-    
+
     Args:
         symbol: NSE stock symbol (e.g., "RELIANCE", "TCS")
                 Will auto-append .NS suffix for yfinance
         days: Number of trading days to fetch (default 60 for baseline calculation)
-    
+        adjusted: Adjust prices for splits and dividends (default, matches yfinance);
+                  False returns prices as traded
+        compact: Return a typed frame instead: datetime64 Date, float32 OHLC,
+                 int64 Volume (see compact_price_frame)
+
     Returns:
         DataFrame with columns: Date, Open, High, Low, Close, Volume
         Returns empty DataFrame if fetch fails
-    
+
     Example:
         df = fetch_price_data("RELIANCE", days=60)
         # Returns 60 days of OHLC data for Reliance Industries
     """
-    df = _fetch_yfinance_data(symbol, days)
-    
-    if df.empty:
+    raw, factors = _load_price_history(symbol, days)
+
+    if raw.empty:
         return pd.DataFrame()
-    
-    # Reset index to make Date a column
-    df = df.reset_index()
-    
+
+    df = adjust_prices(raw, factors) if adjusted else raw.copy()
+
     # Keep only the columns we need
     df = df[["Date", "Open", "High", "Low", "Close", "Volume"]]
 
-
-    # Convert Date to date only (remove time component)
-    df["Date"] = pd.to_datetime(df["Date"]).dt.date
-    
-    # Sort by date ascending (oldest first)
+    # Sort by date ascending (oldest first), on datetime64 rather than date objects
+    df["Date"] = pd.to_datetime(df["Date"])
     df = df.sort_values("Date").reset_index(drop=True)
-    
+
     # Take only the last 'days' rows
     if len(df) > days:
         df = df.tail(days).reset_index(drop=True)
-    
+
+    if compact:
+        return compact_price_frame(df)
+
+    # Convert Date to date only (remove time component)
+    df["Date"] = df["Date"].dt.date
     return df
 
 
+def compact_price_frame(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Typed copy of a price frame: datetime64 Date, float32 OHLC and int64 Volume.
+
+    Python date objects make Date an object column, so every comparison, sort
+    and join on it runs element by element; datetime64 keeps those vectorized.
+    float32 keeps ~7 significant digits, ample for NSE prices; missing volumes
+    become 0.
+
+    Args:
+        df: Frame with Date and any of Open, High, Low, Close, Volume
+
+    Returns:
+        New DataFrame with the same columns
+    """
+    df = df.copy()
+    df["Date"] = pd.to_datetime(df["Date"])
+    if "Volume" in df:
+        df["Volume"] = df["Volume"].astype("float64").fillna(0).round()
+    return df.astype({column: dtype for column, dtype in COMPACT_DTYPES.items() if column in df})
+
+
+def fetch_price_frame_long(symbols: Sequence[str], days: int = fetch_price_data_days, adjusted: bool = True,
+                           workers: int = 4) -> pd.DataFrame:
+    """
+    Compact price frames for many symbols stacked into one long frame.
+
+    Args:
+        symbols: NSE stock symbols
+        days: Number of trading days per symbol
+        adjusted: Adjust prices for splits and dividends
+        workers: Symbols loaded in parallel
+
+    Returns:
+        DataFrame with columns Date (datetime64), Symbol (categorical, categories
+        in `symbols` order), Open, High, Low, Close (float32) and Volume (int64),
+        sorted by Symbol then Date. Symbols without data have no rows.
+
+    Example:
+        long = fetch_price_frame_long(["TCS", "INFY"], days=250)
+        closes = long.pivot(index="Date", columns="Symbol", values="Close")
+    """
+    symbols = list(dict.fromkeys(s.upper() for s in symbols))
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as executor:
+        frames = list(executor.map(lambda s: fetch_price_data(s, days=days, adjusted=adjusted, compact=True),
+                                   symbols))
+
+    loaded = [df for df in frames if not df.empty]
+    long = pd.concat(loaded, ignore_index=True) if loaded else compact_price_frame(
+        pd.DataFrame(columns=["Date", "Open", "High", "Low", "Close", "Volume"]))
+    codes = np.repeat(np.arange(len(symbols)), [len(df) for df in frames])
+    long.insert(1, "Symbol", pd.Categorical.from_codes(codes, categories=symbols))
+    return long
+
+
 def fetch_raw_price_data(symbol: str, days: int = fetch_price_data_days) -> pd.DataFrame:
     """
     Fetch raw, unprocessed price data for an NSE stock.
-    
+
+    Served from the same cached download as fetch_price_data().
+
     Args:
         symbol: NSE stock symbol (e.g., "RELIANCE", "TCS")
         days: Number of trading days to fetch
-    
+
     Returns:
-        DataFrame with all available columns from yfinance
+        DataFrame indexed by Date with unadjusted OHLCV, Dividends and Stock Splits
         Returns empty DataFrame if fetch fails
     """
-    return _fetch_yfinance_data(symbol, days)
\ No newline at end of file
+    raw, _ = _load_price_history(symbol, days)
+
+    if raw.empty:
+        return pd.DataFrame()
+
+    return raw.tail(days).set_index("Date")
+
+
+def fetch_split_dividend_factors(symbol: str, days: int = fetch_price_data_days) -> pd.DataFrame:
+    """
+    Fetch the cached split/dividend factor table for an NSE stock.
+
+    Args:
+        symbol: NSE stock symbol (e.g., "RELIANCE", "TCS")
+        days: Number of trading days the cache should cover
+
+    Returns:
+        DataFrame with columns: Date, Split_Ratio, Dividend, Prev_Close,
+        Split_Factor, Dividend_Factor (empty if there were no actions)
+    """
+    _, factors = _load_price_history(symbol, days)
+    return factors
+
+
+def fetch_latest_bars(symbols: List[str]) -> pd.DataFrame:
+    """
+    Fetch the most recent daily bar for many NSE stocks in one request.
+
+    During market hours the bar for today is provisional (it keeps changing
+    until the close). Used by the live monitor, so nothing is cached.
+
+    Args:
+        symbols: NSE stock symbols (e.g., ["RELIANCE", "TCS"])
+
+    Returns:
+        DataFrame indexed by symbol (input order) with columns: Date, High, Low,
+        Close, Volume. Symbols without data have NaN values.
+    """
+    tickers = [_get_ticker_symbol(s) for s in symbols]
+    result = pd.DataFrame(index=pd.Index([s.upper() for s in symbols], name="Symbol"),
+                          columns=["Date", "High", "Low", "Close", "Volume"], dtype="float64")
+    result["Date"] = pd.NaT
+
+    try:
+        df = yf.download(tickers, period="5d", interval="1d", auto_adjust=True,
+                         group_by="column", progress=False, threads=True)
+    except Exception as e:
+        print(f"Error fetching latest bars: {e}")
+        return result
+
+    if df.empty:
+        return result
+
+    closes = df["Close"].reindex(columns=tickers)
+    dates = pd.to_datetime(df.index).tz_localize(None).normalize().values
+
+    # Row of the last valid close per symbol (-1 if none), found without a Python loop
+    valid = closes.notna().to_numpy()
+    last_row = len(valid) - 1 - np.argmax(valid[::-1], axis=0)
+    has_bar = valid.any(axis=0)
+    cols = np.arange(len(tickers))
+    rows = np.where(has_bar, last_row, 0)
+
+    result["Date"] = np.where(has_bar, dates[rows], np.datetime64("NaT"))
+    for column in ("High", "Low", "Close", "Volume"):
+        values = df[column].reindex(columns=tickers).to_numpy()
+        result[column] = np.where(has_bar, values[rows, cols], np.nan)
+    return result
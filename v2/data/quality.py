@@ -0,0 +1,235 @@
+"""
+Data Quality - Vectorized validation of daily bars at ingest
+
+yfinance occasionally returns bars that break downstream indicators:
+zero-volume bars (vol_spike of 0 or inf), duplicated or stale bars and
+gaps (RSI computed over the wrong window), non-positive or inconsistent
+prices, and unadjusted splits (a one-day -50% "crash").
+
+Checks run once when bars are downloaded (price_service) and when the price
+archive is built, over whole columns at a time:
+
+- missing_sessions: NSE trading days with no bar between the first and last bar
+- non_positive_price: Open/High/Low/Close <= 0
+- zero_volume: Volume == 0 (or missing); skipped for indices, which have no volume
+- duplicate_date: more than one bar for the same date
+- stale_bar: OHLCV identical to the previous bar
+- ohlc_inconsistent: High below Open/Close or Low above Open/Close
+- split_like_jump: close-to-close move beyond SPLIT_JUMP_RATIO with no split recorded
+
+With repair=True duplicates and non-positive prices are dropped and High/Low
+are widened to contain Open/Close. Zero-volume and stale bars, gaps and
+jumps are only flagged: yfinance reports a suspended session as the previous
+OHLC with zero volume, a real session, and dropping it would open a gap in
+the rolling windows.
+Each symbol's report is stored as CACHE_DIR/quality/{TICKER}.json.
+"""
+from datetime import datetime
+from typing import Any, Dict, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from v2.data.corporate_actions import PRICE_COLUMNS
+from v2.data.local_store import read_json, store_path, write_json
+from v2.data.trading_calendar import session_index
+
+# A daily close-to-close ratio beyond this (either way) looks like a split.
+# NSE price bands cap most stocks at 20% a day, so 1.4x is well outside normal moves.
+SPLIT_JUMP_RATIO = 1.4
+
+CHECKS = [
+    "missing_sessions", "non_positive_price", "zero_volume", "duplicate_date",
+    "stale_bar", "ohlc_inconsistent", "split_like_jump",
+]
+
+# Checks whose rows are removed by repair=True
+DROPPED_CHECKS = ["non_positive_price", "duplicate_date"]
+
+# Dates listed per check in a report (counts are always complete)
+MAX_REPORTED_DATES = 20
+
+
+def flag_bars(bars: pd.DataFrame) -> pd.DataFrame:
+    """
+    Boolean flag per check for every bar.
+
+    Args:
+        bars: Date-sorted bars with Date, OHLC, Volume and optionally
+              "Stock Splits" (yfinance split ratio, 0 if none)
+
+    Returns:
+        DataFrame aligned with bars, one boolean column per row-level check,
+        plus Missing_Before: number of trading sessions missing before each bar
+    """
+    dates = pd.to_datetime(bars["Date"])
+    prices = bars[PRICE_COLUMNS].to_numpy(dtype="float64")
+    volume = bars["Volume"].to_numpy(dtype="float64")
+    close = prices[:, 3]
+
+    values = np.column_stack([prices, volume])
+    same_as_prev = np.zeros(len(bars), dtype=bool)
+    same_as_prev[1:] = np.all(values[1:] == values[:-1], axis=1)
+
+    prev_close = np.empty_like(close)
+    prev_close[:1] = np.nan
+    prev_close[1:] = close[:-1]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        ratio = close / prev_close
+    recorded_split = bars["Stock Splits"].to_numpy(dtype="float64") > 0 if "Stock Splits" in bars else False
+    jump = ((ratio >= SPLIT_JUMP_RATIO) | (ratio <= 1 / SPLIT_JUMP_RATIO)) & ~recorded_split
+
+    sessions = session_index(dates.to_numpy())
+    missing_before = np.zeros(len(bars), dtype=np.int64)
+    missing_before[1:] = np.maximum(np.diff(sessions) - 1, 0)
+
+    # Index tickers (e.g. ^NSEI) report no volume at all; only check volume when there is some
+    has_volume = bool((volume > 0).any())
+
+    return pd.DataFrame({
+        "non_positive_price": (prices <= 0).any(axis=1),
+        "zero_volume": ~(volume > 0) if has_volume else np.zeros(len(bars), dtype=bool),
+        "duplicate_date": dates.duplicated(keep="last").to_numpy(),
+        "stale_bar": same_as_prev,
+        "ohlc_inconsistent": (prices[:, 1] < np.maximum(prices[:, 0], close))
+                             | (prices[:, 2] > np.minimum(prices[:, 0], close)),
+        "split_like_jump": jump,
+        "Missing_Before": missing_before,
+    }, index=bars.index)
+
+
+def _report(ticker_symbol: str, bars: pd.DataFrame, flags: pd.DataFrame) -> Dict[str, Any]:
+    dates = pd.to_datetime(bars["Date"]).dt.strftime("%Y-%m-%d").to_numpy()
+    report = {
+        "ticker": ticker_symbol,
+        "checked_at": datetime.now().isoformat(timespec="seconds"),
+        "bars": int(len(bars)),
+        "first_date": dates[0] if len(dates) else None,
+        "last_date": dates[-1] if len(dates) else None,
+        "counts": {},
+        "dates": {},
+    }
+    for check in CHECKS:
+        if check == "missing_sessions":
+            mask = flags["Missing_Before"].to_numpy() > 0
+            report["counts"][check] = int(flags["Missing_Before"].sum())
+        else:
+            mask = flags[check].to_numpy()
+            report["counts"][check] = int(mask.sum())
+        if mask.any():
+            # For gaps, the listed date is the first bar after the gap
+            report["dates"][check] = dates[mask][:MAX_REPORTED_DATES].tolist()
+    report["clean"] = not any(report["counts"].values())
+    return report
+
+
+def validate_bars(bars: pd.DataFrame, ticker_symbol: str, repair: bool = True,
+                  save: bool = True) -> Tuple[pd.DataFrame, Dict[str, Any]]:
+    """
+    Check one symbol's bars and optionally repair them.
+
+    Args:
+        bars: Bars with Date, OHLC, Volume (and optionally Stock Splits)
+        ticker_symbol: yfinance ticker, used for the stored report
+        repair: Drop bad rows and fix High/Low (see module docstring)
+        save: Store the report under CACHE_DIR/quality
+
+    Returns:
+        (bars, report). The report describes the bars as received.
+    """
+    if bars.empty:
+        return bars, {}
+
+    bars = bars.sort_values("Date", kind="stable").reset_index(drop=True)
+    flags = flag_bars(bars)
+    report = _report(ticker_symbol, bars, flags)
+
+    if repair:
+        drop = flags[DROPPED_CHECKS].any(axis=1).to_numpy()
+        # A dropped bar that recorded a split or dividend must be kept for the factor table
+        for column in ("Stock Splits", "Dividends"):
+            if column in bars:
+                drop = drop & ~(bars[column].to_numpy(dtype="float64") > 0)
+        bars = bars[~drop].reset_index(drop=True)
+        inconsistent = flag_bars(bars)["ohlc_inconsistent"].to_numpy()
+        if inconsistent.any():
+            bars = bars.copy()
+            body_high = bars[["Open", "Close"]].max(axis=1)
+            body_low = bars[["Open", "Close"]].min(axis=1)
+            bars["High"] = np.where(inconsistent, np.maximum(bars["High"], body_high), bars["High"])
+            bars["Low"] = np.where(inconsistent, np.minimum(bars["Low"], body_low), bars["Low"])
+        report["repaired"] = {"dropped": int(drop.sum()), "high_low_fixed": int(inconsistent.sum())}
+
+    if save:
+        write_json(report, store_path("quality", f"{ticker_symbol}.json"))
+    return bars, report
+
+
+def load_quality_report(ticker_symbol: str) -> Dict[str, Any]:
+    """Stored quality report for one symbol (empty dict if never checked)."""
+    return read_json(store_path("quality", f"{ticker_symbol}.json"))
+
+
+def load_quality_summary(ticker_symbols: Sequence[str]) -> pd.DataFrame:
+    """
+    Stored reports for many symbols as one table.
+
+    Returns:
+        DataFrame indexed by ticker with bars, last_date, clean and one count column per check
+    """
+    rows = []
+    for ticker_symbol in ticker_symbols:
+        report = load_quality_report(ticker_symbol)
+        if report:
+            rows.append({"ticker": ticker_symbol, "bars": report["bars"], "last_date": report["last_date"],
+                         "clean": report["clean"], **report["counts"]})
+    return pd.DataFrame(rows, columns=["ticker", "bars", "last_date", "clean"] + CHECKS).set_index("ticker")
+
+
+def validate_panel(close: np.ndarray, volume: np.ndarray, symbols: Sequence[str],
+                   dates: Optional[np.ndarray] = None) -> pd.DataFrame:
+    """
+    Quality counts for a whole [dates x symbols] panel at once (e.g. the price archive).
+
+    Rows are trading sessions, so a NaN between a symbol's first and last bar
+    is a missing session.
+
+    Args:
+        close: [dates x symbols] closes (NaN = no bar)
+        volume: [dates x symbols] volumes
+        symbols: Column labels
+        dates: Row dates (only used to report the last valid date)
+
+    Returns:
+        DataFrame indexed by symbol with a count per check and a clean flag
+    """
+    close = np.asarray(close, dtype="float64")
+    volume = np.asarray(volume, dtype="float64")
+    has_bar = ~np.isnan(close)
+
+    # Sessions between each symbol's first and last bar that have no bar
+    n = len(close)
+    first = np.argmax(has_bar, axis=0)
+    last = n - 1 - np.argmax(has_bar[::-1], axis=0)
+    span = np.where(has_bar.any(axis=0), last - first + 1, 0)
+    missing = span - has_bar.sum(axis=0)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        previous = pd.DataFrame(close).ffill().shift(1).to_numpy()
+        ratio = close / previous
+        jumps = has_bar & ((ratio >= SPLIT_JUMP_RATIO) | (ratio <= 1 / SPLIT_JUMP_RATIO))
+        stale = np.zeros_like(has_bar)
+        stale[1:] = has_bar[1:] & (close[1:] == close[:-1]) & (volume[1:] == volume[:-1])
+
+    report = pd.DataFrame({
+        "bars": has_bar.sum(axis=0),
+        "missing_sessions": missing,
+        "non_positive_price": (has_bar & (close <= 0)).sum(axis=0),
+        "zero_volume": (has_bar & ~(volume > 0) & (volume > 0).any(axis=0)).sum(axis=0),
+        "stale_bar": stale.sum(axis=0),
+        "split_like_jump": jumps.sum(axis=0),
+    }, index=pd.Index(list(symbols), name="Symbol"))
+    if dates is not None:
+        report["last_date"] = np.where(has_bar.any(axis=0), np.asarray(dates)[last], np.datetime64("NaT"))
+    report["clean"] = report.drop(columns=["bars"] + (["last_date"] if dates is not None else [])).eq(0).all(axis=1)
+    return report
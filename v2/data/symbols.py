@@ -0,0 +1,34 @@
+"""
+Symbols - Conversion between user-entered symbols and yfinance tickers
+
+NSE stocks need the .NS suffix for yfinance; a short list of common US
+stocks is passed through as-is.
+"""
+
+# Common US stocks - don't add suffix
+US_STOCKS = ["AAPL", "MSFT", "GOOGL", "GOOG", "AMZN", "NVDA", "META", "TSLA", "IBM", "NFLX"]
+
+
+def to_ticker_symbol(symbol: str) -> str:
+    """
+    Convert symbol to yfinance format.
+    NSE stocks need .NS suffix, US stocks use as-is.
+    """
+    symbol = symbol.upper().strip()
+    # If already has suffix, or is an index (e.g. ^NSEI), return as-is
+    if symbol.endswith(".NS") or symbol.endswith(".BSE") or symbol.startswith("^"):
+        return symbol
+    if symbol in US_STOCKS:
+        return symbol
+    # Assume NSE stock, add .NS suffix
+    return f"{symbol}.NS"
+
+
+def is_us_stock(symbol: str) -> bool:
+    """
+    Check if a symbol is a US stock (for Alpha Vantage compatibility).
+    """
+    symbol = symbol.upper().strip()
+    if symbol.endswith(".NS") or symbol.endswith(".BSE"):
+        return False
+    return symbol in US_STOCKS
@@ -0,0 +1,203 @@
+"""
+Trading Calendar - NSE trading days for exact fetch windows and offsets
+
+Trading days are weekdays that are not listed in nse_holidays.csv (shipped
+next to this file). All functions accept a single date or an array of dates
+and use numpy's business-day routines, so whole columns of dates are
+handled in one vectorized call.
+
+Update nse_holidays.csv from the NSE holiday circular each year. Dates
+after the table's last year are treated as trading days if they fall on a
+weekday, with a warning printed once per process. "Today" is always the
+date in the market timezone, whatever the host's local time.
+"""
+import os
+from datetime import datetime, time, timedelta
+from functools import lru_cache
+from typing import Tuple
+
+import numpy as np
+import pandas as pd
+
+HOLIDAYS_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "nse_holidays.csv")
+
+# Market timezone; timestamps are converted to it before taking the date
+MARKET_TZ = "Asia/Kolkata"
+
+# Close of the regular session (market time)
+MARKET_CLOSE = time(15, 30)
+
+
+@lru_cache(maxsize=1)
+def get_holidays() -> np.ndarray:
+    """Exchange holidays as a sorted datetime64[D] array."""
+    holidays = pd.read_csv(HOLIDAYS_FILE)["Date"]
+    return np.sort(pd.to_datetime(holidays).values.astype("datetime64[D]"))
+
+
+@lru_cache(maxsize=1)
+def _calendar() -> np.busdaycalendar:
+    return np.busdaycalendar(weekmask="1111100", holidays=get_holidays())
+
+
+@lru_cache(maxsize=1)
+def holidays_known_until() -> np.datetime64:
+    """Last day covered by nse_holidays.csv (December 31 of its last year)."""
+    holidays = get_holidays()
+    if not len(holidays):
+        return np.datetime64("NaT", "D")
+    return np.datetime64(f"{pd.Timestamp(holidays[-1]).year}-12-31", "D")
+
+
+_coverage_warned = False
+
+
+def _check_coverage(days):
+    """Warn (once per process) when asked about dates the holiday table does not cover."""
+    global _coverage_warned
+    if _coverage_warned:
+        return
+    days = np.asarray(days)
+    if days.size and np.max(days) > holidays_known_until():
+        _coverage_warned = True
+        print(f"Warning: NSE holidays are only known until {holidays_known_until()}; later weekdays "
+              f"are treated as trading days. Update {HOLIDAYS_FILE} from the NSE holiday circular.")
+
+
+def market_now() -> datetime:
+    """Current time in the market timezone, as a naive datetime."""
+    return pd.Timestamp.now(tz=MARKET_TZ).tz_localize(None).to_pydatetime()
+
+
+def to_days(dates):
+    """
+    Convert dates to numpy datetime64[D] (market-local date for tz-aware input).
+
+    Args:
+        dates: date, datetime, Timestamp, string, or array-like of those
+
+    Returns:
+        datetime64[D] scalar or array
+    """
+    if np.isscalar(dates) or hasattr(dates, "isoformat"):
+        ts = pd.Timestamp(dates)
+        if ts.tz is not None:
+            ts = ts.tz_convert(MARKET_TZ).tz_localize(None)
+        return np.datetime64(ts.date(), "D")
+
+    values = pd.to_datetime(pd.Series(dates) if not isinstance(dates, pd.Series) else dates)
+    if values.dt.tz is not None:
+        values = values.dt.tz_convert(MARKET_TZ).dt.tz_localize(None)
+    return values.to_numpy().astype("datetime64[D]")
+
+
+def market_timestamps(values) -> pd.Series:
+    """
+    Timestamps as naive market-local times (the single place zones are handled).
+
+    Accepts a mix of tz-aware timestamps (any zone), naive timestamps
+    (taken as market time) and strings. Unparseable values become NaT.
+    """
+    values = pd.Series(values) if not isinstance(values, pd.Series) else values
+    if isinstance(values.dtype, pd.DatetimeTZDtype):
+        return values.dt.tz_convert(MARKET_TZ).dt.tz_localize(None)
+    if pd.api.types.is_datetime64_dtype(values.dtype):
+        return values
+
+    # Object columns (e.g. read back from the store) may mix zones; convert element-wise
+    def _local(value):
+        try:
+            ts = pd.Timestamp(value)
+        except (ValueError, TypeError):
+            return pd.NaT
+        return ts.tz_convert(MARKET_TZ).tz_localize(None) if ts.tzinfo is not None else ts
+
+    return pd.to_datetime(values.map(_local, na_action="ignore"))
+
+
+def is_trading_day(dates):
+    """True where the date is an NSE trading day."""
+    days = to_days(dates)
+    _check_coverage(days)
+    return np.is_busday(days, busdaycal=_calendar())
+
+
+def add_trading_days(dates, n, roll: str = "forward"):
+    """
+    Move dates by n trading days.
+
+    A non-trading start date is first rolled to the next (roll="forward") or
+    previous (roll="backward") trading day, so add_trading_days(d, 0) is the
+    first session on/after d.
+
+    Args:
+        dates: Date or array of dates
+        n: Trading days to add (int or array, negative moves back)
+        roll: How to treat non-trading start dates
+
+    Returns:
+        datetime64[D] scalar or array
+    """
+    result = np.busday_offset(to_days(dates), n, roll=roll, busdaycal=_calendar())
+    _check_coverage(result)
+    return result
+
+
+def trading_days_between(start, end):
+    """Number of trading days in [start, end) (vectorized)."""
+    end = to_days(end)
+    _check_coverage(end)
+    return np.busday_count(to_days(start), end, busdaycal=_calendar())
+
+
+def last_trading_day(on=None) -> np.datetime64:
+    """Most recent trading day on or before the given date (default: today in market time)."""
+    on = market_now() if on is None else on
+    return add_trading_days(on, 0, roll="backward")
+
+
+def last_completed_session(now=None) -> np.datetime64:
+    """
+    Most recent trading day whose session has closed.
+
+    Args:
+        now: Market-local time (default: current time in MARKET_TZ)
+    """
+    now = pd.Timestamp(market_now() if now is None else now)
+    day = last_trading_day(now)
+    if day == to_days(now) and now.time() < MARKET_CLOSE:
+        day = add_trading_days(day, -1)
+    return day
+
+
+def trading_sessions(start, end) -> np.ndarray:
+    """All trading days from start to end inclusive, as datetime64[D]."""
+    days = np.arange(to_days(start), to_days(end) + np.timedelta64(1, "D"), dtype="datetime64[D]")
+    _check_coverage(days[-1:])
+    return days[np.is_busday(days, busdaycal=_calendar())]
+
+
+def session_index(dates):
+    """Trading-day ordinal (sessions since 1970-01-01), usable as an integer date key."""
+    days = to_days(dates)
+    _check_coverage(days)
+    return np.busday_count(np.datetime64("1970-01-01", "D"), days, busdaycal=_calendar())
+
+
+def fetch_window(days: int, end=None) -> Tuple[datetime, datetime]:
+    """
+    Exact download window for the last `days` trading sessions.
+
+    Args:
+        days: Number of trading sessions wanted
+        end: Last calendar date to include (default: today in market time)
+
+    Returns:
+        (start, end) datetimes for yfinance, end being exclusive
+    """
+    end = market_now() if end is None else pd.Timestamp(end).to_pydatetime()
+    last_session = last_trading_day(end)
+    first_session = add_trading_days(last_session, -(max(days, 1) - 1))
+    start = pd.Timestamp(first_session).to_pydatetime()
+    end_exclusive = datetime.combine(end.date(), datetime.min.time()) + timedelta(days=1)
+    return start, end_exclusive
@@ -0,0 +1,248 @@
+"""
+Alignment - Point-in-time joins of event tables onto daily bars
+
+Earnings dates, EPS surprises and fundamentals snapshots are events with a
+timestamp; daily bars are indexed by session. To use an event as a feature
+without lookahead, every event gets the first session whose close could
+have known it (Available_From):
+
+- timestamps with a time of day are converted to market time once; an event
+  before the close of a trading day is available that session, anything at
+  or after the close (or on a holiday) from the next session
+- date-only values (midnight, e.g. a snapshot's As_Of day) carry no time, so
+  they are available `date_only_lag` sessions after their date (default 1)
+
+Events are then joined with sorted as-of joins: each bar sees the latest
+event available on or before its date, per symbol. Windows measuring the
+reaction to an event start at the last close before it was available
+(event_window_starts), so a pre-open or intraday announcement is not
+already priced into the starting close.
+
+    events = earnings_event_table(["TCS.NS", "INFY.NS"])
+    bars = asof_join(bars, events, columns=["Surprise_Pct"])            # long frames
+    surprise = asof_panel(events, archive.dates, archive.symbols, "Surprise_Pct")  # [dates x symbols]
+"""
+from typing import List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from v2.data.earnings_store import load_universe_earnings
+from v2.data.fundamentals_service import load_fundamentals_snapshot, snapshot_days
+from v2.data.trading_calendar import MARKET_CLOSE, add_trading_days, is_trading_day, market_timestamps
+
+EVENT_KEY_COLUMNS = ["Symbol", "Event_Time", "Available_From"]
+
+
+def available_from(timestamps, date_only_lag: int = 1) -> np.ndarray:
+    """
+    First session whose close can know each event (vectorized).
+
+    Args:
+        timestamps: Event timestamps (tz-aware, naive market time, or dates)
+        date_only_lag: Sessions after the date at which date-only values become known
+
+    Returns:
+        datetime64[D] array (NaT where the timestamp is missing)
+    """
+    local = market_timestamps(timestamps)
+    valid = local.notna().to_numpy()
+    result = np.full(len(local), np.datetime64("NaT"), dtype="datetime64[D]")
+    if not valid.any():
+        return result
+
+    local = local[valid]
+    days = local.to_numpy().astype("datetime64[D]")
+    seconds = (local - local.dt.normalize()).dt.total_seconds().to_numpy()
+    date_only = seconds == 0
+    before_close = seconds < MARKET_CLOSE.hour * 3600 + MARKET_CLOSE.minute * 60
+
+    # Timed events: same session if before the close on a trading day, else the next session
+    trading = is_trading_day(days)
+    lag = np.where(date_only, date_only_lag, np.where(before_close & trading, 0, 1))
+    # Counting from the last session on/before the date, +1 is the first session after it;
+    # a zero lag on a holiday must roll forward instead, never back to an earlier session
+    sessions = np.where(trading | (lag > 0), add_trading_days(days, lag, roll="backward"),
+                        add_trading_days(days, 0, roll="forward"))
+    result[valid] = sessions
+    return result
+
+
+def event_window_starts(timestamps, date_only_lag: int = 1) -> np.ndarray:
+    """
+    Session whose close starts each event's window: the one before Available_From.
+
+    Args:
+        timestamps: Event timestamps (tz-aware, naive market time, or dates)
+        date_only_lag: See available_from
+
+    Returns:
+        datetime64[D] array (NaT where the timestamp is missing)
+    """
+    starts = available_from(timestamps, date_only_lag)
+    valid = ~np.isnat(starts)
+    starts[valid] = add_trading_days(starts[valid], -1)
+    return starts
+
+
+def _plain_symbols(symbols) -> pd.Series:
+    return pd.Series(symbols, dtype="object").astype(str).str.upper().str.strip().str.removesuffix(".NS")
+
+
+def earnings_event_table(ticker_symbols: Sequence[str]) -> pd.DataFrame:
+    """
+    Reported earnings for a universe from the local earnings store (no network calls).
+
+    Returns:
+        DataFrame sorted by Available_From with Symbol (plain NSE symbol),
+        Event_Time (market time), Available_From, EPS_Estimate, EPS_Reported
+        and Surprise_Pct. Announced-but-not-reported rows are excluded.
+    """
+    stored = load_universe_earnings(list(ticker_symbols))
+    events = pd.DataFrame({
+        "Symbol": _plain_symbols(stored["Ticker"]).to_numpy(),
+        "Event_Time": market_timestamps(stored["Date"]).to_numpy(),
+        "Available_From": available_from(stored["Date"]),
+    })
+    for column in ("EPS_Estimate", "EPS_Reported", "Surprise_Pct"):
+        events[column] = pd.to_numeric(stored.get(column), errors="coerce").to_numpy(dtype="float64")
+    events = events[events["EPS_Reported"].notna() & events["Available_From"].notna()]
+    return events.sort_values("Available_From", kind="stable").reset_index(drop=True)
+
+
+def fundamentals_event_table(fields: Optional[List[str]] = None, start=None) -> pd.DataFrame:
+    """
+    Every stored fundamentals snapshot as point-in-time events.
+
+    A snapshot row fetched on day D is available from the next session.
+
+    Args:
+        fields: Snapshot columns to keep (default: all)
+        start: Skip snapshots before this date
+
+    Returns:
+        DataFrame sorted by Available_From with Symbol, Event_Time, Available_From
+        and the fundamentals fields
+    """
+    days = [d for d in snapshot_days() if start is None or d >= np.datetime64(pd.Timestamp(start).date(), "D")]
+    frames = []
+    for day in days:
+        snapshot = load_fundamentals_snapshot(day)
+        snapshot = snapshot[fields + ["As_Of"]] if fields else snapshot
+        frames.append(snapshot.reset_index())
+    if not frames:
+        return pd.DataFrame(columns=EVENT_KEY_COLUMNS + (fields or []))
+
+    stacked = pd.concat(frames, ignore_index=True).drop_duplicates(["Ticker", "As_Of"], keep="last")
+    events = stacked.drop(columns=["Ticker", "As_Of"])
+    events.insert(0, "Symbol", _plain_symbols(stacked["Ticker"]).to_numpy())
+    events.insert(1, "Event_Time", pd.to_datetime(stacked["As_Of"]).to_numpy())
+    events.insert(2, "Available_From", available_from(stacked["As_Of"]))
+    return events.sort_values("Available_From", kind="stable").reset_index(drop=True)
+
+
+def asof_join(left: pd.DataFrame, events: pd.DataFrame, columns: Optional[List[str]] = None,
+              on: str = "Date", by: str = "Symbol") -> pd.DataFrame:
+    """
+    Attach to each row the latest event available on or before its date.
+
+    Args:
+        left: Long frame with a date column and a symbol column (e.g. daily bars)
+        events: Event table with Symbol and Available_From (see the *_event_table functions)
+        columns: Event columns to attach (default: all non-key columns)
+        on: Date column of `left`
+        by: Symbol column of `left`
+
+    Returns:
+        `left` in its original row order with Event_Time, Available_From and the
+        event columns added (NaN/NaT where nothing was known yet)
+    """
+    columns = columns or [c for c in events.columns if c not in EVENT_KEY_COLUMNS]
+    right = events[["Symbol", "Event_Time", "Available_From"] + columns].rename(columns={"Symbol": by})
+    right = right.assign(_asof=pd.to_datetime(right["Available_From"])).sort_values("_asof", kind="stable")
+
+    keyed = left.assign(_row=np.arange(len(left)),
+                        _asof=pd.to_datetime(left[on].to_numpy().astype("datetime64[D]")))
+    keyed[by] = _plain_symbols(keyed[by]).to_numpy()
+    joined = pd.merge_asof(keyed.sort_values("_asof", kind="stable"), right,
+                           on="_asof", by=by, direction="backward", allow_exact_matches=True,
+                           suffixes=("", "_event"))
+    joined = joined.sort_values("_row").drop(columns=["_row", "_asof"])
+    joined.index = left.index
+    joined[by] = left[by].to_numpy()
+    return joined
+
+
+def asof_panel(events: pd.DataFrame, dates: np.ndarray, symbols: Sequence[str], column: str) -> np.ndarray:
+    """
+    [dates x symbols] array of the latest available value of one event column.
+
+    Vectorized with a single searchsorted over (symbol, Available_From) keys,
+    so it lines up with PriceArchive panels directly.
+
+    Args:
+        events: Event table (Symbol, Available_From, column)
+        dates: Session dates (rows), ascending
+        symbols: Column labels
+        column: Event column to spread
+
+    Returns:
+        float64 array, NaN before a symbol's first available event
+    """
+    dates = np.asarray(dates).astype("datetime64[D]").astype(np.int64)
+    positions = {s: i for i, s in enumerate(_plain_symbols(symbols))}
+    event_pos = _plain_symbols(events["Symbol"]).map(positions).to_numpy(dtype="float64")
+    event_days = pd.to_datetime(events["Available_From"]).to_numpy().astype("datetime64[D]").astype(np.int64)
+    keep = ~np.isnan(event_pos) & ~pd.isna(events["Available_From"]).to_numpy()
+    values = events[column].to_numpy(dtype="float64")[keep]
+    event_pos = event_pos[keep].astype(np.int64)
+    event_days = event_days[keep]
+
+    # One sorted key per (symbol, day); later rows win on ties, like a stable as-of join
+    base = min(dates.min(initial=0), event_days.min(initial=0))
+    span = max(dates.max(initial=0), event_days.max(initial=0)) - base + 1
+    keys = event_pos * span + (event_days - base)
+    order = np.argsort(keys, kind="stable")
+    keys, values, event_pos = keys[order], values[order], event_pos[order]
+
+    columns = np.arange(len(positions))
+    queries = columns[None, :] * span + (dates - base)[:, None]
+    if not len(keys):
+        return np.full(queries.shape, np.nan)
+    found = np.searchsorted(keys, queries, side="right") - 1
+    found_clipped = np.clip(found, 0, None)
+    valid = (found >= 0) & (event_pos[found_clipped] == columns[None, :])
+    return np.where(valid, values[found_clipped], np.nan)
+
+
+def event_window_returns(close: np.ndarray, dates: np.ndarray, symbols: Sequence[str],
+                         events: pd.DataFrame, days: int) -> np.ndarray:
+    """
+    Return around each event: from the close before it became available to
+    `days` sessions after that close.
+
+    Args:
+        close: [dates x symbols] closes (e.g. PriceArchive.get("close"))
+        dates: Session dates of the rows
+        symbols: Column labels
+        events: Event table (Symbol, Available_From)
+        days: Window length in sessions
+
+    Returns:
+        Return in percent per event row (NaN if the window is outside the panel)
+    """
+    dates = np.asarray(dates).astype("datetime64[D]")
+    positions = {s: i for i, s in enumerate(_plain_symbols(symbols))}
+    col = _plain_symbols(events["Symbol"]).map(positions).to_numpy(dtype="float64")
+    start = np.searchsorted(dates, pd.to_datetime(events["Available_From"]).to_numpy().astype("datetime64[D]"),
+                            side="left") - 1
+    end = start + days
+    valid = ~np.isnan(col) & (start >= 0) & (end < len(dates)) & events["Available_From"].notna().to_numpy()
+
+    col = np.where(valid, col, 0).astype(np.int64)
+    start = np.clip(start, 0, len(dates) - 1)
+    end = np.clip(end, 0, len(dates) - 1)
+    close = np.asarray(close, dtype="float64")
+    with np.errstate(divide="ignore", invalid="ignore"):
+        returns = (close[end, col] / close[start, col] - 1) * 100
+    return np.where(valid, returns, np.nan)
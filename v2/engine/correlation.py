@@ -0,0 +1,400 @@
+"""
+Return Correlation - Rolling correlation matrix and clusters for a universe
+
+Three "breakouts" can be one sector trade. This module keeps the rolling
+correlation of daily log returns between every pair of symbols in the price
+archive, and groups symbols that move together.
+
+RollingCorrelation holds pairwise sums over the window (counts, sums, sums
+of squares and cross products, each [symbols x symbols]). A new session is
+a rank-one update of those sums, with the session leaving the window
+subtracted the same way, so an append costs O(symbols^2) instead of a full
+recomputation. Correlations are formed from the sums one block of rows at a
+time, which bounds the temporary memory for large universes. Missing bars
+are handled pairwise: each pair uses the sessions where both have a return.
+
+Clusters come from single-linkage hierarchical clustering on the distance
+1 - correlation (a minimum spanning tree, numpy only). The matrix for the
+universe and the window state behind it are stored:
+
+    CACHE_DIR/correlation/YYYY-MM-DD.pkl    # matrix, once per trading day
+    CACHE_DIR/correlation/state.npz         # window returns and pairwise sums
+
+When the archive is rebuilt with new sessions, the stored state is advanced
+with append() one session at a time. It is rebuilt from the archive instead
+if the universe changed, or if the archive's close on the state's last
+session differs (history re-adjusted for a split or dividend).
+"""
+import os
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from v2.data.local_store import read_arrays, read_frame, store_path, write_arrays, write_frame
+from v2.data.price_archive import PriceArchive, open_price_archive
+from v2.data.trading_calendar import last_trading_day
+
+# Sessions of returns in the rolling window, and the fewest shared sessions for a pair's correlation
+DEFAULT_WINDOW = 60
+MIN_PERIODS = 40
+
+# Rows of the correlation matrix formed at a time
+BLOCK_SIZE = 512
+
+# Arrays saved by RollingCorrelation.state()
+STATE_ARRAYS = ("returns", "last_close", "count", "sum_x", "sum_xx", "cross")
+
+
+def log_returns(close: np.ndarray) -> np.ndarray:
+    """[days - 1 x symbols] log returns of a close panel (NaN where either bar is missing)."""
+    close = np.asarray(close, dtype="float64")
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.log(close[1:] / close[:-1])
+
+
+class RollingCorrelation:
+    """
+    Rolling pairwise return correlation for N symbols with incremental appends.
+
+    Args:
+        symbols: Symbol for each column
+        window: Sessions of returns in the window
+        min_periods: Fewest sessions both symbols need for a correlation
+    """
+
+    def __init__(self, symbols: Sequence[str], window: int = DEFAULT_WINDOW, min_periods: int = MIN_PERIODS):
+        self.symbols = list(symbols)
+        self.window = window
+        self.min_periods = min_periods
+        n = len(self.symbols)
+
+        self.returns = np.full((window, n), np.nan)
+        self.position = 0
+        self.last_close = np.full(n, np.nan)
+        self.last_date = np.datetime64("NaT", "D")
+        self.appends_since_build = 0
+        self._matrix: Optional[np.ndarray] = None
+        self._reset_sums()
+
+    def _reset_sums(self):
+        n = len(self.symbols)
+        # count[i, j]: sessions where both have a return; sum_x[i, j], sum_xx[i, j]: sums of
+        # i's returns (and squares) over those sessions; cross[i, j]: sum of products
+        self.count = np.zeros((n, n))
+        self.sum_x = np.zeros((n, n))
+        self.sum_xx = np.zeros((n, n))
+        self.cross = np.zeros((n, n))
+
+    def _add_rows(self, rows: np.ndarray, sign: float = 1.0):
+        """Add (or subtract) the contributions of [sessions x symbols] returns to the pairwise sums."""
+        valid = ~np.isnan(rows)
+        x = np.where(valid, rows, 0.0)
+        mask = valid.astype("float64")
+        self.count += sign * (mask.T @ mask)
+        self.sum_x += sign * (x.T @ mask)
+        self.sum_xx += sign * ((x * x).T @ mask)
+        self.cross += sign * (x.T @ x)
+
+    def build(self, close: np.ndarray, last_date=None):
+        """
+        Fill the window from a [days x symbols] close panel (the last window + 1 rows are used).
+
+        Args:
+            close: Close panel, oldest first
+            last_date: Session of the panel's last row
+        """
+        close = np.asarray(close[-(self.window + 1):], dtype="float64")
+        returns = log_returns(close) if len(close) > 1 else np.empty((0, len(self.symbols)))
+        self.returns = np.full((self.window, len(self.symbols)), np.nan)
+        self.returns[self.window - len(returns):] = returns
+        self.position = 0
+        self.last_close = close[-1] if len(close) else np.full(len(self.symbols), np.nan)
+        self.last_date = np.datetime64(last_date, "D") if last_date is not None else np.datetime64("NaT", "D")
+
+        self._reset_sums()
+        self._add_rows(self.returns)
+        self.appends_since_build = 0
+        self._matrix = None
+
+    def append(self, close: np.ndarray, date=None):
+        """
+        Slide the window by one session given each symbol's close (NaN = no bar).
+
+        A symbol without a bar today or in the previous session gets a
+        missing return (as log_returns on the panel). The sums are rebuilt
+        from the window every `window` appends so rounding errors from the
+        updates cannot accumulate.
+
+        Args:
+            close: Close per symbol
+            date: Session of the closes
+        """
+        close = np.asarray(close, dtype="float64")
+        with np.errstate(divide="ignore", invalid="ignore"):
+            new = np.log(close / self.last_close)
+        old = self.returns[self.position].copy()
+        self.returns[self.position] = new
+        self.position = (self.position + 1) % self.window
+        self.last_close = close
+        self.last_date = np.datetime64(date, "D") if date is not None else np.datetime64("NaT", "D")
+
+        self.appends_since_build += 1
+        if self.appends_since_build >= self.window:
+            self._reset_sums()
+            self._add_rows(self.returns)
+            self.appends_since_build = 0
+        else:
+            self._add_rows(old[None, :], sign=-1.0)
+            self._add_rows(new[None, :])
+        self._matrix = None
+
+    def state(self) -> Dict[str, np.ndarray]:
+        """Window, pairwise sums and position as named arrays (see from_state)."""
+        arrays = {name: getattr(self, name) for name in STATE_ARRAYS}
+        arrays["symbols"] = np.array(self.symbols, dtype=str)
+        arrays["params"] = np.array([self.window, self.min_periods, self.position, self.appends_since_build])
+        arrays["last_date"] = np.array([self.last_date], dtype="datetime64[D]")
+        return arrays
+
+    @classmethod
+    def from_state(cls, arrays: Dict[str, np.ndarray]) -> Optional["RollingCorrelation"]:
+        """Rebuild from state() output; None if the arrays are incomplete."""
+        if any(name not in arrays for name in STATE_ARRAYS + ("symbols", "params", "last_date")):
+            return None
+        window, min_periods, position, appends_since_build = (int(v) for v in arrays["params"])
+        rolling = cls(arrays["symbols"].tolist(), window, min_periods)
+        for name in STATE_ARRAYS:
+            setattr(rolling, name, np.array(arrays[name], dtype="float64"))
+        rolling.position = position
+        rolling.appends_since_build = appends_since_build
+        rolling.last_date = arrays["last_date"][0]
+        return rolling
+
+    def matrix(self) -> np.ndarray:
+        """
+        [symbols x symbols] correlation matrix (float32), computed once per window state.
+
+        NaN for pairs with fewer than min_periods shared sessions or a flat series.
+        """
+        if self._matrix is None:
+            n = len(self.symbols)
+            result = np.empty((n, n), dtype="float32")
+            for start in range(0, n, BLOCK_SIZE):
+                rows = slice(start, min(start + BLOCK_SIZE, n))
+                count = self.count[rows]
+                with np.errstate(divide="ignore", invalid="ignore"):
+                    # Pairwise means: i's over the shared sessions (rows) and j's (transposed sums)
+                    mean_i = self.sum_x[rows] / count
+                    mean_j = self.sum_x[:, rows].T / count
+                    covariance = self.cross[rows] - count * mean_i * mean_j
+                    var_i = self.sum_xx[rows] - count * mean_i ** 2
+                    var_j = self.sum_xx[:, rows].T - count * mean_j ** 2
+                    corr = covariance / np.sqrt(var_i * var_j)
+                valid = (count >= self.min_periods) & (var_i > 0) & (var_j > 0)
+                result[rows] = np.where(valid, np.clip(corr, -1.0, 1.0), np.nan)
+            diagonal = np.arange(n)
+            result[diagonal, diagonal] = np.where(np.diag(self.count) >= self.min_periods, 1.0, np.nan)
+            self._matrix = result
+        return self._matrix
+
+    def frame(self) -> pd.DataFrame:
+        """matrix() as a DataFrame with symbol index and columns."""
+        return pd.DataFrame(self.matrix(), index=pd.Index(self.symbols, name="Symbol"), columns=self.symbols)
+
+
+def most_correlated(corr: pd.DataFrame, symbol: str, k: int = 10) -> pd.Series:
+    """
+    The k symbols whose returns are most correlated with `symbol`.
+
+    Args:
+        corr: Correlation DataFrame (e.g. from load_correlation_matrix())
+        symbol: Symbol to query
+        k: Number of symbols
+
+    Returns:
+        Correlations, highest first (the symbol itself and NaN pairs excluded)
+    """
+    row = corr.loc[symbol.upper()].drop(symbol.upper()).dropna()
+    if row.empty or k <= 0:
+        return row.iloc[0:0]
+    k = min(k, len(row))
+    values = row.to_numpy()
+    top = np.argpartition(-values, k - 1)[:k]
+    return row.iloc[top].sort_values(ascending=False)
+
+
+def single_linkage(corr: pd.DataFrame) -> pd.DataFrame:
+    """
+    Single-linkage hierarchy on the distance 1 - correlation.
+
+    Built as a minimum spanning tree (Prim's algorithm, one vectorized pass per
+    symbol). Cutting every merge above a distance gives the clusters at that
+    level; pairs without a correlation are never linked.
+
+    Returns:
+        DataFrame of merges (Symbol, Linked_To, Distance) in increasing distance
+    """
+    symbols = list(corr.index)
+    n = len(symbols)
+    if n < 2:
+        return pd.DataFrame(columns=["Symbol", "Linked_To", "Distance"])
+    distance = 1.0 - corr.to_numpy(dtype="float64")
+    distance = np.where(np.isnan(distance), np.inf, distance)
+
+    in_tree = np.zeros(n, dtype=bool)
+    in_tree[0] = True
+    best = distance[0].copy()
+    parent = np.zeros(n, dtype=np.int64)
+    edges = []
+    for _ in range(n - 1):
+        best[in_tree] = np.inf
+        node = int(np.argmin(best))
+        if not np.isfinite(best[node]):
+            # Remaining symbols have no correlation to the tree; start a new component
+            node = int(np.flatnonzero(~in_tree)[0])
+        else:
+            edges.append((symbols[node], symbols[parent[node]], float(best[node])))
+        in_tree[node] = True
+        closer = distance[node] < best
+        best = np.where(closer, distance[node], best)
+        parent = np.where(closer, node, parent)
+
+    merges = pd.DataFrame(edges, columns=["Symbol", "Linked_To", "Distance"])
+    return merges.sort_values("Distance", kind="stable").reset_index(drop=True)
+
+
+def correlation_clusters(corr: pd.DataFrame, threshold: float = 0.7, min_size: int = 2) -> List[List[str]]:
+    """
+    Groups of symbols linked by correlations >= threshold (single linkage).
+
+    Args:
+        corr: Correlation DataFrame
+        threshold: Correlation needed to link two symbols
+        min_size: Smallest group returned
+
+    Returns:
+        Clusters (lists of symbols in merge order), largest first
+    """
+    symbols = list(corr.index)
+    parent = {s: s for s in symbols}
+
+    def root(s: str) -> str:
+        while parent[s] != s:
+            parent[s] = parent[parent[s]]
+            s = parent[s]
+        return s
+
+    members = {}
+    for symbol, linked_to, dist in single_linkage(corr).itertuples(index=False):
+        if dist > 1.0 - threshold:
+            break
+        a, b = root(symbol), root(linked_to)
+        parent[a] = b
+        group = members.pop(a, [a]) + members.pop(b, [b] if b != a else [])
+        members[b] = list(dict.fromkeys(group))
+
+    clusters = [group for group in members.values() if len(group) >= min_size]
+    return sorted(clusters, key=len, reverse=True)
+
+
+def cluster_labels(corr: pd.DataFrame, threshold: float = 0.7) -> pd.Series:
+    """Cluster number per symbol (clusters numbered largest first; -1 = unclustered)."""
+    labels = pd.Series(-1, index=corr.index, name="Cluster")
+    for number, group in enumerate(correlation_clusters(corr, threshold)):
+        labels[group] = number
+    return labels
+
+
+def compute_correlation(archive: Optional[PriceArchive] = None, window: int = DEFAULT_WINDOW,
+                        symbols: Optional[Sequence[str]] = None) -> RollingCorrelation:
+    """
+    Rolling correlation over the last `window` sessions of the price archive.
+
+    Args:
+        archive: Price archive (default: the shared archive)
+        window: Sessions of returns
+        symbols: Restrict to these symbols (default: every archived symbol)
+
+    Returns:
+        Built RollingCorrelation (no symbols if no archive exists)
+    """
+    archive = archive or open_price_archive()
+    if archive is None:
+        print("No price archive found. Build one with: python -m v2.batch --universe FILE --build-archive")
+        return RollingCorrelation([], window)
+
+    cols = archive.symbol_indexer(symbols)
+    names = archive.symbols[cols] if isinstance(cols, slice) else [archive.symbols[i] for i in cols]
+    rolling = RollingCorrelation(names, window, min(MIN_PERIODS, window))
+    rolling.build(archive.field("close")[-(window + 1):, cols], archive.dates[-1] if len(archive.dates) else None)
+    return rolling
+
+
+def _state_path() -> str:
+    return store_path("correlation", "state.npz")
+
+
+def update_correlation(archive: PriceArchive, window: int = DEFAULT_WINDOW) -> RollingCorrelation:
+    """
+    Advance the stored window state to the archive's last session.
+
+    Sessions the state has not seen are appended one at a time. A full
+    build() runs instead when there is no usable state: different universe
+    or window, a gap of a whole window or more, or a changed close on the
+    state's last session (the archive history was re-adjusted).
+
+    Args:
+        archive: Price archive
+        window: Sessions of returns
+
+    Returns:
+        RollingCorrelation for every archived symbol (also stored for the next update)
+    """
+    rolling = RollingCorrelation.from_state(read_arrays(_state_path()))
+    close = archive.field("close")
+    dates = archive.dates.astype("datetime64[D]")
+
+    usable = (rolling is not None and rolling.window == window and rolling.symbols == list(archive.symbols)
+              and not np.isnat(rolling.last_date))
+    if usable:
+        row = int(np.searchsorted(dates, rolling.last_date))
+        usable = (row < len(dates) and dates[row] == rolling.last_date and len(dates) - 1 - row < window
+                  and np.array_equal(close[row].astype("float64"), rolling.last_close, equal_nan=True))
+    if usable:
+        for new_row in range(row + 1, len(dates)):
+            rolling.append(close[new_row], dates[new_row])
+    else:
+        rolling = compute_correlation(archive, window)
+
+    if rolling.symbols:
+        write_arrays(rolling.state(), _state_path())
+    return rolling
+
+
+def load_correlation_matrix(refresh: bool = False) -> pd.DataFrame:
+    """
+    Today's correlation matrix for the archive universe, computed at most once per trading day.
+
+    The stored matrix is reused until the archive is rebuilt. Recomputing
+    advances the stored window state with the new sessions (update_correlation).
+
+    Args:
+        refresh: Recompute even if a matrix is stored
+
+    Returns:
+        [symbols x symbols] float32 DataFrame (empty if no archive exists)
+    """
+    archive = open_price_archive()
+    if archive is None:
+        return compute_correlation(archive).frame()
+
+    path = store_path("correlation", f"{last_trading_day()}.pkl")
+    archive_mtime = os.path.getmtime(os.path.join(archive.path, "index.json"))
+    if not refresh and os.path.exists(path) and os.path.getmtime(path) >= archive_mtime:
+        return read_frame(path)
+
+    corr = update_correlation(archive).frame()
+    if not corr.empty:
+        write_frame(corr, path)
+    return corr
@@ -0,0 +1,242 @@
+"""
+Footprint Indicators - Volume-based accumulation/distribution for a whole universe
+
+Institutional buying shows up in where volume trades relative to price, not
+just in how much of it there is. These indicators run on [days x symbols]
+panels (e.g. from PriceArchive.get), so the universe is processed in one
+pass with cumulative/rolling sums instead of one DataFrame per symbol:
+
+- VWAP: volume-weighted typical price, rolling or anchored at a row
+- OBV: on-balance volume, volume added on up closes and subtracted on down closes
+- A/D line: cumulative money-flow volume (close location within the range x volume)
+- CMF: Chaikin money flow, rolling money-flow volume / rolling volume
+- Up/down volume: rolling volume on up closes / volume on down closes
+
+IncrementalFootprint keeps the same values up to date one bar at a time
+(see engine/incremental.py).
+"""
+from typing import Dict, Optional
+
+import numpy as np
+
+from v2.engine.incremental import push_window
+
+# Window of the rolling footprint columns
+FOOTPRINT_WINDOW = 20
+
+# Columns produced by footprint_columns(), available to screens
+FOOTPRINT_COLUMNS = ("vwap_20", "close_vs_vwap_pct", "obv_trend_20", "cmf_20", "up_down_volume_20")
+
+
+def _rolling_sum(panel: np.ndarray, window: int) -> np.ndarray:
+    """Rolling sum over rows; NaN until `window` rows and wherever a row in the window is missing."""
+    filled = np.vstack([np.zeros((1, panel.shape[1])), np.cumsum(np.nan_to_num(panel), axis=0)])
+    counts = np.vstack([np.zeros((1, panel.shape[1])), np.cumsum(~np.isnan(panel), axis=0)])
+    result = np.full(panel.shape, np.nan)
+    if len(panel) >= window:
+        sums = filled[window:] - filled[:-window]
+        full = (counts[window:] - counts[:-window]) == window
+        result[window - 1:] = np.where(full, sums, np.nan)
+    return result
+
+
+def _price_direction(close: np.ndarray) -> np.ndarray:
+    """+1 / -1 / 0 for an up / down / unchanged close vs the previous row (0 without one)."""
+    direction = np.zeros(close.shape)
+    with np.errstate(invalid="ignore"):
+        direction[1:] = np.nan_to_num(np.sign(close[1:] - close[:-1]))
+    return direction
+
+
+def money_flow_volume(high: np.ndarray, low: np.ndarray, close: np.ndarray, volume: np.ndarray) -> np.ndarray:
+    """Close location within the day's range (-1..1) times volume; 0 for a zero-range bar."""
+    price_range = high - low
+    with np.errstate(divide="ignore", invalid="ignore"):
+        multiplier = np.where(price_range > 0, ((close - low) - (high - close)) / price_range, 0.0)
+    return np.where(np.isnan(close), np.nan, multiplier * volume)
+
+
+def rolling_vwap(high: np.ndarray, low: np.ndarray, close: np.ndarray, volume: np.ndarray,
+                 window: int = FOOTPRINT_WINDOW) -> np.ndarray:
+    """Rolling VWAP of the typical price (high + low + close) / 3 over `window` rows."""
+    typical = (high + low + close) / 3
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return _rolling_sum(typical * volume, window) / _rolling_sum(volume, window)
+
+
+def anchored_vwap(high: np.ndarray, low: np.ndarray, close: np.ndarray, volume: np.ndarray,
+                  anchor_rows: np.ndarray) -> np.ndarray:
+    """
+    VWAP from an anchor row per symbol (e.g. an earnings date or a breakout) onward.
+
+    Args:
+        high, low, close, volume: [days x symbols] panels
+        anchor_rows: Row index of the anchor for each symbol
+
+    Returns:
+        [days x symbols] panel, NaN before each symbol's anchor
+    """
+    typical = (high + low + close) / 3
+    cum_pv = np.vstack([np.zeros((1, close.shape[1])), np.cumsum(np.nan_to_num(typical * volume), axis=0)])
+    cum_v = np.vstack([np.zeros((1, close.shape[1])), np.cumsum(np.nan_to_num(volume), axis=0)])
+    anchor_rows = np.asarray(anchor_rows, dtype=np.int64)
+    columns = np.arange(close.shape[1])
+    with np.errstate(divide="ignore", invalid="ignore"):
+        vwap = (cum_pv[1:] - cum_pv[anchor_rows, columns]) / (cum_v[1:] - cum_v[anchor_rows, columns])
+    rows = np.arange(len(close))[:, None]
+    return np.where(rows >= anchor_rows[None, :], vwap, np.nan)
+
+
+def on_balance_volume(close: np.ndarray, volume: np.ndarray) -> np.ndarray:
+    """OBV per symbol, starting at 0 on the first row (NaN where there is no bar)."""
+    obv = np.cumsum(np.nan_to_num(_price_direction(close) * volume), axis=0)
+    return np.where(np.isnan(close), np.nan, obv)
+
+
+def accumulation_distribution(high: np.ndarray, low: np.ndarray, close: np.ndarray,
+                              volume: np.ndarray) -> np.ndarray:
+    """Accumulation/distribution line (cumulative money-flow volume)."""
+    ad = np.cumsum(np.nan_to_num(money_flow_volume(high, low, close, volume)), axis=0)
+    return np.where(np.isnan(close), np.nan, ad)
+
+
+def chaikin_money_flow(high: np.ndarray, low: np.ndarray, close: np.ndarray, volume: np.ndarray,
+                       window: int = FOOTPRINT_WINDOW) -> np.ndarray:
+    """Chaikin money flow (-1..1): rolling money-flow volume / rolling volume."""
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return _rolling_sum(money_flow_volume(high, low, close, volume), window) / _rolling_sum(volume, window)
+
+
+def up_down_volume_ratio(close: np.ndarray, volume: np.ndarray, window: int = FOOTPRINT_WINDOW) -> np.ndarray:
+    """Rolling volume on up closes / volume on down closes (inf if nothing closed down)."""
+    direction = _price_direction(close)
+    volume = np.where(np.isnan(close), np.nan, volume)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return (_rolling_sum(np.where(direction > 0, volume, 0.0), window)
+                / _rolling_sum(np.where(direction < 0, volume, 0.0), window))
+
+
+def footprint_columns(high: np.ndarray, low: np.ndarray, close: np.ndarray,
+                      volume: np.ndarray) -> Dict[str, np.ndarray]:
+    """
+    Latest footprint values per symbol from price panels.
+
+    Only the trailing FOOTPRINT_WINDOW + 1 rows are read, so a memmapped
+    archive slice is not loaded in full.
+
+    Returns:
+        Dictionary of FOOTPRINT_COLUMNS -> 1-D float64 array (one value per symbol)
+    """
+    rows = FOOTPRINT_WINDOW + 1
+    high, low, close, volume = (np.asarray(panel[-rows:], dtype="float64") for panel in (high, low, close, volume))
+    if len(close) < rows:
+        return {column: np.full(close.shape[1], np.nan) for column in FOOTPRINT_COLUMNS}
+
+    vwap = rolling_vwap(high, low, close, volume)[-1]
+    volume_sum = _rolling_sum(np.where(np.isnan(close), np.nan, volume), FOOTPRINT_WINDOW)[-1]
+    signed_volume = _rolling_sum(np.where(np.isnan(close), np.nan, _price_direction(close) * volume),
+                                 FOOTPRINT_WINDOW)[-1]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return {
+            "vwap_20": vwap,
+            "close_vs_vwap_pct": (close[-1] / vwap - 1) * 100,
+            "obv_trend_20": signed_volume / volume_sum,
+            "cmf_20": chaikin_money_flow(high, low, close, volume)[-1],
+            "up_down_volume_20": up_down_volume_ratio(close, volume)[-1],
+        }
+
+
+class IncrementalFootprint:
+    """
+    Rolling VWAP, OBV, A/D, CMF and up/down volume state for N symbols.
+
+    Same definitions as the panel functions above (on gap-free data); the
+    previous close is each symbol's last committed close.
+    """
+
+    # Columns returned by preview()
+    COLUMNS = FOOTPRINT_COLUMNS + ("obv", "ad_line", "anchored_vwap")
+
+    def __init__(self, n_symbols: int, window: int = FOOTPRINT_WINDOW):
+        self.n_symbols = n_symbols
+        self.window = window
+
+        self.last_close = np.full(n_symbols, np.nan)
+        self.obv = np.zeros(n_symbols)
+        self.ad_line = np.zeros(n_symbols)
+        self.anchor_pv = np.zeros(n_symbols)
+        self.anchor_volume = np.zeros(n_symbols)
+        self.buffers = {name: np.full((window, n_symbols), np.nan)
+                        for name in ("pv", "volume", "mfv", "signed", "up", "down")}
+        self.sums = {name: np.zeros(n_symbols) for name in self.buffers}
+
+    def warm_up(self, highs: np.ndarray, lows: np.ndarray, closes: np.ndarray, volumes: np.ndarray):
+        """Initialise state from [days x symbols] history, oldest first."""
+        for high, low, close, volume in zip(highs, lows, closes, volumes):
+            self.commit(high, low, close, volume)
+
+    def reset_anchor(self, mask: Optional[np.ndarray] = None):
+        """Restart the anchored VWAP from the next committed bar (for masked symbols)."""
+        mask = np.ones(self.n_symbols, dtype=bool) if mask is None else mask
+        self.anchor_pv[mask] = 0.0
+        self.anchor_volume[mask] = 0.0
+
+    def _bar_values(self, high, low, close, volume) -> Dict[str, np.ndarray]:
+        direction = np.nan_to_num(np.sign(close - self.last_close))
+        return {
+            "pv": (high + low + close) / 3 * volume,
+            "volume": volume,
+            "mfv": money_flow_volume(high, low, close, volume),
+            "signed": direction * volume,
+            "up": np.where(direction > 0, volume, 0.0),
+            "down": np.where(direction < 0, volume, 0.0),
+        }
+
+    def commit(self, high: np.ndarray, low: np.ndarray, close: np.ndarray, volume: np.ndarray,
+               mask: Optional[np.ndarray] = None):
+        """
+        Append a completed bar.
+
+        Args:
+            high, low, close, volume: Values per symbol
+            mask: Only update these symbols (default: all with a valid close)
+        """
+        high, low, close, volume = (np.asarray(a, dtype="float64") for a in (high, low, close, volume))
+        mask = ~np.isnan(close) if mask is None else mask & ~np.isnan(close)
+
+        values = self._bar_values(high, low, close, volume)
+        for name, buffer in self.buffers.items():
+            push_window(buffer, self.sums[name], values[name], mask)
+
+        self.obv = np.where(mask, self.obv + np.nan_to_num(values["signed"]), self.obv)
+        self.ad_line = np.where(mask, self.ad_line + np.nan_to_num(values["mfv"]), self.ad_line)
+        self.anchor_pv = np.where(mask, self.anchor_pv + np.nan_to_num(values["pv"]), self.anchor_pv)
+        self.anchor_volume = np.where(mask, self.anchor_volume + np.nan_to_num(volume), self.anchor_volume)
+        self.last_close = np.where(mask, close, self.last_close)
+
+    def preview(self, high: np.ndarray, low: np.ndarray, close: np.ndarray,
+                volume: np.ndarray) -> Dict[str, np.ndarray]:
+        """
+        Footprint values if the given bar were the next one, without committing it.
+
+        Returns:
+            Dictionary of COLUMNS -> per-symbol array (NaN where the window is not full)
+        """
+        high, low, close, volume = (np.asarray(a, dtype="float64") for a in (high, low, close, volume))
+        values = self._bar_values(high, low, close, volume)
+        sums = {name: self.sums[name] - np.nan_to_num(buffer[0]) + values[name]
+                for name, buffer in self.buffers.items()}
+        full = ~np.isnan(self.buffers["volume"][1:]).any(axis=0) & ~np.isnan(close)
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            vwap = np.where(full, sums["pv"] / sums["volume"], np.nan)
+            return {
+                "vwap_20": vwap,
+                "close_vs_vwap_pct": (close / vwap - 1) * 100,
+                "obv_trend_20": np.where(full, sums["signed"] / sums["volume"], np.nan),
+                "cmf_20": np.where(full, sums["mfv"] / sums["volume"], np.nan),
+                "up_down_volume_20": np.where(full, sums["up"] / sums["down"], np.nan),
+                "obv": self.obv + np.nan_to_num(values["signed"]),
+                "ad_line": self.ad_line + np.nan_to_num(values["mfv"]),
+                "anchored_vwap": (self.anchor_pv + values["pv"]) / (self.anchor_volume + volume),
+            }
@@ -0,0 +1,139 @@
+"""
+Incremental Indicators - O(1) per-bar updates for a whole watchlist
+
+Keeps rolling-window state for every symbol as [window x symbols] ring
+buffers with running sums, so a new bar updates RSI, the 50-day SMA and
+the 20-day volume average with a few vector operations instead of
+recomputing a year of history.
+
+Definitions match StockAnalysisManager:
+- RSI: simple rolling mean of gains/losses over `rsi_period` closes
+- Volume spike: today's volume / 20-day average volume (including today)
+- SMA: simple moving average of closes (including today)
+"""
+from typing import Dict, Optional
+
+import numpy as np
+
+
+def push_window(buffer: np.ndarray, running_sum: np.ndarray, values: np.ndarray, mask: np.ndarray):
+    """Drop the oldest row and append values for the masked symbols, updating the running sum."""
+    oldest = buffer[0, mask]
+    running_sum[mask] += np.nan_to_num(values[mask]) - np.nan_to_num(oldest)
+    buffer[:, mask] = np.roll(buffer[:, mask], -1, axis=0)
+    buffer[-1, mask] = values[mask]
+
+
+def _rsi(avg_gain: np.ndarray, avg_loss: np.ndarray) -> np.ndarray:
+    with np.errstate(divide="ignore", invalid="ignore"):
+        rs = avg_gain / avg_loss
+        return 100 - (100 / (1 + rs))
+
+
+class IncrementalIndicators:
+    """
+    Rolling RSI, SMA and volume-spike state for N symbols.
+
+    Committed bars are final daily bars. A provisional bar (today's bar
+    while the market is open) can be previewed without changing the state.
+    """
+
+    # Columns returned by preview(), available to screens evaluated on it
+    COLUMNS = ("close", "volume", "change_pct", "rsi", "rsi_prev", "sma50", "avg_volume_20", "vol_spike")
+
+    def __init__(self, n_symbols: int, rsi_period: int = 14, sma_window: int = 50, volume_window: int = 20):
+        self.n_symbols = n_symbols
+        self.rsi_period = rsi_period
+        self.sma_window = sma_window
+        self.volume_window = volume_window
+
+        self.last_close = np.full(n_symbols, np.nan)
+        self.gains = np.zeros((rsi_period, n_symbols))
+        self.losses = np.zeros((rsi_period, n_symbols))
+        self.closes = np.full((sma_window, n_symbols), np.nan)
+        self.volumes = np.full((volume_window, n_symbols), np.nan)
+        self.gain_sum = np.zeros(n_symbols)
+        self.loss_sum = np.zeros(n_symbols)
+        self.close_sum = np.zeros(n_symbols)
+        self.volume_sum = np.zeros(n_symbols)
+        self.rsi = np.full(n_symbols, np.nan)
+
+    def warm_up(self, closes: np.ndarray, volumes: np.ndarray):
+        """
+        Initialise state from history.
+
+        Args:
+            closes: [days x symbols] closing prices, oldest first
+            volumes: [days x symbols] volumes, oldest first
+        """
+        for close, volume in zip(closes, volumes):
+            self.commit(close, volume)
+
+    def _changes(self, close: np.ndarray):
+        delta = close - self.last_close
+        gain = np.where(delta > 0, delta, 0.0)
+        loss = np.where(delta < 0, -delta, 0.0)
+        return gain, loss
+
+    def commit(self, close: np.ndarray, volume: np.ndarray, mask: Optional[np.ndarray] = None):
+        """
+        Append a completed bar.
+
+        Args:
+            close: Closing price per symbol
+            volume: Volume per symbol
+            mask: Only update these symbols (default: all with a valid close)
+        """
+        close = np.asarray(close, dtype="float64")
+        volume = np.asarray(volume, dtype="float64")
+        if mask is None:
+            mask = ~np.isnan(close)
+        else:
+            mask = mask & ~np.isnan(close)
+
+        gain, loss = self._changes(close)
+        has_prev = mask & ~np.isnan(self.last_close)
+        push_window(self.gains, self.gain_sum, gain, has_prev)
+        push_window(self.losses, self.loss_sum, loss, has_prev)
+        push_window(self.closes, self.close_sum, close, mask)
+        push_window(self.volumes, self.volume_sum, volume, mask)
+
+        self.rsi = np.where(mask, _rsi(self.gain_sum / self.rsi_period, self.loss_sum / self.rsi_period), self.rsi)
+        self.last_close = np.where(mask, close, self.last_close)
+
+    def preview(self, close: np.ndarray, volume: np.ndarray) -> Dict[str, np.ndarray]:
+        """
+        Indicator values if (close, volume) were the next bar, without committing it.
+
+        Returns:
+            Dictionary of COLUMNS -> per-symbol array (NaN where there is not
+            enough history)
+        """
+        close = np.asarray(close, dtype="float64")
+        volume = np.asarray(volume, dtype="float64")
+        gain, loss = self._changes(close)
+
+        gain_sum = self.gain_sum - self.gains[0] + gain
+        loss_sum = self.loss_sum - self.losses[0] + loss
+        close_sum = self.close_sum - np.nan_to_num(self.closes[0]) + close
+        volume_sum = self.volume_sum - np.nan_to_num(self.volumes[0]) + volume
+
+        full_rsi = ~np.isnan(self.closes[-self.rsi_period:]).any(axis=0)
+        full_sma = ~np.isnan(self.closes[1:]).any(axis=0)
+        full_volume = ~np.isnan(self.volumes[1:]).any(axis=0)
+
+        avg_volume = np.where(full_volume, volume_sum / self.volume_window, np.nan)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            vol_spike = np.where(avg_volume > 0, volume / avg_volume, 0.0)
+            change_pct = (close / self.last_close - 1) * 100
+
+        return {
+            "close": close,
+            "volume": volume,
+            "change_pct": change_pct,
+            "rsi": np.where(full_rsi, _rsi(gain_sum / self.rsi_period, loss_sum / self.rsi_period), np.nan),
+            "rsi_prev": self.rsi.copy(),
+            "sma50": np.where(full_sma, close_sum / self.sma_window, np.nan),
+            "avg_volume_20": avg_volume,
+            "vol_spike": np.where(full_volume, vol_spike, np.nan),
+        }
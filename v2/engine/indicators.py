@@ -0,0 +1,93 @@
+"""
+Panel Indicators - Latest indicator values for a whole universe at once
+
+Takes [days x symbols] price and volume arrays (e.g. from PriceArchive.get)
+and returns one array per indicator with the latest value for every symbol.
+These are the columns the screen DSL evaluates against.
+
+Definitions match StockAnalysisManager and engine/incremental.py.
+"""
+from typing import Dict
+
+import numpy as np
+
+# Columns produced by indicator_columns(), available to screens
+INDICATOR_COLUMNS = (
+    "close", "volume", "rsi", "rsi_prev", "sma20", "sma50", "sma200",
+    "avg_volume_20", "vol_spike", "change_pct", "high_52w", "low_52w",
+)
+
+
+def _window_mean(panel: np.ndarray, window: int) -> np.ndarray:
+    """Mean of the last `window` rows per column; NaN if any of them is missing (like rolling().mean())."""
+    if len(panel) < window:
+        return np.full(panel.shape[1], np.nan)
+    return panel[-window:].mean(axis=0)
+
+
+def _rsi_at(close: np.ndarray, period: int, offset: int = 0) -> np.ndarray:
+    """RSI (simple average of gains/losses) ending `offset` rows before the last row."""
+    end = len(close) - offset
+    if end < period + 1:
+        return np.full(close.shape[1], np.nan)
+    delta = np.diff(close[end - period - 1:end], axis=0)
+    gain = np.where(delta > 0, delta, 0.0).mean(axis=0)
+    loss = np.where(delta < 0, -delta, 0.0).mean(axis=0)
+    # A missing bar inside the window makes the value undefined, as with rolling()
+    missing = np.isnan(delta).any(axis=0)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        rsi = 100 - (100 / (1 + gain / loss))
+    return np.where(missing, np.nan, rsi)
+
+
+def indicator_columns(high: np.ndarray, low: np.ndarray, close: np.ndarray, volume: np.ndarray,
+                      rsi_period: int = 14) -> Dict[str, np.ndarray]:
+    """
+    Latest indicator values per symbol from price panels.
+
+    Only the trailing rows each indicator needs are read, so a memmapped
+    archive slice is not loaded in full.
+
+    Args:
+        high: [days x symbols] highs, oldest first (for the 52-week high)
+        low: [days x symbols] lows, oldest first (for the 52-week low)
+        close: [days x symbols] closing prices, oldest first (NaN = no bar)
+        volume: [days x symbols] volumes, oldest first
+        rsi_period: RSI lookback
+
+    Returns:
+        Dictionary of INDICATOR_COLUMNS -> 1-D float64 array (one value per symbol)
+    """
+    high = np.asarray(high[-252:], dtype="float64")
+    low = np.asarray(low[-252:], dtype="float64")
+    close = np.asarray(close[-252:], dtype="float64")
+    volume = np.asarray(volume[-20:], dtype="float64")
+    n_symbols = close.shape[1]
+    last_close = close[-1] if len(close) else np.full(n_symbols, np.nan)
+    prev_close = close[-2] if len(close) > 1 else np.full(n_symbols, np.nan)
+    last_volume = volume[-1] if len(volume) else np.full(n_symbols, np.nan)
+
+    avg_volume = _window_mean(volume, 20)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        vol_spike = np.where(avg_volume > 0, last_volume / avg_volume, np.where(np.isnan(avg_volume), np.nan, 0.0))
+        change_pct = (last_close / prev_close - 1) * 100
+
+    # From highs and lows, as StockAnalysisManager
+    with np.errstate(all="ignore"):
+        high_52w = np.fmax.reduce(high, axis=0) if len(high) else np.full(n_symbols, np.nan)
+        low_52w = np.fmin.reduce(low, axis=0) if len(low) else np.full(n_symbols, np.nan)
+
+    return {
+        "close": last_close,
+        "volume": last_volume,
+        "rsi": _rsi_at(close, rsi_period),
+        "rsi_prev": _rsi_at(close, rsi_period, offset=1),
+        "sma20": _window_mean(close, 20),
+        "sma50": _window_mean(close, 50),
+        "sma200": _window_mean(close, 200),
+        "avg_volume_20": avg_volume,
+        "vol_spike": vol_spike,
+        "change_pct": change_pct,
+        "high_52w": high_52w,
+        "low_52w": low_52w,
+    }
@@ -0,0 +1,177 @@
+"""
+Relative Strength - Cross-sectional multi-horizon ranking for a universe
+
+Ranks every symbol in the price archive by its return over 1 week, 1, 3 and
+6 months in excess of NIFTY and of its sector index (see benchmarks.py).
+Everything is computed from the archive's [dates x symbols] close array in
+one pass, so the whole universe costs a few vector operations plus the
+shared benchmark series.
+
+The ranking table is stored once per trading day:
+
+    CACHE_DIR/relative_strength/YYYY-MM-DD.pkl
+
+and recomputed only when the archive is rebuilt.
+"""
+import os
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from v2.config import BENCHMARK_INDEX
+from v2.data.benchmarks import get_benchmark_series, sector_benchmarks
+from v2.data.fundamentals_service import load_fundamentals_snapshot
+from v2.data.local_store import read_frame, store_path, write_frame
+from v2.data.price_archive import PriceArchive, open_price_archive
+from v2.data.trading_calendar import last_trading_day
+
+# Horizon label -> trading days
+HORIZONS = {"1w": 5, "1m": 21, "3m": 63, "6m": 126}
+
+
+def horizon_returns(close: np.ndarray, horizons: Dict[str, int] = HORIZONS) -> Dict[str, np.ndarray]:
+    """
+    Percentage return over each horizon, ending at the last row.
+
+    Args:
+        close: [days x series] closes, oldest first (NaN = no bar)
+        horizons: Label -> number of trading days
+
+    Returns:
+        Label -> 1-D array of returns in percent (NaN without enough history)
+    """
+    close = np.asarray(close, dtype="float64")
+    last = close[-1]
+    returns = {}
+    with np.errstate(divide="ignore", invalid="ignore"):
+        for label, days in horizons.items():
+            if len(close) > days:
+                returns[label] = (last / close[-1 - days] - 1) * 100
+            else:
+                returns[label] = np.full(close.shape[1], np.nan)
+    return returns
+
+
+def percentile_rank(values: np.ndarray) -> np.ndarray:
+    """Percentile (0-100] of each value within the array; NaN stays NaN."""
+    return pd.Series(values).rank(pct=True).to_numpy() * 100
+
+
+def _benchmark_closes(names: List[str], dates: np.ndarray) -> np.ndarray:
+    """[dates x benchmarks] closes aligned to the archive dates (forward filled over gaps)."""
+    closes = np.full((len(dates), len(names)), np.nan)
+    for i, name in enumerate(names):
+        series = get_benchmark_series(name, len(dates) + 10)
+        if not series.empty:
+            closes[:, i] = series.reindex(dates, method="ffill").to_numpy()
+    return closes
+
+
+def compute_relative_strength(archive: Optional[PriceArchive] = None,
+                              horizons: Dict[str, int] = HORIZONS) -> pd.DataFrame:
+    """
+    Relative strength table for every symbol in the price archive.
+
+    Args:
+        archive: Archive to read (default: the shared archive)
+        horizons: Label -> number of trading days
+
+    Returns:
+        DataFrame indexed by Symbol with Sector, Sector_Index, and per horizon:
+        Ret_{h} (stock return %), Excess_{h} (vs NIFTY), Sector_Excess_{h}
+        (vs sector index), Rank_{h} (percentile of Excess_{h}); plus RS_Score,
+        the mean of the horizon ranks. Empty if no archive exists.
+    """
+    archive = archive or open_price_archive()
+    if archive is None:
+        print("No price archive found. Build one with: python -m v2.batch --universe FILE --build-archive")
+        return pd.DataFrame()
+
+    lookback = max(horizons.values()) + 1
+    rows = slice(max(0, len(archive.dates) - lookback), len(archive.dates))
+    dates = archive.dates[rows]
+    stock_returns = horizon_returns(archive.field("close")[rows], horizons)
+
+    # Sector and sector index of each symbol (symbol master, then fundamentals snapshot)
+    snapshot = load_fundamentals_snapshot()
+    sectors = pd.Series([f"{s}.NS" for s in archive.symbols]).map(
+        snapshot["sector"].astype("object") if "sector" in snapshot else {}
+    )
+    sector_index = pd.Series(sector_benchmarks(archive.symbols).to_numpy())
+
+    # One cached series per benchmark; each symbol just indexes into the benchmark returns
+    benchmarks = [BENCHMARK_INDEX] + sorted(set(sector_index.dropna()) - {BENCHMARK_INDEX})
+    benchmark_returns = horizon_returns(_benchmark_closes(benchmarks, dates), horizons)
+    position = {name: i for i, name in enumerate(benchmarks)}
+    sector_pos = sector_index.map(position).to_numpy(dtype="float64")
+    has_sector = ~np.isnan(sector_pos)
+    sector_pos = np.where(has_sector, sector_pos, 0).astype(np.int64)
+
+    table = pd.DataFrame({"Sector": sectors.to_numpy(), "Sector_Index": sector_index.to_numpy()},
+                         index=pd.Index(archive.symbols, name="Symbol"))
+    ranks = []
+    for label in horizons:
+        stock = stock_returns[label]
+        excess = stock - benchmark_returns[label][0]
+        sector_excess = np.where(has_sector, stock - benchmark_returns[label][sector_pos], np.nan)
+        table[f"Ret_{label}"] = stock
+        table[f"Excess_{label}"] = excess
+        table[f"Sector_Excess_{label}"] = sector_excess
+        table[f"Rank_{label}"] = percentile_rank(excess)
+        ranks.append(table[f"Rank_{label}"].to_numpy())
+
+    with np.errstate(invalid="ignore"):
+        table["RS_Score"] = np.nanmean(np.vstack(ranks), axis=0) if ranks else np.nan
+    return table
+
+
+def load_relative_strength(refresh: bool = False) -> pd.DataFrame:
+    """
+    Today's relative strength table, computed at most once per trading day.
+
+    The stored table is reused until the archive is rebuilt.
+
+    Args:
+        refresh: Recompute even if a table is stored
+
+    Returns:
+        Result of compute_relative_strength() (empty if no archive exists)
+    """
+    archive = open_price_archive()
+    if archive is None:
+        return compute_relative_strength(archive)
+
+    path = store_path("relative_strength", f"{last_trading_day()}.pkl")
+    archive_mtime = os.path.getmtime(os.path.join(archive.path, "index.json"))
+    if not refresh and os.path.exists(path) and os.path.getmtime(path) >= archive_mtime:
+        return read_frame(path)
+
+    table = compute_relative_strength(archive)
+    if not table.empty:
+        write_frame(table, path)
+    return table
+
+
+def top_relative_strength(table: pd.DataFrame, k: int = 20, by: str = "RS_Score") -> pd.DataFrame:
+    """
+    Top-k rows by a score column, best first.
+
+    Uses a partial sort (argpartition), so only the k winners are fully sorted.
+
+    Args:
+        table: Result of load_relative_strength()
+        k: Number of rows
+        by: Column to rank by (e.g. "RS_Score", "Excess_1m", "Sector_Excess_3m")
+
+    Returns:
+        The k best rows (rows with NaN scores are never selected)
+    """
+    scores = table[by].to_numpy(dtype="float64")
+    valid = np.flatnonzero(~np.isnan(scores))
+    if len(valid) == 0 or k <= 0:
+        return table.iloc[0:0]
+    k = min(k, len(valid))
+    top = valid[np.argpartition(-scores[valid], k - 1)[:k]]
+    top = top[np.argsort(-scores[top], kind="stable")]
+    return table.iloc[top]
@@ -0,0 +1,254 @@
+"""
+Rolling Statistics - Robust rolling baselines over [days x symbols] panels
+
+A rolling mean of volume is pulled far off by one results-day spike; the
+rolling median and MAD (median absolute deviation) are not. This module
+computes rolling median, arbitrary percentiles, MAD, mean, std and
+(robust) z-scores for every symbol at once.
+
+RollingStats keeps each symbol's window as a sorted row of a [symbols x
+window] array. Appending a bar removes the outgoing value and inserts the
+new one by shifting the values between their two positions, so every order
+statistic is then a column lookup instead of a fresh sort of the window. The
+MAD is found by binary search over the two sorted halves of the window, and
+mean and std come from running sums. The panel functions slide a RollingStats over the rows.
+
+Like rolling() in pandas, a window with a missing value (NaN) yields NaN.
+"""
+from typing import Dict, Iterable, Sequence
+
+import numpy as np
+
+# Scale that makes the MAD a consistent estimator of the standard deviation for normal data
+MAD_SCALE = 1.4826
+
+# Columns produced by baseline_columns(), available to screens
+BASELINE_COLUMNS = ("median_volume_20", "volume_robust_z_20", "volume_robust_z_50")
+
+
+def _quantile_label(q: float) -> str:
+    return "median" if q == 0.5 else f"q{round(q * 100):02d}"
+
+
+def _median_deviation(sorted_rows: np.ndarray, median: np.ndarray) -> np.ndarray:
+    """
+    Median of |x - median| per row of a row-wise sorted array, without sorting the deviations.
+
+    Deviations below the median (read right to left) and above it (read left
+    to right) are two ascending sequences; each middle order statistic of
+    their union is found by binary search on how many values come from the
+    lower one. Both middle ranks of an even window are searched together.
+    """
+    n_rows, window = sorted_rows.shape
+    half = window // 2
+    ranks = sorted({(window - 1) // 2, window // 2})
+    k = np.repeat(ranks, n_rows)
+    rows = np.tile(np.arange(n_rows), len(ranks))
+    median = np.tile(median, len(ranks))
+
+    def lower(i):
+        return median - sorted_rows[rows, np.clip(half - 1 - i, 0, window - 1)]
+
+    def upper(j):
+        return sorted_rows[rows, np.clip(half + j, 0, window - 1)] - median
+
+    # Smallest i (values taken from the lower sequence) with lower(i) >= upper(k - i)
+    lo = np.maximum(0, k + 1 - (window - half))
+    hi = np.minimum(k + 1, half)
+    with np.errstate(invalid="ignore"):
+        while (lo < hi).any():
+            mid = (lo + hi) // 2
+            larger = (mid < half) & ~(lower(mid) >= upper(k - mid))
+            active = lo < hi
+            lo = np.where(active & larger, mid + 1, lo)
+            hi = np.where(active & ~larger, mid, hi)
+        from_lower = np.where(lo > 0, lower(lo - 1), -np.inf)
+        from_upper = np.where(k - lo >= 0, upper(k - lo), -np.inf)
+    return np.maximum(from_lower, from_upper).reshape(len(ranks), n_rows).mean(axis=0)
+
+
+class RollingStats:
+    """
+    Sliding-window order statistics and moments for N symbols.
+
+    Args:
+        n_symbols: Number of columns
+        window: Window length in rows
+        quantiles: Quantiles (0..1) to report; 0.5 is reported as "median"
+        mad: Also report the median absolute deviation
+    """
+
+    def __init__(self, n_symbols: int, window: int, quantiles: Sequence[float] = (0.5,), mad: bool = True):
+        self.n_symbols = n_symbols
+        self.window = window
+        self.quantiles = tuple(quantiles)
+        self.mad = mad
+
+        # Missing values sort last as +inf and make the window incomplete
+        self.sorted = np.full((n_symbols, window), np.inf)
+        self.ring = np.full((window, n_symbols), np.nan)
+        self.position = 0
+        self.missing = np.full(n_symbols, window, dtype=np.int64)
+        self.total = np.zeros(n_symbols)
+        self.total_sq = np.zeros(n_symbols)
+        self._columns = np.arange(window)[None, :]
+
+    def warm_up(self, panel: np.ndarray):
+        """Fill the window from the last `window` rows of a [days x symbols] panel in one sort."""
+        rows = np.asarray(panel, dtype="float64")[-self.window:]
+        self.ring = np.full((self.window, self.n_symbols), np.nan)
+        self.ring[self.window - len(rows):] = rows
+        self.position = 0
+        self.sorted = np.sort(np.where(np.isnan(self.ring), np.inf, self.ring).T, axis=1)
+        self.missing = np.isnan(self.ring).sum(axis=0)
+        self.total = np.nansum(self.ring, axis=0)
+        self.total_sq = np.nansum(self.ring ** 2, axis=0)
+
+    def append(self, values: np.ndarray):
+        """Slide the window one row: drop the oldest value per symbol and insert `values`."""
+        new = np.asarray(values, dtype="float64")
+        old = self.ring[self.position].copy()
+        self.ring[self.position] = new
+        self.position = (self.position + 1) % self.window
+
+        self.missing += np.isnan(new).astype(np.int64) - np.isnan(old).astype(np.int64)
+        self.total += np.nan_to_num(new) - np.nan_to_num(old)
+        self.total_sq += np.nan_to_num(new) ** 2 - np.nan_to_num(old) ** 2
+
+        old_key = np.where(np.isnan(old), np.inf, old)[:, None]
+        new_key = np.where(np.isnan(new), np.inf, new)[:, None]
+        # Position of the outgoing value, and of the new value once the old one is removed
+        removed = np.argmax(self.sorted == old_key, axis=1)[:, None]
+        inserted = ((self.sorted < new_key).sum(axis=1) - (old_key[:, 0] < new_key[:, 0]))[:, None]
+
+        # Only the values between the two positions move, by one slot towards the removed one
+        columns = self._columns
+        updated = self.sorted.copy()
+        moves_left = (columns >= removed) & (columns < inserted)
+        moves_right = (columns > inserted) & (columns <= removed)
+        np.copyto(updated[:, :-1], self.sorted[:, 1:], where=moves_left[:, :-1])
+        np.copyto(updated[:, 1:], self.sorted[:, :-1], where=moves_right[:, 1:])
+        np.copyto(updated, new_key, where=columns == inserted)
+        self.sorted = updated
+
+    def stats(self) -> Dict[str, np.ndarray]:
+        """
+        Statistics of the current window per symbol.
+
+        Returns:
+            Dictionary with one array per quantile label ("median", "q25", ...),
+            "mean", "std" (sample) and "mad" if enabled; NaN where the window
+            is not full
+        """
+        full = self.missing == 0
+        result = {}
+        with np.errstate(invalid="ignore"):
+            for q in self.quantiles:
+                position = q * (self.window - 1)
+                lo, hi = int(np.floor(position)), int(np.ceil(position))
+                value = self.sorted[:, lo] + (self.sorted[:, hi] - self.sorted[:, lo]) * (position - lo)
+                result[_quantile_label(q)] = np.where(full, value, np.nan)
+
+            mean = self.total / self.window
+            variance = (self.total_sq - self.window * mean ** 2) / (self.window - 1)
+        result["mean"] = np.where(full, mean, np.nan)
+        result["std"] = np.where(full, np.sqrt(np.maximum(variance, 0.0)), np.nan)
+
+        if self.mad:
+            median = self.sorted[:, (self.window - 1) // 2] / 2 + self.sorted[:, self.window // 2] / 2
+            result["mad"] = np.where(full, _median_deviation(self.sorted, median), np.nan)
+        return result
+
+
+def zscore(values: np.ndarray, stats: Dict[str, np.ndarray]) -> np.ndarray:
+    """(value - mean) / std; NaN where std is 0 or missing."""
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where(stats["std"] > 0, (values - stats["mean"]) / stats["std"], np.nan)
+
+
+def robust_zscore(values: np.ndarray, stats: Dict[str, np.ndarray]) -> np.ndarray:
+    """(value - median) / (1.4826 * MAD); NaN where the MAD is 0 or missing."""
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where(stats["mad"] > 0, (values - stats["median"]) / (MAD_SCALE * stats["mad"]), np.nan)
+
+
+def rolling_stats(panel: np.ndarray, window: int, quantiles: Sequence[float] = (0.5,),
+                  mad: bool = True) -> Dict[str, np.ndarray]:
+    """
+    Rolling statistics for every row of a [days x symbols] panel.
+
+    The first window is sorted once; each later row is one RollingStats.append.
+
+    Args:
+        panel: [days x symbols] values, oldest first (NaN = missing)
+        window: Window length (the current row included, as rolling())
+        quantiles: Quantiles to report (0.5 is "median")
+        mad: Also report the MAD and the robust z-score
+
+    Returns:
+        Dictionary of statistic -> [days x symbols] array, plus "zscore" and
+        (with mad and the median) "robust_z" of each row against its window
+    """
+    panel = np.asarray(panel, dtype="float64")
+    quantiles = tuple(quantiles) if (0.5 in quantiles or not mad) else tuple(quantiles) + (0.5,)
+    roller = RollingStats(panel.shape[1], window, quantiles, mad)
+    labels = [_quantile_label(q) for q in quantiles] + ["mean", "std"] + (["mad"] if mad else [])
+    result = {label: np.full(panel.shape, np.nan) for label in labels}
+
+    if len(panel) >= window:
+        roller.warm_up(panel[:window])
+        for row in range(window - 1, len(panel)):
+            if row >= window:
+                roller.append(panel[row])
+            for label, values in roller.stats().items():
+                result[label][row] = values
+
+    result["zscore"] = zscore(panel, result)
+    if mad:
+        result["robust_z"] = robust_zscore(panel, result)
+    return result
+
+
+def robust_baselines(panel: np.ndarray, windows: Iterable[int] = (20, 50, 200)) -> Dict[str, np.ndarray]:
+    """
+    Median/MAD baseline and robust z-score of the latest row for several windows.
+
+    Only the trailing rows of each window are read.
+
+    Args:
+        panel: [days x symbols] values, oldest first (e.g. volume)
+        windows: Window lengths
+
+    Returns:
+        Dictionary with "median_{w}", "mad_{w}" and "robust_z_{w}" per window
+        (one value per symbol)
+    """
+    panel = np.asarray(panel, dtype="float64")
+    latest = panel[-1] if len(panel) else np.full(panel.shape[1], np.nan)
+    result = {}
+    for window in windows:
+        # A short history leaves NaN padding in the window, so its stats come out NaN
+        roller = RollingStats(panel.shape[1], window)
+        roller.warm_up(panel[-window:])
+        stats = roller.stats()
+        result[f"median_{window}"] = stats["median"]
+        result[f"mad_{window}"] = stats["mad"]
+        result[f"robust_z_{window}"] = robust_zscore(latest, stats)
+    return result
+
+
+def baseline_columns(volume: np.ndarray) -> Dict[str, np.ndarray]:
+    """
+    Latest robust volume baselines per symbol from a volume panel.
+
+    Only the trailing 50 rows are read.
+
+    Returns:
+        Dictionary of BASELINE_COLUMNS -> 1-D float64 array (one value per symbol)
+    """
+    baselines = robust_baselines(volume[-50:], windows=(20, 50))
+    return {
+        "median_volume_20": baselines["median_20"],
+        "volume_robust_z_20": baselines["robust_z_20"],
+        "volume_robust_z_50": baselines["robust_z_50"],
+    }
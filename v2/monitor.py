@@ -0,0 +1,194 @@
+"""
+Live Watchlist Monitor - Polls a watchlist and raises alerts as setups appear
+Entry point: python -m v2.monitor --watchlist watchlist.txt
+
+History is loaded once from the local price cache to warm up the indicator
+state. After that each poll makes a single batched request for the latest
+daily bar of every symbol and updates the indicators and footprint columns
+from that bar only (see engine/incremental.py and engine/footprint.py), so a
+300-symbol watchlist costs one request and a few vector operations per cycle.
+
+Today's bar is provisional while the market is open: it is evaluated but not
+committed. Once a session is over its bar is committed and becomes part of
+the history for the next day.
+
+Examples:
+    python -m v2.monitor --watchlist nifty500.txt --interval 60
+    python -m v2.monitor --symbols TCS INFY --sink stdout file --alerts-file alerts.jsonl
+    python -m v2.monitor --watchlist nifty500.txt --screens volume_spike "rsi < 30 and vol_spike > 2"
+    python -m v2.monitor --watchlist watchlist.txt --sink webhook --webhook-url http://localhost:9000/hook
+"""
+import argparse
+import time
+from datetime import datetime
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from v2.batch import load_universe
+from v2.config import ALERT_SCREENS, SCREENS
+from v2.data.price_service import fetch_latest_bars, fetch_price_frame_long
+from v2.data.trading_calendar import MARKET_CLOSE, market_now
+from v2.engine.footprint import IncrementalFootprint
+from v2.engine.incremental import IncrementalIndicators
+from v2.signals.alerts import AlertSink, AlertTracker, JsonlFileSink, StdoutSink, WebhookSink
+from v2.signals.screen_dsl import compile_screen
+
+SINKS = ("stdout", "file", "webhook")
+
+# Columns screens can use in the monitor
+MONITOR_COLUMNS = IncrementalIndicators.COLUMNS + IncrementalFootprint.COLUMNS
+
+
+def _bar_is_final(bar_dates: np.ndarray, now: datetime) -> np.ndarray:
+    """A bar is final once its session is over (earlier day, or today after the close)."""
+    today = np.datetime64(now.date(), "D")
+    closed_today = now.time() >= MARKET_CLOSE
+    return (bar_dates < today) | ((bar_dates == today) & closed_today)
+
+
+class WatchlistMonitor:
+    """Indicator state and alert rules for a fixed watchlist."""
+
+    def __init__(self, symbols: List[str], sinks: List[AlertSink], rules: Optional[Dict[str, str]] = None,
+                 history_days: int = 80, workers: int = 4):
+        self.symbols = [s.upper() for s in symbols]
+        self.sinks = sinks
+        self.indicators = IncrementalIndicators(len(self.symbols))
+        self.footprint = IncrementalFootprint(len(self.symbols))
+        self.tracker = AlertTracker(self.symbols, rules)
+        self.committed = np.full(len(self.symbols), np.datetime64("NaT"), dtype="datetime64[D]")
+        self._warm_up(history_days, workers)
+
+    def _warm_up(self, history_days: int, workers: int):
+        """Feed completed bars from the local price cache into the indicator state."""
+        long = fetch_price_frame_long(self.symbols, days=history_days, workers=workers)
+
+        # Today's bar may still be forming; it is handled by the first poll
+        final = _bar_is_final(long["Date"].values.astype("datetime64[D]"), market_now())
+        long = long[final]
+
+        panels = {field: long.pivot(index="Date", columns="Symbol", values=field).reindex(columns=self.symbols)
+                  for field in ("High", "Low", "Close", "Volume")}
+        closes = panels["Close"]
+        high, low, close, volume = (panels[field].to_numpy(dtype="float64")
+                                    for field in ("High", "Low", "Close", "Volume"))
+        self.indicators.warm_up(close, volume)
+        self.footprint.warm_up(high, low, close, volume)
+
+        dates = closes.index.values.astype("datetime64[D]")
+        has_bar = closes.notna().to_numpy()
+        if len(dates):
+            last_row = len(dates) - 1 - np.argmax(has_bar[::-1], axis=0)
+            self.committed = np.where(has_bar.any(axis=0), dates[last_row], np.datetime64("NaT"))
+
+        loaded = int(has_bar.any(axis=0).sum()) if len(dates) else 0
+        print(f"Monitor warmed up: {loaded}/{len(self.symbols)} symbols, {len(dates)} sessions")
+
+    def poll(self) -> List[dict]:
+        """
+        Fetch the latest bars, update indicators, evaluate rules and emit new alerts.
+
+        Returns:
+            Alerts raised in this cycle
+        """
+        bars = fetch_latest_bars(self.symbols)
+        bar_dates = bars["Date"].values.astype("datetime64[D]")
+        # Only bars newer than the last committed one carry new information
+        is_new = ~np.isnat(bar_dates) & (np.isnat(self.committed) | (bar_dates > self.committed))
+        high, low, close, volume = (np.where(is_new, bars[field].to_numpy(dtype="float64"), np.nan)
+                                    for field in ("High", "Low", "Close", "Volume"))
+
+        indicators = {**self.indicators.preview(close, volume), **self.footprint.preview(high, low, close, volume)}
+        day = bar_dates[is_new].max() if is_new.any() else None
+        # preview() still slides the windows of symbols without a new bar; their
+        # outputs are not a real session, so only symbols with a new bar can alert
+        alerts = self.tracker.evaluate(indicators, day, mask=is_new) if day is not None else []
+
+        final = is_new & _bar_is_final(bar_dates, market_now())
+        if final.any():
+            self.indicators.commit(close, volume, mask=final)
+            self.footprint.commit(high, low, close, volume, mask=final)
+            self.committed = np.where(final, bar_dates, self.committed)
+
+        for sink in self.sinks:
+            sink.emit(alerts)
+        return alerts
+
+    def run(self, interval: float, once: bool = False):
+        """Poll every `interval` seconds until interrupted."""
+        while True:
+            started = time.monotonic()
+            try:
+                alerts = self.poll()
+                print(f"[{datetime.now():%H:%M:%S}] Polled {len(self.symbols)} symbols, {len(alerts)} new alert(s)")
+            except Exception as e:
+                print(f"Error during monitor poll: {e}")
+            if once:
+                return
+            time.sleep(max(0.0, interval - (time.monotonic() - started)))
+
+
+def _make_sinks(names: List[str], alerts_file: str, webhook_url: Optional[str]) -> List[AlertSink]:
+    sinks = []
+    for name in names:
+        if name == "stdout":
+            sinks.append(StdoutSink())
+        elif name == "file":
+            sinks.append(JsonlFileSink(alerts_file))
+        elif name == "webhook":
+            sinks.append(WebhookSink(webhook_url))
+    return sinks
+
+
+def _select_rules(names: List[str]) -> Dict[str, str]:
+    """Screens to alert on, checked against the columns the monitor computes."""
+    rules = {}
+    for name in names:
+        expression = SCREENS.get(name, name)  # a configured name or an inline expression
+        unknown = compile_screen(expression).columns.difference(MONITOR_COLUMNS)
+        if unknown:
+            raise ValueError(f"Screen {name!r} uses column(s) the monitor does not compute: "
+                             f"{', '.join(sorted(unknown))}")
+        rules[name] = expression
+    return rules
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Poll a watchlist and emit alerts when signal rules fire")
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument("--watchlist", help="Watchlist file (.txt one symbol per line, or .csv)")
+    source.add_argument("--symbols", nargs="+", help="Symbols to watch")
+    parser.add_argument("--interval", type=float, default=60, help="Seconds between polls")
+    parser.add_argument("--screens", nargs="+", default=ALERT_SCREENS,
+                        help="Screens to alert on: names from config.SCREENS or inline expressions")
+    parser.add_argument("--sink", nargs="+", choices=SINKS, default=["stdout"], help="Alert destinations")
+    parser.add_argument("--alerts-file", default="alerts.jsonl", help="File for the 'file' sink")
+    parser.add_argument("--webhook-url", default=None, help="URL for the 'webhook' sink (stub if omitted)")
+    parser.add_argument("--history-days", type=int, default=80, help="Trading days used to warm up indicators")
+    parser.add_argument("--workers", type=int, default=4, help="Symbols loaded concurrently during warm-up")
+    parser.add_argument("--once", action="store_true", help="Poll once and exit")
+    args = parser.parse_args(argv)
+
+    symbols = load_universe(args.watchlist) if args.watchlist else [s.upper() for s in args.symbols]
+    if not symbols:
+        print("No symbols to monitor")
+        return
+
+    try:
+        rules = _select_rules(args.screens)
+    except ValueError as e:
+        print(f"Invalid screen: {e}")
+        return
+
+    monitor = WatchlistMonitor(symbols, _make_sinks(args.sink, args.alerts_file, args.webhook_url), rules=rules,
+                               history_days=args.history_days, workers=args.workers)
+    print(f"Monitoring {len(symbols)} symbol(s) every {args.interval:g}s -> {', '.join(args.sink)}")
+    try:
+        monitor.run(args.interval, once=args.once)
+    except KeyboardInterrupt:
+        print("Monitor stopped")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,217 @@
+"""
+Run Profiling - Opt-in CPU and memory profiling around the major stages of a run
+
+A slow run of the v2 app, dashboard.py or console.py can be network,
+pandas or Streamlit rendering. RunProfiler wraps each stage of a run
+(fetch, transform, indicators, signals, render) and records per stage and
+symbol:
+
+- wall and CPU time
+- peak traced memory above the stage's starting point (tracemalloc)
+- a cProfile profile, merged into one hotspot report for the run
+
+Profiling is off unless enabled from the app's sidebar or with the
+environment variable TRADINGTOOL_PROFILE=1. A disabled profiler's stage()
+does nothing, so the hooks can stay in place.
+
+    profiler = RunProfiler(enabled=profiling_enabled())
+    with profiler.stage("fetch", symbol):
+        df = fetch_price_data(symbol)
+    profiler.stage_summary()      # one row per stage (and symbol)
+    profiler.hotspots(top=30)     # slowest functions
+    profiler.dump("run.prof")     # open with: python -m pstats run.prof / snakeviz
+
+cProfile only sees the calling thread, and only one stage is CPU-profiled at
+a time: stages nested inside another, or running concurrently in worker
+threads, record wall/CPU time and memory only. tracemalloc is
+process-wide, so memory peaks of concurrent stages overlap.
+"""
+import cProfile
+import io
+import marshal
+import os
+import pstats
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Any, Dict, Iterator, List, Optional
+
+import pandas as pd
+
+from v2.data.local_store import store_path
+
+PROFILE_ENV = "TRADINGTOOL_PROFILE"
+
+# Stage names used by the hooks in the apps
+STAGES = ("fetch", "transform", "indicators", "signals", "render")
+
+HOTSPOT_COLUMNS = ["Function", "Location", "Calls", "Own_s", "Cumulative_s"]
+
+
+def profiling_enabled() -> bool:
+    """True if TRADINGTOOL_PROFILE is set to 1/true/yes/on."""
+    return os.environ.get(PROFILE_ENV, "").strip().lower() in ("1", "true", "yes", "on")
+
+
+class RunProfiler:
+    """
+    Stage timings, memory peaks and CPU profiles for one run.
+
+    Args:
+        enabled: Record anything at all (False makes stage() a no-op)
+        name: Run name, used for exported file names
+    """
+
+    def __init__(self, enabled: bool = False, name: str = "run"):
+        self.enabled = enabled
+        self.name = name
+        self.records: List[Dict[str, Any]] = []
+        self._profiles: Dict[str, List[cProfile.Profile]] = {}
+        self._lock = threading.Lock()
+        self._cpu_lock = threading.Lock()
+        self._local = threading.local()
+        self._started_tracing = False
+
+        if enabled and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracing = True
+
+    @contextmanager
+    def stage(self, name: str, symbol: Optional[str] = None) -> Iterator[None]:
+        """
+        Record one stage of the run.
+
+        Args:
+            name: Stage name (see STAGES)
+            symbol: Symbol the stage works on, if any
+        """
+        if not self.enabled:
+            yield
+            return
+
+        # Per-thread stack of open stages: a nested stage resets the tracemalloc
+        # peak, so the outer stage keeps the highest peak seen before that
+        stack = self._local.__dict__.setdefault("stack", [])
+        if stack:
+            stack[-1]["peak"] = max(stack[-1]["peak"], tracemalloc.get_traced_memory()[1])
+        current = tracemalloc.get_traced_memory()[0]
+        tracemalloc.reset_peak()
+        frame = {"start": current, "peak": current}
+        stack.append(frame)
+
+        profile = cProfile.Profile() if self._cpu_lock.acquire(blocking=False) else None
+        wall_start, cpu_start = time.perf_counter(), time.thread_time()
+        if profile is not None:
+            profile.enable()
+        try:
+            yield
+        finally:
+            if profile is not None:
+                profile.disable()
+                self._cpu_lock.release()
+            wall, cpu = time.perf_counter() - wall_start, time.thread_time() - cpu_start
+
+            frame["peak"] = max(frame["peak"], tracemalloc.get_traced_memory()[1])
+            stack.pop()
+            if stack:
+                stack[-1]["peak"] = max(stack[-1]["peak"], frame["peak"])
+
+            with self._lock:
+                self.records.append({
+                    "Stage": name,
+                    "Symbol": symbol,
+                    "Wall_s": wall,
+                    "CPU_s": cpu,
+                    "Peak_MB": (frame["peak"] - frame["start"]) / 1024 / 1024,
+                    "Profiled": profile is not None,
+                })
+                if profile is not None:
+                    self._profiles.setdefault(name, []).append(profile)
+
+    def stop(self):
+        """Stop tracemalloc if this profiler started it (the collected results are kept)."""
+        if self._started_tracing:
+            tracemalloc.stop()
+            self._started_tracing = False
+
+    def stage_summary(self, by_symbol: bool = False) -> pd.DataFrame:
+        """
+        Totals per stage (or per stage and symbol), slowest first.
+
+        Returns:
+            DataFrame with Calls, Wall_s, CPU_s (sums) and Peak_MB (max)
+        """
+        if not self.records:
+            return pd.DataFrame(columns=["Stage", "Symbol", "Calls", "Wall_s", "CPU_s", "Peak_MB"])
+        records = pd.DataFrame(self.records)
+        keys = ["Stage", "Symbol"] if by_symbol else ["Stage"]
+        summary = records.groupby(keys, dropna=False).agg(
+            Calls=("Wall_s", "size"), Wall_s=("Wall_s", "sum"), CPU_s=("CPU_s", "sum"), Peak_MB=("Peak_MB", "max"),
+        )
+        return summary.sort_values("Wall_s", ascending=False).reset_index()
+
+    def stats(self, stage: Optional[str] = None) -> Optional[pstats.Stats]:
+        """Merged cProfile statistics of all stages (or one stage); None if nothing was profiled."""
+        with self._lock:
+            profiles = [p for name, items in self._profiles.items() if stage in (None, name) for p in items]
+        if not profiles:
+            return None
+        stats = pstats.Stats(profiles[0], stream=io.StringIO())
+        for profile in profiles[1:]:
+            stats.add(profile)
+        return stats
+
+    def hotspots(self, stage: Optional[str] = None, top: int = 30, sort: str = "Cumulative_s") -> pd.DataFrame:
+        """
+        Slowest functions of the run (or of one stage).
+
+        Args:
+            stage: Stage name, or None for all stages
+            top: Number of functions
+            sort: Column to sort by ("Cumulative_s", "Own_s" or "Calls")
+
+        Returns:
+            DataFrame with HOTSPOT_COLUMNS
+        """
+        stats = self.stats(stage)
+        if stats is None:
+            return pd.DataFrame(columns=HOTSPOT_COLUMNS)
+        rows = [
+            {"Function": function, "Location": f"{os.path.basename(filename)}:{line}" if line else filename,
+             "Calls": calls, "Own_s": own, "Cumulative_s": cumulative}
+            for (filename, line, function), (_, calls, own, cumulative, _) in stats.stats.items()
+        ]
+        return pd.DataFrame(rows, columns=HOTSPOT_COLUMNS).sort_values(sort, ascending=False).head(top) \
+            .reset_index(drop=True)
+
+    def dump(self, path: Optional[str] = None, stage: Optional[str] = None) -> Optional[str]:
+        """
+        Write the merged profile in pstats format.
+
+        Args:
+            path: Output file (default: CACHE_DIR/profiles/<name>-<timestamp>.prof)
+            stage: Only this stage
+
+        Returns:
+            Path written, or None if nothing was profiled
+        """
+        stats = self.stats(stage)
+        if stats is None:
+            return None
+        path = path or store_path("profiles", f"{self.name}-{datetime.now():%Y%m%d-%H%M%S}.prof")
+        stats.dump_stats(path)
+        return path
+
+    def profile_bytes(self, stage: Optional[str] = None) -> bytes:
+        """The merged profile in pstats file format (for a download button); empty if nothing was profiled."""
+        stats = self.stats(stage)
+        return marshal.dumps(stats.stats) if stats is not None else b""
+
+    def report(self, top: int = 15) -> str:
+        """Plain-text stage summary and hotspots (for console runs)."""
+        lines = ["Stage summary:", self.stage_summary().round(3).to_string(index=False), "",
+                 f"Top {top} functions by cumulative time:",
+                 self.hotspots(top=top).round(4).to_string(index=False)]
+        return "\n".join(lines)
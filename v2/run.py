@@ -5,10 +5,13 @@ Entry point: streamlit run v2/run.py
 Detects institutional accumulation patterns in NSE stocks
 by analyzing delivery percentage relative to each stock's baseline.
 """
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
 import streamlit as st
 import pandas as pd
 
-from v2.constants.constants import popular_stocks
+from v2.api_client import get_api_client
+from v2.constants.constants import popular_stocks, earnings_fetch_workers
 from v2.data.price_service import fetch_raw_price_data, fetch_price_data
 from v2.data.earnings_service import (
     fetch_next_earnings_date,
@@ -17,6 +20,11 @@ from v2.data.earnings_service import (
     fetch_earnings_with_performance,
     fetch_all_earnings_summary
 )
+from v2.engine.relative_strength import HORIZONS, load_relative_strength, top_relative_strength
+from v2.profiling import RunProfiler, profiling_enabled
+from v2.ui.charts import CHART_RANGES, get_chart_payload, render_chart
+from v2.ui.earnings_card import render_earnings_card
+from v2.ui.profile_report import profile_sidebar_toggle, render_profile_report
 
 # Page config
 st.set_page_config(
@@ -25,15 +33,27 @@ st.set_page_config(
     layout="wide"
 )
 
+# Thin-client mode: with TRADINGTOOL_API_URL set, prices and earnings come from the
+# shared analysis API server (python -m v2.api_server) instead of direct fetches
+api_client = get_api_client()
+load_price_data = api_client.fetch_price_data if api_client else fetch_price_data
+load_earnings = api_client.fetch_earnings_with_performance if api_client else fetch_earnings_with_performance
+
 # Title
 st.title("🐋 Institutional Footprint Detector v2")
 st.caption("Detect smart money accumulation using relative delivery analysis")
+if api_client:
+    st.caption(f"Connected to analysis API at {api_client.base_url}")
 
 # Sidebar options
 with st.sidebar:
     st.header("⚙️ Options")
     show_raw_data = st.checkbox("Show Raw Data (Debug)", value=False, 
                                  help="Display unprocessed data from yfinance for debugging")
+    profile_run = profile_sidebar_toggle(profiling_enabled())
+
+# Stage hooks below are no-ops unless profiling is on
+profiler = RunProfiler(enabled=profile_run, name="v2-app")
 
 # Stock input section
 st.subheader("Select Stocks for Analysis")
@@ -60,12 +80,16 @@ if additional_stocks_str:
 st.write("---")
 
 # Main tabs - separate views for different analysis
-main_tab_analysis, main_tab_earnings = st.tabs(["📊 Stock Analysis", "📅 Earnings Calendar"])
+main_tab_analysis, main_tab_earnings, main_tab_strength = st.tabs(
+    ["📊 Stock Analysis", "📅 Earnings Calendar", "🏆 Relative Strength"]
+)
 
 # ============================================
 # TAB 1: Stock Analysis (Price Data)
 # ============================================
 with main_tab_analysis:
+    chart_range = st.radio("Chart range:", options=list(CHART_RANGES), index=2, horizontal=True)
+
     if st.button("🔍 Analyze Stocks", key="analyze_btn"):
         if all_stocks:
             st.info(f"Analyzing {len(all_stocks)} stock(s): {', '.join(all_stocks)}")
@@ -74,8 +98,8 @@ with main_tab_analysis:
             for symbol in all_stocks:
                 st.subheader(f"📈 {symbol}")
                 
-                with st.spinner(f"Fetching price data for {symbol}..."):
-                    price_df = fetch_price_data(symbol)
+                with st.spinner(f"Fetching price data for {symbol}..."), profiler.stage("fetch", symbol):
+                    price_df = load_price_data(symbol)
                 
                 if price_df.empty:
                     st.error(f"❌ Could not fetch price data for {symbol}. Check if the symbol is correct.")
@@ -88,8 +112,14 @@ with main_tab_analysis:
                             raw_df = fetch_raw_price_data(symbol)
                             st.dataframe(raw_df, use_container_width=True)
                     
-                    # Show processed price data
-                    st.dataframe(price_df, use_container_width=True)
+                    # Downsampled price/DMA, RSI and volume panels (cached per symbol and range)
+                    with profiler.stage("indicators", symbol):
+                        chart_payload = get_chart_payload(symbol, chart_range)
+
+                    # Show processed price data and the chart
+                    with profiler.stage("render", symbol):
+                        st.dataframe(price_df, use_container_width=True)
+                        render_chart(chart_payload, key=f"chart_{symbol}")
                 
                 st.write("---")
         else:
@@ -101,7 +131,7 @@ with main_tab_analysis:
 # TAB 2: Earnings Calendar (Card Style UI)
 # ============================================
 with main_tab_earnings:
-    st.caption("📌 Earnings data with stock performance vs NIFTY 50")
+    st.caption("📌 Earnings data with stock performance vs NIFTY 50 and the sector index")
     
     if st.button("📅 Fetch Earnings Data", key="earnings_btn"):
         if all_stocks:
@@ -109,95 +139,39 @@ with main_tab_earnings:
             
             progress_bar = st.progress(0)
             
-            # Fetch all earnings data
-            all_earnings = []
-            for idx, symbol in enumerate(all_stocks):
-                progress_bar.progress((idx + 1) / len(all_stocks))
-                data = fetch_earnings_with_performance(symbol, num_quarters=3)
-                all_earnings.append(data)
-            
-            progress_bar.empty()
+            # One placeholder per symbol keeps the final order stable while
+            # each card is drawn as soon as its data arrives
+            card_slots = {symbol: st.empty() for symbol in all_stocks}
+            earnings_by_symbol = {}
+
+            def load_earnings_profiled(symbol):
+                # Concurrent worker stages record time and memory; only one at a time is CPU-profiled
+                with profiler.stage("fetch", symbol):
+                    return load_earnings(symbol, 3)
             
-            # Display each stock as a card
-            for data in all_earnings:
-                symbol = data["symbol"]
-                ticker = data.get("ticker", symbol)
-                
-                # Card container
-                with st.container():
-                    # Header row
-                    col_title, col_badge = st.columns([3, 1])
-                    with col_title:
-                        st.markdown(f"### {symbol}")
-                    with col_badge:
-                        st.caption(f"NSE: {symbol}")
-                    
-                    # Next earnings and relative performance
-                    col1, col2 = st.columns(2)
-                    
-                    with col1:
-                        next_date = data.get("next_earnings")
-                        if next_date:
-                            date_str = next_date.strftime("%Y-%m-%d") if hasattr(next_date, 'strftime') else str(next_date)
-                            st.markdown(f"**Next Quarterly Earning Date:** `{date_str}`")
-                        else:
-                            st.markdown("**Next Quarterly Earning Date:** `N/A`")
-                    
-                    with col2:
-                        rel_perf = data.get("relative_performance")
-                        if rel_perf is not None:
-                            color = "green" if rel_perf >= 0 else "red"
-                            arrow = "↓" if rel_perf >= 0 else "↑"
-                            st.markdown(f"**Performance vs. NIFTY 50 (last month):** "
-                                       f"<span style='color:{color}'>{rel_perf:+.1f}% {arrow}</span>", 
-                                       unsafe_allow_html=True)
-                        else:
-                            st.markdown("**Performance vs. NIFTY 50 (last month):** `N/A`")
-                    
-                    # Earnings History Table
-                    st.markdown("#### Earnings History")
-                    
-                    history = data.get("history", [])
-                    if history:
-                        # Create table header
-                        header_cols = st.columns([2, 3, 3])
-                        with header_cols[0]:
-                            st.markdown("**EARNING DATE**")
-                        with header_cols[1]:
-                            st.markdown("**STOCK PERFORMANCE (1 WEEK)**")
-                        with header_cols[2]:
-                            st.markdown("**NIFTY 50 PERFORMANCE**")
-                        
-                        # Table rows
-                        for entry in history:
-                            row_cols = st.columns([2, 3, 3])
-                            
-                            with row_cols[0]:
-                                st.write(entry.get("date", "N/A"))
-                            
-                            with row_cols[1]:
-                                stock_perf = entry.get("stock_performance")
-                                if stock_perf is not None:
-                                    color = "green" if stock_perf >= 0 else "red"
-                                    arrow = "↓" if stock_perf >= 0 else "↑"
-                                    st.markdown(f"<span style='color:{color}'>{stock_perf:+.1f}% {arrow}</span>", 
-                                               unsafe_allow_html=True)
-                                else:
-                                    st.write("N/A")
-                            
-                            with row_cols[2]:
-                                nifty_perf = entry.get("nifty_performance")
-                                if nifty_perf is not None:
-                                    color = "green" if nifty_perf >= 0 else "red"
-                                    arrow = "↓" if nifty_perf >= 0 else "↑"
-                                    st.markdown(f"<span style='color:{color}'>{nifty_perf:+.1f}% {arrow}</span>", 
-                                               unsafe_allow_html=True)
-                                else:
-                                    st.write("N/A")
-                    else:
-                        st.write("No earnings history available")
+            with ThreadPoolExecutor(max_workers=earnings_fetch_workers) as executor:
+                futures = {
+                    executor.submit(load_earnings_profiled, symbol): symbol
+                    for symbol in all_stocks
+                }
+                for future in as_completed(futures):
+                    symbol = futures[future]
+                    try:
+                        data = future.result()
+                    except Exception as e:
+                        print(f"Error fetching earnings for {symbol}: {e}")
+                        data = {"symbol": symbol, "ticker": symbol, "next_earnings": None,
+                                "relative_performance": None, "sector_index": None,
+                                "sector_relative_performance": None, "history": []}
+                    earnings_by_symbol[symbol] = data
                     
-                    st.write("---")
+                    # Streamlit calls stay on the script thread; workers only fetch
+                    with card_slots[symbol].container(), profiler.stage("render", symbol):
+                        render_earnings_card(data)
+                    progress_bar.progress(len(earnings_by_symbol) / len(all_stocks))
+            
+            progress_bar.empty()
+            all_earnings = [earnings_by_symbol[symbol] for symbol in all_stocks]
             
             # Download summary
             summary_data = []
@@ -205,12 +179,15 @@ with main_tab_earnings:
                 row = {
                     "Symbol": data["symbol"],
                     "Next Earnings": data.get("next_earnings"),
-                    "Relative Perf vs NIFTY": data.get("relative_performance")
+                    "Relative Perf vs NIFTY": data.get("relative_performance"),
+                    "Sector Index": data.get("sector_index"),
+                    "Relative Perf vs Sector": data.get("sector_relative_performance")
                 }
                 for i, h in enumerate(data.get("history", [])[:3]):
                     row[f"Q{i+1} Date"] = h.get("date")
                     row[f"Q{i+1} Stock Perf"] = h.get("stock_performance")
                     row[f"Q{i+1} NIFTY Perf"] = h.get("nifty_performance")
+                    row[f"Q{i+1} Sector Perf"] = h.get("sector_performance")
                 summary_data.append(row)
             
             if summary_data:
@@ -226,3 +203,31 @@ with main_tab_earnings:
             st.warning("Please select or enter at least one stock symbol above.")
     else:
         st.write("👆 Select stocks above and click 'Fetch Earnings Data' to view earnings calendar.")
+
+# ============================================
+# TAB 3: Relative Strength (whole archived universe)
+# ============================================
+with main_tab_strength:
+    st.caption("📌 Returns in excess of NIFTY 50 and the sector index, ranked across the archived universe")
+
+    col_k, col_by = st.columns(2)
+    with col_k:
+        top_k = st.slider("Show top", min_value=5, max_value=100, value=20, step=5)
+    with col_by:
+        rank_by = st.selectbox(
+            "Rank by:",
+            options=["RS_Score"] + [f"Excess_{h}" for h in HORIZONS] + [f"Sector_Excess_{h}" for h in HORIZONS]
+        )
+
+    with profiler.stage("transform"):
+        strength_table = load_relative_strength()
+    if strength_table.empty:
+        st.info("No price archive yet. Build one with: python -m v2.batch --universe FILE --build-archive --days 200")
+    else:
+        top_table = top_relative_strength(strength_table, k=top_k, by=rank_by)
+        with profiler.stage("render"):
+            st.dataframe(top_table.round(2), use_container_width=True)
+        st.caption(f"Ranked {len(strength_table)} symbols. Rank columns are percentiles of the excess return vs NIFTY.")
+
+# Profile of this run (when enabled from the sidebar or TRADINGTOOL_PROFILE=1)
+render_profile_report(profiler)
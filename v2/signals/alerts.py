@@ -0,0 +1,142 @@
+"""
+Alerts - Screen rules evaluated over a watchlist and the sinks they go to
+
+Rules are named screens (v2/signals/screen_dsl.py) evaluated over the
+indicator arrays from IncrementalIndicators.preview() and
+IncrementalFootprint.preview(). The defaults are config.ALERT_SCREENS,
+which mirror the checks the dashboards already show:
+
+- volume_spike: Volume > 1.5x the 20-day average and RSI < 70 (dashboard.py)
+- bullish_reversal / bearish_reversal: RSI crossing back through 30 / 70
+  (get_smart_rsi_daily_signal)
+
+An alert is emitted when a rule becomes true for a symbol, at most once per
+trading day, so a setup that stays true does not repeat every poll.
+"""
+import json
+import os
+import sys
+from abc import ABC, abstractmethod
+from datetime import datetime
+from typing import Dict, List, Mapping, Optional, Sequence
+
+import numpy as np
+import requests
+
+from app.helpers.rsi_helper import get_smart_rsi_daily_signal
+from v2.config import ALERT_SCREENS, SCREENS
+from v2.signals.screen_dsl import compile_screen
+
+Indicators = Dict[str, np.ndarray]
+
+# Rule name -> screen expression
+DEFAULT_RULES: Dict[str, str] = {name: SCREENS[name] for name in ALERT_SCREENS}
+
+
+def _describe(rule: str, ind: Indicators, i: int) -> str:
+    if rule == "volume_spike":
+        return f"High volume (Spike: {ind['vol_spike'][i]:.2f}x) with RSI {ind['rsi'][i]:.1f}"
+    return f"{get_smart_rsi_daily_signal(ind['rsi'][i], ind['rsi_prev'][i])} ({SCREENS.get(rule, rule)})"
+
+
+class AlertTracker:
+    """Turns rule masks into alerts, firing each (rule, symbol) once per trading day."""
+
+    def __init__(self, symbols: Sequence[str], rules: Optional[Mapping[str, str]] = None):
+        self.symbols = list(symbols)
+        self.rules = {name: compile_screen(expression) for name, expression in (rules or DEFAULT_RULES).items()}
+        self.day = None
+        self.fired = {name: np.zeros(len(self.symbols), dtype=bool) for name in self.rules}
+
+    def evaluate(self, indicators: Indicators, day, mask: Optional[np.ndarray] = None) -> List[Dict]:
+        """
+        Evaluate all rules and return the new alerts.
+
+        Args:
+            indicators: Per-symbol arrays from IncrementalIndicators.preview()
+            day: Trading day of the bar being evaluated
+            mask: Symbols to evaluate (default all); others cannot fire
+
+        Returns:
+            List of alert dictionaries (empty if nothing new fired)
+        """
+        if day != self.day:
+            self.day = day
+            for fired in self.fired.values():
+                fired[:] = False
+
+        alerts = []
+        now = datetime.now().isoformat(timespec="seconds")
+        for name, screen in self.rules.items():
+            new = screen(indicators) & ~self.fired[name]
+            if mask is not None:
+                new &= mask
+            self.fired[name] |= new
+            for i in np.flatnonzero(new):
+                alerts.append({
+                    "time": now,
+                    "date": str(day),
+                    "symbol": self.symbols[i],
+                    "rule": name,
+                    "message": _describe(name, indicators, i),
+                    "close": round(float(indicators["close"][i]), 2),
+                    "rsi": round(float(indicators["rsi"][i]), 2),
+                    "vol_spike": round(float(indicators["vol_spike"][i]), 2),
+                })
+        return alerts
+
+
+class AlertSink(ABC):
+    """Destination for alerts."""
+
+    @abstractmethod
+    def emit(self, alerts: List[Dict]):
+        """Deliver the alerts raised in one poll (may be empty)."""
+
+
+class StdoutSink(AlertSink):
+    def emit(self, alerts: List[Dict]):
+        for alert in alerts:
+            print(f"[{alert['time']}] {alert['symbol']}: {alert['rule']} - {alert['message']} "
+                  f"(Close {alert['close']})", file=sys.stdout, flush=True)
+
+
+class JsonlFileSink(AlertSink):
+    """Appends one JSON object per alert to a file."""
+
+    def __init__(self, path: str):
+        self.path = path
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+    def emit(self, alerts: List[Dict]):
+        if not alerts:
+            return
+        with open(self.path, "a", encoding="utf-8") as f:
+            for alert in alerts:
+                f.write(json.dumps(alert) + "\n")
+
+
+class WebhookSink(AlertSink):
+    """
+    Posts alerts as JSON to a webhook URL.
+
+    Without a URL it only prints the payload it would send (stub mode).
+    """
+
+    def __init__(self, url: Optional[str] = None, timeout: float = 5.0):
+        self.url = url
+        self.timeout = timeout
+
+    def emit(self, alerts: List[Dict]):
+        if not alerts:
+            return
+        payload = {"alerts": alerts}
+        if not self.url:
+            print(f"[webhook stub] would POST {json.dumps(payload)}")
+            return
+        try:
+            requests.post(self.url, json=payload, timeout=self.timeout)
+        except Exception as e:
+            print(f"Error posting alerts to webhook: {e}")
@@ -0,0 +1,259 @@
+"""
+Screen DSL - Small expression language for stock screens
+
+A screen is a boolean expression over indicator columns, e.g.
+
+    vol_spike > 1.5 and rsi < 70 and close > sma50
+
+It is parsed once, compiled to a tree of NumPy operations and then applied
+to whole columns at a time, so one evaluation screens every symbol in the
+universe. Compiled screens are cached by expression text.
+
+Grammar (lowest to highest precedence):
+    expr       := or_expr
+    or_expr    := and_expr ("or" and_expr)*
+    and_expr   := not_expr ("and" not_expr)*
+    not_expr   := "not" not_expr | comparison
+    comparison := sum (("<" | "<=" | ">" | ">=" | "==" | "!=") sum)?
+    sum        := product (("+" | "-") product)*
+    product    := unary (("*" | "/") unary)*
+    unary      := "-" unary | NUMBER | NAME | "(" expr ")"
+
+Comparisons involving NaN (not enough history) are False.
+"""
+import operator
+import re
+from functools import lru_cache
+from typing import Callable, FrozenSet, List, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from v2.data.price_archive import PriceArchive, open_price_archive
+from v2.engine.footprint import footprint_columns
+from v2.engine.indicators import indicator_columns
+from v2.engine.rolling_stats import baseline_columns
+
+Columns = Mapping[str, np.ndarray]
+
+_TOKEN_RE = re.compile(r"\s*(?:(\d+\.\d*|\.\d+|\d+)|([A-Za-z_][A-Za-z0-9_]*)|(<=|>=|==|!=|[<>()+\-*/]))")
+_KEYWORDS = {"and", "or", "not"}
+
+_COMPARISONS = {
+    "<": operator.lt, "<=": operator.le, ">": operator.gt,
+    ">=": operator.ge, "==": operator.eq, "!=": operator.ne,
+}
+_ARITHMETIC = {"+": operator.add, "-": operator.sub, "*": operator.mul, "/": operator.truediv}
+
+
+class ScreenSyntaxError(ValueError):
+    """Raised when a screen expression cannot be parsed."""
+
+
+def _tokenize(expression: str) -> List[Tuple[str, str]]:
+    tokens = []
+    pos = 0
+    expression = expression.rstrip()
+    while pos < len(expression):
+        match = _TOKEN_RE.match(expression, pos)
+        if not match:
+            raise ScreenSyntaxError(f"Unexpected character at position {pos}: {expression[pos:]!r}")
+        number, name, op = match.groups()
+        if number is not None:
+            tokens.append(("num", number))
+        elif name is not None and name.lower() in _KEYWORDS:
+            tokens.append(("kw", name.lower()))
+        elif name is not None:
+            tokens.append(("name", name))
+        else:
+            tokens.append(("op", op))
+        pos = match.end()
+    return tokens
+
+
+class _Parser:
+    """Recursive-descent parser producing closures over a columns mapping."""
+
+    def __init__(self, expression: str):
+        self.expression = expression
+        self.tokens = _tokenize(expression)
+        self.pos = 0
+        self.names = set()
+
+    def _peek(self) -> Optional[Tuple[str, str]]:
+        return self.tokens[self.pos] if self.pos < len(self.tokens) else None
+
+    def _accept(self, kind: str, *values: str) -> Optional[str]:
+        token = self._peek()
+        if token and token[0] == kind and (not values or token[1] in values):
+            self.pos += 1
+            return token[1]
+        return None
+
+    def _expect(self, kind: str, value: str):
+        if self._accept(kind, value) is None:
+            found = self._peek()
+            raise ScreenSyntaxError(f"Expected {value!r} but found {found[1] if found else 'end of expression'!r} "
+                                    f"in {self.expression!r}")
+
+    def parse(self) -> Callable[[Columns], np.ndarray]:
+        if not self.tokens:
+            raise ScreenSyntaxError("Empty screen expression")
+        node = self._or()
+        if self._peek() is not None:
+            raise ScreenSyntaxError(f"Unexpected {self._peek()[1]!r} in {self.expression!r}")
+        return node
+
+    def _or(self):
+        node = self._and()
+        while self._accept("kw", "or"):
+            left, right = node, self._and()
+            node = lambda c, l=left, r=right: np.logical_or(l(c), r(c))
+        return node
+
+    def _and(self):
+        node = self._not()
+        while self._accept("kw", "and"):
+            left, right = node, self._not()
+            node = lambda c, l=left, r=right: np.logical_and(l(c), r(c))
+        return node
+
+    def _not(self):
+        if self._accept("kw", "not"):
+            inner = self._not()
+            return lambda c, i=inner: np.logical_not(i(c))
+        return self._comparison()
+
+    def _comparison(self):
+        node = self._sum()
+        op = self._accept("op", *_COMPARISONS)
+        if op:
+            left, right, func = node, self._sum(), _COMPARISONS[op]
+            node = lambda c, l=left, r=right, f=func: f(l(c), r(c))
+        return node
+
+    def _sum(self):
+        node = self._product()
+        while True:
+            op = self._accept("op", "+", "-")
+            if not op:
+                return node
+            left, right, func = node, self._product(), _ARITHMETIC[op]
+            node = lambda c, l=left, r=right, f=func: f(l(c), r(c))
+
+    def _product(self):
+        node = self._unary()
+        while True:
+            op = self._accept("op", "*", "/")
+            if not op:
+                return node
+            left, right, func = node, self._unary(), _ARITHMETIC[op]
+            node = lambda c, l=left, r=right, f=func: f(l(c), r(c))
+
+    def _unary(self):
+        if self._accept("op", "-"):
+            inner = self._unary()
+            return lambda c, i=inner: np.negative(i(c))
+        number = self._accept("num")
+        if number is not None:
+            value = float(number)
+            return lambda c, v=value: v
+        name = self._accept("name")
+        if name is not None:
+            self.names.add(name)
+            return lambda c, n=name: c[n]
+        if self._accept("op", "("):
+            node = self._or()
+            self._expect("op", ")")
+            return node
+        found = self._peek()
+        raise ScreenSyntaxError(f"Unexpected {found[1] if found else 'end of expression'!r} in {self.expression!r}")
+
+
+class Screen:
+    """A compiled screen expression."""
+
+    def __init__(self, expression: str):
+        parser = _Parser(expression)
+        self.expression = expression
+        self._evaluate = parser.parse()
+        self.columns: FrozenSet[str] = frozenset(parser.names)
+
+    def __call__(self, columns: Columns) -> np.ndarray:
+        """
+        Evaluate the screen over indicator columns.
+
+        Args:
+            columns: Mapping of column name -> 1-D array (one value per symbol)
+
+        Returns:
+            Boolean array, True where the symbol passes the screen
+        """
+        missing = self.columns.difference(columns.keys())
+        if missing:
+            raise KeyError(f"Screen {self.expression!r} uses unknown column(s): {', '.join(sorted(missing))}")
+        with np.errstate(invalid="ignore", divide="ignore"):
+            result = self._evaluate(columns)
+        return np.asarray(result, dtype=bool)
+
+    def __repr__(self) -> str:
+        return f"Screen({self.expression!r})"
+
+
+@lru_cache(maxsize=256)
+def compile_screen(expression: str) -> Screen:
+    """
+    Parse and compile a screen expression (cached by expression text).
+
+    Raises:
+        ScreenSyntaxError: If the expression is invalid
+    """
+    return Screen(expression)
+
+
+def evaluate_screens(columns: Columns, screens: Mapping[str, str],
+                     index: Optional[Sequence[str]] = None) -> pd.DataFrame:
+    """
+    Evaluate several named screens over the same indicator columns.
+
+    Args:
+        columns: Mapping of column name -> 1-D array (one value per symbol)
+        screens: Screen name -> expression (e.g. config.SCREENS)
+        index: Symbol labels for the result rows
+
+    Returns:
+        Boolean DataFrame [symbols x screens]
+
+    Example:
+        matches = evaluate_screens(cols, SCREENS, index=symbols)
+        matches.index[matches["volume_spike"]]
+    """
+    arrays = {name: compile_screen(expression)(columns) for name, expression in screens.items()}
+    return pd.DataFrame(arrays, index=index)
+
+
+def screen_archive(screens: Mapping[str, str], symbols: Optional[Sequence[str]] = None,
+                   archive: Optional[PriceArchive] = None) -> pd.DataFrame:
+    """
+    Evaluate named screens for the whole universe in the price archive.
+
+    Args:
+        screens: Screen name -> expression (e.g. config.SCREENS)
+        symbols: Restrict to these symbols (default: every archived symbol)
+        archive: Archive to read (default: the shared archive)
+
+    Returns:
+        Boolean DataFrame [symbols x screens], empty if no archive exists
+    """
+    archive = archive or open_price_archive()
+    if archive is None:
+        print("No price archive found. Build one with: python -m v2.batch --universe FILE --build-archive")
+        return pd.DataFrame(columns=list(screens), dtype=bool)
+
+    cols = archive.symbol_indexer(symbols)
+    index = archive.symbols[cols] if isinstance(cols, slice) else [archive.symbols[i] for i in cols]
+    columns = indicator_columns(*(archive.field(name)[-252:, cols] for name in ("high", "low", "close")),
+                                archive.field("volume")[-20:, cols])
+    columns.update(footprint_columns(*(archive.field(name)[-21:, cols] for name in ("high", "low", "close", "volume"))))
+    columns.update(baseline_columns(archive.field("volume")[-50:, cols]))
+    return evaluate_screens(columns, screens, index=pd.Index(index, name="Symbol"))
@@ -0,0 +1,253 @@
+"""
+Signal Threshold Sweep - Forward-return statistics for a grid of signal parameters
+Entry point: python -m v2.sweep --universe nifty500.txt
+
+The RSI period, oversold/overbought levels, volume-spike cutoff and the
+volume/SMA windows used by the screens are evaluated over history from the
+price archive. For every parameter set two signals are tested:
+
+- breakout: vol_spike > cutoff and rsi < overbought and close > sma
+  (the volume_spike / trend_breakout screens)
+- reversal: rsi crosses up through the oversold level (bullish_reversal)
+
+and the returns over the next few sessions after each signal bar are
+summarised (count, mean, median, hit rate, excess over all bars).
+
+The close and volume panels are copied once into shared memory; worker
+processes attach to that single copy and each evaluates a slice of the
+grid. Indicator panels are cached per worker by window, and the grid is
+ordered so that consecutive points reuse them.
+
+Examples:
+    python -m v2.sweep --universe nifty500.txt --days 750 --workers 8
+    python -m v2.sweep --horizons 5 10 20 --min-events 50 --output sweep.csv
+"""
+import argparse
+import itertools
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from v2.batch import load_universe
+from v2.config import SWEEP_GRID
+from v2.data.price_archive import open_price_archive
+
+SIGNALS = ("breakout", "reversal")
+DEFAULT_HORIZONS = (5, 10, 20)
+
+# Per-process state: attached panels and indicator caches
+_state: Dict[str, object] = {}
+
+
+def build_grid(grid: Dict[str, Sequence] = SWEEP_GRID) -> List[Dict[str, float]]:
+    """
+    Every combination of the grid values (oversold must be below overbought).
+
+    Points are ordered by window parameters first, so a contiguous slice of
+    the grid needs few distinct indicator panels.
+    """
+    keys = ["rsi_period", "volume_window", "sma_window", "oversold", "overbought", "vol_spike"]
+    points = []
+    for values in itertools.product(*(sorted(grid[k]) for k in keys)):
+        point = dict(zip(keys, values))
+        if point["oversold"] < point["overbought"]:
+            points.append(point)
+    return points
+
+
+def _rolling_mean(panel: np.ndarray, window: int) -> np.ndarray:
+    return pd.DataFrame(panel).rolling(window=window).mean().to_numpy()
+
+
+def _rsi_panel(close: np.ndarray, period: int) -> np.ndarray:
+    """RSI with simple rolling means of gains/losses (as StockAnalysisManager)."""
+    delta = np.full(close.shape, np.nan)
+    delta[1:] = close[1:] - close[:-1]
+    gain = _rolling_mean(np.where(delta > 0, delta, np.where(np.isnan(delta), np.nan, 0.0)), period)
+    loss = _rolling_mean(np.where(delta < 0, -delta, np.where(np.isnan(delta), np.nan, 0.0)), period)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return 100 - (100 / (1 + gain / loss))
+
+
+def _cached(kind: str, window: int) -> np.ndarray:
+    """Indicator panel for this worker, computed once per (kind, window)."""
+    cache = _state["cache"]
+    key = (kind, window)
+    if key not in cache:
+        close, volume = _state["close"], _state["volume"]
+        if kind == "rsi":
+            cache[key] = _rsi_panel(close, window)
+        elif kind == "sma":
+            cache[key] = _rolling_mean(close, window)
+        elif kind == "vol_spike":
+            average = _rolling_mean(volume, window)
+            with np.errstate(divide="ignore", invalid="ignore"):
+                cache[key] = np.where(average > 0, volume / average, np.where(np.isnan(average), np.nan, 0.0))
+    return cache[key]
+
+
+def _init_state(close: np.ndarray, volume: np.ndarray, horizons: Sequence[int]):
+    """Forward returns and baselines shared by every grid point in this process."""
+    forward = {}
+    baseline = {}
+    with np.errstate(divide="ignore", invalid="ignore"):
+        for h in horizons:
+            returns = np.full(close.shape, np.nan)
+            returns[:-h] = (close[h:] / close[:-h] - 1) * 100
+            forward[h] = returns
+            baseline[h] = float(np.nanmean(returns)) if np.isfinite(returns).any() else np.nan
+    _state.update(close=close, volume=volume, forward=forward, baseline=baseline, cache={}, reversal={})
+
+
+def _attach(blocks: Dict[str, Tuple[str, Tuple[int, int]]], horizons: Sequence[int]):
+    """Worker initializer: map the shared close/volume panels without copying them."""
+    arrays = {}
+    handles = []
+    for field, (name, shape) in blocks.items():
+        shm = shared_memory.SharedMemory(name=name)
+        handles.append(shm)
+        arrays[field] = np.ndarray(shape, dtype="float64", buffer=shm.buf)
+    _state["handles"] = handles
+    _init_state(arrays["close"], arrays["volume"], horizons)
+
+
+def _signal_stats(mask: np.ndarray) -> Dict[str, float]:
+    stats = {}
+    for h, returns in _state["forward"].items():
+        values = returns[mask & ~np.isnan(returns)]
+        n = len(values)
+        stats[f"events_{h}d"] = n
+        stats[f"mean_{h}d"] = float(values.mean()) if n else np.nan
+        stats[f"median_{h}d"] = float(np.median(values)) if n else np.nan
+        stats[f"hit_rate_{h}d"] = float((values > 0).mean() * 100) if n else np.nan
+        stats[f"excess_{h}d"] = stats[f"mean_{h}d"] - _state["baseline"][h]
+    return stats
+
+
+def evaluate_point(point: Dict[str, float]) -> List[Dict[str, float]]:
+    """
+    Forward-return statistics of both signals for one parameter set.
+
+    Returns:
+        One row per signal: the parameters, "signal" and per-horizon stats
+    """
+    rsi = _cached("rsi", int(point["rsi_period"]))
+    rsi_prev = np.full(rsi.shape, np.nan)
+    rsi_prev[1:] = rsi[:-1]
+
+    with np.errstate(invalid="ignore"):
+        breakout = ((_cached("vol_spike", int(point["volume_window"])) > point["vol_spike"])
+                    & (rsi < point["overbought"])
+                    & (_state["close"] > _cached("sma", int(point["sma_window"]))))
+        rows = [{**point, "signal": "breakout", **_signal_stats(breakout)}]
+
+        # Reversal depends on two parameters only; reuse its stats across the rest of the grid
+        key = (point["rsi_period"], point["oversold"])
+        if key not in _state["reversal"]:
+            reversal = (rsi_prev <= point["oversold"]) & (rsi > point["oversold"])
+            _state["reversal"][key] = _signal_stats(reversal)
+    rows.append({**point, "signal": "reversal", **_state["reversal"][key]})
+    return rows
+
+
+def _evaluate_chunk(points: List[Dict[str, float]]) -> List[Dict[str, float]]:
+    return [row for point in points for row in evaluate_point(point)]
+
+
+def run_sweep(close: np.ndarray, volume: np.ndarray, grid: Optional[List[Dict[str, float]]] = None,
+              horizons: Sequence[int] = DEFAULT_HORIZONS, workers: int = os.cpu_count() or 1) -> pd.DataFrame:
+    """
+    Evaluate a parameter grid over [days x symbols] price panels.
+
+    Args:
+        close: [days x symbols] closes, oldest first (NaN = no bar)
+        volume: [days x symbols] volumes
+        grid: Parameter sets (default: build_grid())
+        horizons: Forward-return horizons in sessions
+        workers: Processes; 1 evaluates in this process
+
+    Returns:
+        DataFrame with one row per (parameter set, signal)
+    """
+    grid = grid if grid is not None else build_grid()
+    close = np.ascontiguousarray(close, dtype="float64")
+    volume = np.ascontiguousarray(volume, dtype="float64")
+
+    if workers <= 1:
+        _init_state(close, volume, horizons)
+        return pd.DataFrame(_evaluate_chunk(grid))
+
+    # Contiguous slices keep each worker's indicator cache small (see build_grid ordering)
+    chunk_size = max(1, -(-len(grid) // (workers * 4)))
+    chunks = [grid[i:i + chunk_size] for i in range(0, len(grid), chunk_size)]
+
+    blocks, handles = {}, []
+    try:
+        for field, panel in (("close", close), ("volume", volume)):
+            shm = shared_memory.SharedMemory(create=True, size=max(panel.nbytes, 1))
+            handles.append(shm)
+            np.ndarray(panel.shape, dtype="float64", buffer=shm.buf)[:] = panel
+            blocks[field] = (shm.name, panel.shape)
+
+        with ProcessPoolExecutor(max_workers=workers, initializer=_attach,
+                                 initargs=(blocks, tuple(horizons))) as executor:
+            rows = [row for chunk_rows in executor.map(_evaluate_chunk, chunks) for row in chunk_rows]
+    finally:
+        for shm in handles:
+            shm.close()
+            shm.unlink()
+    return pd.DataFrame(rows)
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Sweep signal parameters and report forward-return statistics")
+    parser.add_argument("--universe", help="Universe file (default: every symbol in the price archive)")
+    parser.add_argument("--days", type=int, default=None, help="Trading days of history (default: whole archive)")
+    parser.add_argument("--horizons", type=int, nargs="+", default=list(DEFAULT_HORIZONS),
+                        help="Forward-return horizons in sessions")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="Worker processes")
+    parser.add_argument("--min-events", type=int, default=30, help="Minimum signals for a row in the summary")
+    parser.add_argument("--output", default="sweep_results.csv", help="CSV with every parameter set")
+    args = parser.parse_args(argv)
+
+    archive = open_price_archive()
+    if archive is None:
+        print("No price archive found. Build one with: python -m v2.batch --universe FILE --build-archive")
+        return
+
+    symbols = None
+    if args.universe:
+        archived = set(archive.symbols)
+        symbols = [s for s in load_universe(args.universe) if s in archived]
+        if not symbols:
+            print(f"None of the symbols in {args.universe} are in the price archive")
+            return
+
+    start = archive.dates[-args.days] if args.days and args.days < len(archive.dates) else None
+    close = archive.get("close", start=start, symbols=symbols)
+    volume = archive.get("volume", start=start, symbols=symbols)
+    grid = build_grid()
+    print(f"Sweeping {len(grid)} parameter sets over {close.shape[1]} symbols x {close.shape[0]} sessions "
+          f"with {args.workers} worker(s)")
+
+    started = time.monotonic()
+    results = run_sweep(close, volume, grid, horizons=args.horizons, workers=args.workers)
+    results.to_csv(args.output, index=False)
+    print(f"Done in {time.monotonic() - started:.1f}s -> {args.output}")
+
+    key = f"excess_{args.horizons[0]}d"
+    for signal in SIGNALS:
+        rows = results[(results["signal"] == signal) & (results[f"events_{args.horizons[0]}d"] >= args.min_events)]
+        if signal == "reversal":
+            rows = rows.drop_duplicates(["rsi_period", "oversold"])
+        print(f"\nTop {signal} parameter sets by {key} (>= {args.min_events} events):")
+        print(rows.sort_values(key, ascending=False).head(5).to_string(index=False) if not rows.empty else "  none")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,258 @@
+"""
+Charts - Downsampled plotly panels for price, DMA, RSI, volume and delivery
+
+Multi-year daily histories have thousands of bars per series; sending all of
+them to the browser for every chart makes pages with many symbols sluggish.
+Each panel is reduced to at most chart_max_points points with
+Largest-Triangle-Three-Buckets (LTTB), which keeps peaks, troughs and
+volume spikes that plain decimation would drop.
+
+Indicators are computed on the full history first, so downsampling never
+changes their values, only how many of them are drawn. Payloads are kept
+in the shared MemoryCache per (symbol, range) for the trading day:
+
+    payload = get_chart_payload("TCS", "1Y")
+    st.plotly_chart(build_figure(payload))
+"""
+from typing import Any, Dict, Optional
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from v2.constants.constants import chart_max_points
+from v2.data.memory_cache import get_memory_cache
+from v2.data.price_service import fetch_price_data
+from v2.data.trading_calendar import last_trading_day
+
+# Try importing plotly (charts fall back to st.line_chart without it)
+try:
+    import plotly.graph_objects as go
+    from plotly.subplots import make_subplots
+    PLOTLY_AVAILABLE = True
+except ImportError:
+    PLOTLY_AVAILABLE = False
+    print("plotly not installed. Charts use st.line_chart. Install with: pip install plotly")
+
+# Range label -> trading days shown (None = all cached history)
+CHART_RANGES = {"3M": 63, "6M": 126, "1Y": 252, "3Y": 756, "5Y": 1260, "Max": None}
+
+# Trading days loaded for the "Max" range
+MAX_HISTORY_DAYS = 2520
+
+# Extra history loaded before a range so the 200 DMA is defined from its first day
+WARM_UP_DAYS = 200
+
+# Panel -> series drawn in it; the first series picks the points that are kept
+PANELS = {
+    "price": ["Close", "DMA_50", "DMA_200"],
+    "rsi": ["RSI"],
+    "volume": ["Volume"],
+    "delivery": ["Delivery_Pct"],
+}
+
+
+def lttb_indices(x: np.ndarray, y: np.ndarray, threshold: int) -> np.ndarray:
+    """
+    Largest-Triangle-Three-Buckets downsampling.
+
+    Keeps the first and last points and, from each of threshold - 2 equal
+    buckets in between, the point forming the largest triangle with the
+    previously kept point and the average of the next bucket.
+
+    Args:
+        x: Ascending x values (e.g. day numbers)
+        y: Values, same length as x, no NaN
+        threshold: Maximum number of points to keep
+
+    Returns:
+        Sorted indices of the kept points (all indices if len(y) <= threshold)
+    """
+    n = len(y)
+    if threshold >= n or threshold < 3:
+        return np.arange(n)
+
+    x = np.asarray(x, dtype="float64")
+    y = np.asarray(y, dtype="float64")
+
+    # Bucket i covers [edges[i], edges[i + 1]); the first and last points are their own buckets
+    edges = np.floor(np.arange(threshold - 1) * (n - 2) / (threshold - 2)).astype(np.int64) + 1
+    edges[-1] = n - 1
+    counts = np.diff(np.append(edges, n))
+    avg_x = np.add.reduceat(x, edges) / counts
+    avg_y = np.add.reduceat(y, edges) / counts
+
+    kept = np.empty(threshold, dtype=np.int64)
+    kept[0] = 0
+    a = 0
+    for i in range(threshold - 2):
+        start, end = edges[i], edges[i + 1]
+        area = np.abs((x[a] - avg_x[i + 1]) * (y[start:end] - y[a])
+                      - (x[a] - x[start:end]) * (avg_y[i + 1] - y[a]))
+        a = start + int(np.argmax(area))
+        kept[i + 1] = a
+    kept[-1] = n - 1
+    return kept
+
+
+def downsample_series(series: pd.Series, max_points: int = chart_max_points) -> pd.Series:
+    """
+    LTTB-downsample one date-indexed series (NaN values are skipped).
+
+    Args:
+        series: Values on an ascending DatetimeIndex
+        max_points: Maximum number of points to keep
+
+    Returns:
+        The kept points of the series
+    """
+    series = series.dropna()
+    if len(series) <= max_points:
+        return series
+    days = series.index.values.astype("datetime64[D]").astype("float64")
+    return series.iloc[lttb_indices(days, series.to_numpy(dtype="float64"), max_points)]
+
+
+def add_chart_indicators(df: pd.DataFrame, rsi_period: int = 14) -> pd.DataFrame:
+    """
+    Date-indexed frame with the chart columns computed on the full history.
+
+    RSI uses simple averages of gains and losses, as StockAnalysisManager does.
+
+    Args:
+        df: Daily bars with Close, Volume and optionally Delivery_Pct, and a
+            Date column or DatetimeIndex
+
+    Returns:
+        DataFrame with Close, DMA_50, DMA_200, RSI, Volume (and Delivery_Pct)
+    """
+    if "Date" in df.columns:
+        df = df.set_index("Date")
+    index = pd.DatetimeIndex(pd.to_datetime(df.index))
+    if index.tz is not None:
+        index = index.tz_localize(None)
+    close = pd.Series(df["Close"].to_numpy(dtype="float64"), index=index)
+
+    delta = close.diff()
+    gain = delta.where(delta > 0, 0.0).rolling(window=rsi_period).mean()
+    loss = (-delta.where(delta < 0, 0.0)).rolling(window=rsi_period).mean()
+
+    frame = pd.DataFrame({
+        "Close": close,
+        "DMA_50": close.rolling(window=50).mean(),
+        "DMA_200": close.rolling(window=200).mean(),
+        "RSI": 100 - (100 / (1 + gain / loss)),
+        "Volume": df["Volume"].to_numpy(dtype="float64"),
+    }, index=index)
+    if "Delivery_Pct" in df.columns:
+        frame["Delivery_Pct"] = df["Delivery_Pct"].to_numpy(dtype="float64")
+    return frame.sort_index()
+
+
+def frame_payload(df: pd.DataFrame, days: Optional[int] = None,
+                  max_points: int = chart_max_points) -> Dict[str, Any]:
+    """
+    Downsampled chart payload from a frame of daily bars.
+
+    Args:
+        df: Daily bars (see add_chart_indicators)
+        days: Trading days to show, counted back from the last bar (None = all)
+        max_points: Maximum points per panel
+
+    Returns:
+        Dictionary with "bars" (rows in the range before downsampling) and
+        "panels": panel name -> date-indexed DataFrame of that panel's series.
+        Panels without data (e.g. no delivery column) are omitted.
+    """
+    frame = add_chart_indicators(df)
+    if days is not None:
+        frame = frame.tail(days)
+
+    panels = {}
+    for panel, columns in PANELS.items():
+        columns = [c for c in columns if c in frame.columns]
+        if not columns or frame[columns[0]].isna().all():
+            continue
+        # Every series in a panel is drawn at the points kept for its main series
+        kept = downsample_series(frame[columns[0]], max_points).index
+        panels[panel] = frame.loc[kept, columns]
+    return {"bars": len(frame), "panels": panels}
+
+
+def _build_payload(symbol: str, range_label: str, max_points: int) -> Dict[str, Any]:
+    """Payload for get_chart_payload; empty dict if there is no history (not cached)."""
+    days = CHART_RANGES[range_label]
+    history = fetch_price_data(symbol, days=(days or MAX_HISTORY_DAYS) + WARM_UP_DAYS)
+    if history.empty:
+        return {}
+    payload = frame_payload(history, days=days, max_points=max_points)
+    return {"symbol": symbol, "range": range_label, **payload}
+
+
+def get_chart_payload(symbol: str, range_label: str = "1Y",
+                      max_points: int = chart_max_points) -> Dict[str, Any]:
+    """
+    Chart payload for a symbol and range, built at most once per trading day.
+
+    Args:
+        symbol: NSE stock symbol (e.g., "TCS")
+        range_label: Key of CHART_RANGES
+        max_points: Maximum points per panel
+
+    Returns:
+        frame_payload() result plus "symbol" and "range" (no panels if no data).
+        Shared between callers; treat it as read-only.
+    """
+    if range_label not in CHART_RANGES:
+        raise ValueError(f"Unknown chart range {range_label!r}; expected one of {', '.join(CHART_RANGES)}")
+    symbol = symbol.upper()
+    key = ("chart_payload", symbol, range_label, max_points, last_trading_day())
+    # A failed fetch is not cached, so the next rerun tries again
+    payload = get_memory_cache().get_or_compute(key, lambda: _build_payload(symbol, range_label, max_points),
+                                                store_empty=False)
+    return payload or {"symbol": symbol, "range": range_label, "bars": 0, "panels": {}}
+
+
+def build_figure(payload: Dict[str, Any], title: Optional[str] = None):
+    """
+    Plotly figure with one row per panel in the payload, sharing the date axis.
+
+    Returns:
+        plotly Figure (requires plotly)
+    """
+    panels = payload["panels"]
+    heights = {"price": 0.5, "rsi": 0.2, "volume": 0.2, "delivery": 0.2}
+    names = list(panels)
+    figure = make_subplots(rows=len(names), cols=1, shared_xaxes=True, vertical_spacing=0.03,
+                           row_heights=[heights[name] for name in names])
+
+    for row, name in enumerate(names, start=1):
+        panel = panels[name]
+        if name == "volume":
+            figure.add_trace(go.Bar(x=panel.index, y=panel["Volume"], name="Volume",
+                                    marker_color="rgba(100, 120, 160, 0.6)"), row=row, col=1)
+        else:
+            for column in panel.columns:
+                figure.add_trace(go.Scatter(x=panel.index, y=panel[column], name=column.replace("_", " "),
+                                            mode="lines"), row=row, col=1)
+        if name == "rsi":
+            for level in (30, 70):
+                figure.add_hline(y=level, line_dash="dot", line_color="grey", row=row, col=1)
+        figure.update_yaxes(title_text=name.replace("_", " ").title(), row=row, col=1)
+
+    figure.update_layout(title=title, height=250 + 150 * len(names), hovermode="x unified",
+                         margin=dict(l=40, r=20, t=40 if title else 20, b=20),
+                         legend=dict(orientation="h", y=1.02, x=0))
+    return figure
+
+
+def render_chart(payload: Dict[str, Any], title: Optional[str] = None, key: Optional[str] = None):
+    """Draw a payload with plotly, or one st.line_chart per panel without it."""
+    if not payload["panels"]:
+        st.warning("No price data to chart.")
+        return
+    if PLOTLY_AVAILABLE:
+        st.plotly_chart(build_figure(payload, title), use_container_width=True, key=key)
+    else:
+        for panel in payload["panels"].values():
+            st.line_chart(panel)
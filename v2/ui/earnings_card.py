@@ -0,0 +1,111 @@
+"""
+Earnings Card - Streamlit card for one stock's earnings and performance
+
+Each card is drawn with a handful of elements: the earnings history is
+rendered as a single HTML table instead of one st.columns/st.markdown
+widget per cell, which keeps the browser responsive for large watchlists.
+"""
+import html
+from typing import Any, Dict, List, Optional
+
+import streamlit as st
+
+
+def _format_performance(value: Optional[float]) -> str:
+    """Colored percentage span, or N/A when the value is missing."""
+    if value is None:
+        return "N/A"
+    color = "green" if value >= 0 else "red"
+    arrow = "↓" if value >= 0 else "↑"
+    return f"<span style='color:{color}'>{value:+.1f}% {arrow}</span>"
+
+
+def build_history_table_html(history: List[Dict[str, Any]], sector_index: Optional[str] = None) -> str:
+    """
+    Build the earnings history as one styled HTML table.
+
+    Args:
+        history: List of entries from fetch_earnings_with_performance()["history"]
+        sector_index: Sector benchmark name; adds a sector performance column
+
+    Returns:
+        HTML string for the whole table
+    """
+    rows = []
+    for entry in history:
+        date = html.escape(str(entry.get("date", "N/A")))
+        sector_cell = f"<td>{_format_performance(entry.get('sector_performance'))}</td>" if sector_index else ""
+        rows.append(
+            "<tr>"
+            f"<td>{date}</td>"
+            f"<td>{_format_performance(entry.get('stock_performance'))}</td>"
+            f"<td>{_format_performance(entry.get('nifty_performance'))}</td>"
+            f"{sector_cell}"
+            "</tr>"
+        )
+
+    sector_header = f"<th>{html.escape(sector_index.upper())} PERFORMANCE</th>" if sector_index else ""
+    return (
+        "<table style='width:100%; border-collapse:collapse;'>"
+        "<thead><tr style='text-align:left;'>"
+        "<th>EARNING DATE</th>"
+        "<th>STOCK PERFORMANCE (1 WEEK)</th>"
+        "<th>NIFTY 50 PERFORMANCE</th>"
+        f"{sector_header}"
+        "</tr></thead>"
+        f"<tbody>{''.join(rows)}</tbody>"
+        "</table>"
+    )
+
+
+def render_earnings_card(data: Dict[str, Any]):
+    """
+    Render one stock's earnings card into the current Streamlit container.
+
+    Args:
+        data: Result of fetch_earnings_with_performance()
+    """
+    symbol = data["symbol"]
+
+    # Header row
+    col_title, col_badge = st.columns([3, 1])
+    with col_title:
+        st.markdown(f"### {symbol}")
+    with col_badge:
+        st.caption(f"NSE: {symbol}")
+
+    # Next earnings and relative performance
+    next_date = data.get("next_earnings")
+    if next_date:
+        date_str = next_date.strftime("%Y-%m-%d") if hasattr(next_date, 'strftime') else str(next_date)
+        next_md = f"**Next Quarterly Earning Date:** `{date_str}`"
+    else:
+        next_md = "**Next Quarterly Earning Date:** `N/A`"
+
+    rel_perf = data.get("relative_performance")
+    if rel_perf is not None:
+        rel_md = f"**Performance vs. NIFTY 50 (last month):** {_format_performance(rel_perf)}"
+    else:
+        rel_md = "**Performance vs. NIFTY 50 (last month):** `N/A`"
+
+    sector_index = data.get("sector_index")
+    if sector_index:
+        sector_perf = data.get("sector_relative_performance")
+        sector_value = _format_performance(sector_perf) if sector_perf is not None else "`N/A`"
+        rel_md += f"<br>**Performance vs. {html.escape(sector_index)} (last month):** {sector_value}"
+
+    col1, col2 = st.columns(2)
+    with col1:
+        st.markdown(next_md)
+    with col2:
+        st.markdown(rel_md, unsafe_allow_html=True)
+
+    # Earnings History Table
+    st.markdown("#### Earnings History")
+    history = data.get("history", [])
+    if history:
+        st.markdown(build_history_table_html(history, sector_index), unsafe_allow_html=True)
+    else:
+        st.write("No earnings history available")
+
+    st.write("---")
@@ -0,0 +1,80 @@
+"""
+Profile Report - Streamlit report of a RunProfiler's stages and hotspots
+
+Shows where a profiled run spent its time and memory: totals per stage, the
+same per symbol, and the slowest functions (all stages or one), plus a
+download of the merged profile for snakeviz or python -m pstats.
+
+Clicking the download button reruns the script, so the last run that
+recorded anything is kept in the session and shown until the next one.
+"""
+from typing import Optional
+
+import streamlit as st
+
+from v2.profiling import STAGES, RunProfiler
+
+_SESSION_KEY = "_last_run_profile"
+
+
+def profile_sidebar_toggle(default: bool) -> bool:
+    """Sidebar checkbox that turns profiling on for the next run."""
+    return st.sidebar.checkbox("Profile this run", value=default,
+                               help="Record CPU time, peak memory and a cProfile per stage "
+                                    "(also enabled by TRADINGTOOL_PROFILE=1)")
+
+
+def render_profile_report(profiler: Optional[RunProfiler]):
+    """
+    Draw the stage summary, per-symbol table, hotspot table and profile download.
+
+    Args:
+        profiler: Profiler of the current run (None or disabled = nothing to show)
+    """
+    if profiler is None or not profiler.enabled:
+        return
+    profiler.stop()
+    if profiler.records:
+        st.session_state[_SESSION_KEY] = profiler
+    else:
+        profiler = st.session_state.get(_SESSION_KEY, profiler)
+
+    st.write("---")
+    st.subheader("⏱️ Run Profile")
+    if not profiler.records:
+        st.info("Nothing profiled yet. Run an analysis with profiling enabled.")
+        return
+
+    summary = profiler.stage_summary()
+    st.caption(f"{summary['Wall_s'].sum():.2f}s wall, {summary['CPU_s'].sum():.2f}s CPU over "
+               f"{int(summary['Calls'].sum())} stage calls. Peak_MB is memory allocated above each stage's start.")
+    st.dataframe(summary.round(3), use_container_width=True, hide_index=True)
+
+    by_symbol = profiler.stage_summary(by_symbol=True).dropna(subset=["Symbol"])
+    if not by_symbol.empty:
+        with st.expander("Per symbol"):
+            st.dataframe(by_symbol.round(3), use_container_width=True, hide_index=True)
+
+    col_stage, col_sort, col_top = st.columns(3)
+    with col_stage:
+        recorded = [s for s in STAGES if s in set(summary["Stage"])]
+        stage = st.selectbox("Hotspots for stage:", options=["all"] + recorded, key="profile_stage")
+    with col_sort:
+        sort = st.selectbox("Sort by:", options=["Cumulative_s", "Own_s", "Calls"], key="profile_sort")
+    with col_top:
+        top = st.slider("Functions", min_value=10, max_value=200, value=30, step=10, key="profile_top")
+
+    stage = None if stage == "all" else stage
+    hotspots = profiler.hotspots(stage=stage, top=top, sort=sort)
+    if hotspots.empty:
+        st.info("No CPU profile for this stage (it only ran alongside another profiled stage).")
+    else:
+        st.dataframe(hotspots.round(4), use_container_width=True, hide_index=True)
+
+    st.download_button(
+        label="📥 Download Profile (.prof)",
+        data=profiler.profile_bytes(stage),
+        file_name=f"{profiler.name}-{stage or 'all'}.prof",
+        mime="application/octet-stream",
+        help="Open with: snakeviz FILE, or python -m pstats FILE",
+    )